@@ -204,6 +204,15 @@ TEMPLATE_CONTEXT_PROCESSORS = (
 # Output to use in template system for invalid (e.g. misspelled) variables.
 TEMPLATE_STRING_IF_INVALID = ''
 
+# Whether to compile parsed templates to Python functions. Ignored when
+# TEMPLATE_DEBUG is True.
+TEMPLATE_COMPILE = False
+
+# The alias of the cache (in CACHES) where the cached template loader stores
+# parsed templates so that other processes don't have to parse them again.
+# Ignored when TEMPLATE_DEBUG is True.
+TEMPLATE_CACHE_ALIAS = None
+
 # Default email address to use for various automated correspondence from
 # the site managers.
 DEFAULT_FROM_EMAIL = 'webmaster@localhost'
@@ -221,6 +230,14 @@ PREPEND_WWW = False
 # Override the server-derived value of SCRIPT_NAME
 FORCE_SCRIPT_NAME = None
 
+# Whether URL resolvers only try the URL patterns whose literal prefix matches
+# the requested path, instead of trying every pattern in turn.
+URL_RESOLVER_INDEX = False
+
+# The number of recently resolved URLs whose matches are remembered by the
+# root URL resolver. 0 disables this cache.
+URL_RESOLVER_CACHE_SIZE = 0
+
 # List of compiled regular expression objects representing User-Agent strings
 # that are not allowed to visit any page, systemwide. Use this for bad
 # robots/crawlers. Here are a few examples:
@@ -445,6 +462,15 @@ MIDDLEWARE_CLASSES = (
 #     'django.middleware.gzip.GZipMiddleware',
 )
 
+# The compression level (from 1 to 9) and the minimum length of the content
+# of the responses compressed by GZipMiddleware.
+GZIP_COMPRESS_LEVEL = 6
+GZIP_MIN_LENGTH = 200
+
+# Dotted paths to collectors, or classes of collectors, that record how long
+# each call to a middleware method takes. See django.core.handlers.timing.
+MIDDLEWARE_TIMING_COLLECTORS = ()
+
 ############
 # SESSIONS #
 ############
@@ -459,6 +485,7 @@ SESSION_SAVE_EVERY_REQUEST = False                      # Whether to save the se
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False                 # Whether a user's session cookie expires when the Web browser is closed.
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'  # The module to store session data
 SESSION_FILE_PATH = None                                # Directory to store session files if using the file session module. If None, the backend will use a sensible default.
+SESSION_SERIALIZER = 'django.contrib.sessions.serializers.PickleSerializer'  # The class that serializes session data.
 
 #########
 # CACHE #
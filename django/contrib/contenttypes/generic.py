@@ -62,7 +62,10 @@ class GenericForeignKey(object):
             # This should never happen. I love comments like this, don't you?
             raise Exception("Impossible arguments to GFK.get_content_type!")
 
-    def get_prefetch_query_set(self, instances):
+    def get_prefetch_query_set(self, instances, queryset=None):
+        if queryset is not None:
+            raise ValueError("Custom queryset can't be used for this lookup.")
+
         # For efficiency, group the instances by content type and then do one
         # query per model
         fk_dict = defaultdict(set)
@@ -79,22 +82,26 @@ class GenericForeignKey(object):
                     instance_dict[ct_id] = instance
 
         ret_val = []
+        model_classes = {}
         for ct_id, fkeys in fk_dict.items():
             instance = instance_dict[ct_id]
             ct = self.get_content_type(id=ct_id, using=instance._state.db)
+            model_classes[ct_id] = ct.model_class()
             ret_val.extend(ct.get_all_objects_for_this_type(pk__in=fkeys))
 
         # For doing the join in Python, we have to match both the FK val and the
         # content type, so the 'attr' vals we return need to be callables that
-        # will return a (fk, class) pair.
+        # will return a (fk, class) pair. The object id field doesn't have to
+        # be of the same type as the primary keys it refers to (a text field
+        # is common), so the fk value is converted with the primary key field.
         def gfk_key(obj):
             ct_id = getattr(obj, ct_attname)
-            if ct_id is None:
+            try:
+                model = model_classes[ct_id]
+            except KeyError:
                 return None
-            else:
-                return (getattr(obj, self.fk_field),
-                        self.get_content_type(id=ct_id,
-                                              using=obj._state.db).model_class())
+            return (model._meta.pk.get_prep_value(getattr(obj, self.fk_field)),
+                    model)
 
         return (ret_val,
                 lambda obj: (obj._get_pk_val(), obj.__class__),
@@ -320,14 +327,16 @@ def create_generic_related_manager(superclass):
                 db = self._db or router.db_for_read(self.model, instance=self.instance)
                 return super(GenericRelatedObjectManager, self).get_query_set().using(db).filter(**self.core_filters)
 
-        def get_prefetch_query_set(self, instances):
-            db = self._db or router.db_for_read(self.model)
+        def get_prefetch_query_set(self, instances, queryset=None):
+            if queryset is None:
+                queryset = super(GenericRelatedObjectManager, self).get_query_set()
+            db = queryset._db or self._db or router.db_for_read(self.model)
             query = {
                 '%s__pk' % self.content_type_field_name: self.content_type.id,
                 '%s__in' % self.object_id_field_name:
                     set(obj._get_pk_val() for obj in instances)
                 }
-            qs = super(GenericRelatedObjectManager, self).get_query_set().using(db).filter(**query)
+            qs = queryset.using(db).filter(**query)
             return (qs,
                     attrgetter(self.object_id_field_name),
                     lambda obj: obj._get_pk_val(),
@@ -1,7 +1,7 @@
 from itertools import izip
 from django.db.backends.util import truncate_name, typecast_timestamp
 from django.db.models.sql import compiler
-from django.db.models.sql.constants import TABLE_NAME, MULTI
+from django.db.models.sql.constants import TABLE_NAME, MULTI, GET_ITERATOR_CHUNK_SIZE
 from django.db.models.sql.query import get_proxied_model
 
 SQLCompiler = compiler.SQLCompiler
@@ -276,7 +276,7 @@ class SQLDateCompiler(compiler.SQLDateCompiler, GeoSQLCompiler):
     `GeoQuery.resolve_columns` is used for spatial values.
     See #14648, #16757.
     """
-    def results_iter(self):
+    def results_iter(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
         if self.connection.ops.oracle:
             from django.db.models.fields import DateTimeField
             fields = [DateTimeField()]
@@ -284,7 +284,8 @@ class SQLDateCompiler(compiler.SQLDateCompiler, GeoSQLCompiler):
             needs_string_cast = self.connection.features.needs_datetime_string_cast
 
         offset = len(self.query.extra_select)
-        for rows in self.execute_sql(MULTI):
+        for rows in self.execute_sql(MULTI, chunk_size=chunk_size,
+                                     server_side=server_side):
             for row in rows:
                 date = row[offset]
                 if self.connection.ops.oracle:
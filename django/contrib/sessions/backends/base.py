@@ -4,14 +4,11 @@ import os
 import random
 import time
 from datetime import datetime, timedelta
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle
 
 from django.conf import settings
-from django.core.exceptions import SuspiciousOperation
+from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
 from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.importlib import import_module
 from django.utils import timezone
 
 # Use the system (hardware-based) random number generator if it exists.
@@ -21,6 +18,25 @@ else:
     randrange = random.randrange
 MAX_SESSION_KEY = 18446744073709551616L     # 2 << 63
 
+_serializers = {}
+
+def get_serializer(path):
+    """
+    Returns the session serializer class with the given dotted path.
+    """
+    try:
+        return _serializers[path]
+    except KeyError:
+        pass
+    module, attr = path.rsplit('.', 1)
+    try:
+        serializer = getattr(import_module(module), attr)
+    except (ImportError, AttributeError), e:
+        raise ImproperlyConfigured('Error importing session serializer %s: '
+                                   '"%s"' % (path, e))
+    _serializers[path] = serializer
+    return serializer
+
 class CreateError(Exception):
     """
     Used internally as a consistent exception type to catch from save (see the
@@ -35,10 +51,21 @@ class SessionBase(object):
     TEST_COOKIE_NAME = 'testcookie'
     TEST_COOKIE_VALUE = 'worked'
 
+    # The class that serializes session data. Backends may set it; if it's
+    # None, the class named by the SESSION_SERIALIZER setting is used.
+    serializer = None
+
     def __init__(self, session_key=None):
         self._session_key = session_key
         self.accessed = False
         self.modified = False
+        if self.serializer is None:
+            self.serializer = get_serializer(settings.SESSION_SERIALIZER)
+        # The keys that were set or deleted, and the serialized data and key
+        # of the session as loaded from the session store.
+        self._modified_keys = set()
+        self._loaded_data = None
+        self._loaded_key = None
 
     def __contains__(self, key):
         return key in self._session
@@ -49,16 +76,20 @@ class SessionBase(object):
     def __setitem__(self, key, value):
         self._session[key] = value
         self.modified = True
+        self._modified_keys.add(key)
 
     def __delitem__(self, key):
         del self._session[key]
         self.modified = True
+        self._modified_keys.add(key)
 
     def get(self, key, default=None):
         return self._session.get(key, default)
 
     def pop(self, key, *args):
-        self.modified = self.modified or key in self._session
+        if key in self._session:
+            self.modified = True
+            self._modified_keys.add(key)
         return self._session.pop(key, *args)
 
     def setdefault(self, key, value):
@@ -66,6 +97,7 @@ class SessionBase(object):
             return self._session[key]
         else:
             self.modified = True
+            self._modified_keys.add(key)
             self._session[key] = value
             return value
 
@@ -83,29 +115,61 @@ class SessionBase(object):
         return salted_hmac(key_salt, value).hexdigest()
 
     def encode(self, session_dict):
-        "Returns the given session dictionary pickled and encoded as a string."
-        pickled = pickle.dumps(session_dict, pickle.HIGHEST_PROTOCOL)
-        hash = self._hash(pickled)
-        return base64.encodestring(hash + ":" + pickled)
+        "Returns the given session dictionary serialized and encoded as a string."
+        serialized = self.serializer().dumps(session_dict)
+        hash = self._hash(serialized)
+        # The data in the session store is about to change.
+        self._loaded_data = None
+        return base64.encodestring(hash + ":" + serialized)
 
     def decode(self, session_data):
         encoded_data = base64.decodestring(session_data)
         try:
             # could produce ValueError if there is no ':'
-            hash, pickled = encoded_data.split(':', 1)
-            expected_hash = self._hash(pickled)
+            hash, serialized = encoded_data.split(':', 1)
+            expected_hash = self._hash(serialized)
             if not constant_time_compare(hash, expected_hash):
                 raise SuspiciousOperation("Session data corrupted")
             else:
-                return pickle.loads(pickled)
+                session_dict = self.serializer().loads(serialized)
         except Exception:
-            # ValueError, SuspiciousOperation, unpickling exceptions. If any of
-            # these happen, just return an empty dictionary (an empty session).
+            # ValueError, SuspiciousOperation, deserialization exceptions. If
+            # any of these happen, just return an empty dictionary (an empty
+            # session).
             return {}
+        self._loaded_data = serialized
+        return session_dict
+
+    def has_changed(self):
+        """
+        Returns True if the session data may differ from the data loaded from
+        the session store, and False if it's known to be the same, for
+        example when keys were set to the values they already had.
+
+        The data of sessions that weren't marked as modified is compared too,
+        since mutable values may have been changed in place.
+        """
+        if not self.modified:
+            if getattr(self, '_session_cache', None) is None:
+                # The data was never loaded, so it can't have changed.
+                return False
+        elif not self._modified_keys:
+            # The session was changed by other means than setting and
+            # deleting keys.
+            return True
+        if self._loaded_data is None or self._loaded_key != self.session_key:
+            # The data wasn't decoded from the session store.
+            return True
+        try:
+            loaded = self.serializer().loads(self._loaded_data)
+        except Exception:
+            return True
+        return loaded != self._session
 
     def update(self, dict_):
         self._session.update(dict_)
         self.modified = True
+        self._modified_keys.update(dict_)
 
     def has_key(self, key):
         return key in self._session
@@ -175,7 +239,9 @@ class SessionBase(object):
             if self.session_key is None or no_load:
                 self._session_cache = {}
             else:
+                self._loaded_data = None
                 self._session_cache = self.load()
+                self._loaded_key = self.session_key
         return self._session_cache
 
     _session = property(_get_session)
@@ -279,6 +345,13 @@ class SessionBase(object):
         """
         raise NotImplementedError
 
+    def touch(self):
+        """
+        Updates the expiry date of the session in the session store without
+        saving its data again. Backends that can't do that save the session.
+        """
+        self.save()
+
     def delete(self, session_key=None):
         """
         Deletes the session data under this key. If the key is None, the
@@ -291,3 +364,14 @@ class SessionBase(object):
         Loads the session data and returns a dictionary.
         """
         raise NotImplementedError
+
+    @classmethod
+    def clear_expired(cls, batch_size=1000, sleep=0):
+        """
+        Removes expired sessions from the session store and returns how many
+        were removed. Sessions are removed batch_size at a time, with a pause
+        of sleep seconds between batches.
+
+        Backends whose sessions expire by themselves don't need to do anything.
+        """
+        raise NotImplementedError
@@ -1,6 +1,8 @@
+import time
+
 from django.contrib.sessions.backends.base import SessionBase, CreateError
 from django.core.exceptions import SuspiciousOperation
-from django.db import IntegrityError, transaction, router
+from django.db import IntegrityError, connections, transaction, router
 from django.utils.encoding import force_unicode
 from django.utils import timezone
 
@@ -62,6 +64,16 @@ class SessionStore(SessionBase):
                 raise CreateError
             raise
 
+    def touch(self):
+        if self.session_key is None:
+            return self.save()
+        using = router.db_for_write(Session)
+        updated = Session.objects.using(using).filter(
+            session_key=self.session_key,
+        ).update(expire_date=self.get_expiry_date())
+        if not updated:
+            self.save()
+
     def delete(self, session_key=None):
         if session_key is None:
             if self.session_key is None:
@@ -72,6 +84,39 @@ class SessionStore(SessionBase):
         except Session.DoesNotExist:
             pass
 
+    @classmethod
+    def clear_expired(cls, batch_size=1000, sleep=0):
+        """
+        Deletes the sessions that expired before the call, batch_size rows at
+        a time. The keys of each batch are found through the expire_date
+        index and each batch is committed on its own, so that no lock is held
+        for long and an interrupted run loses at most one batch of work.
+        """
+        using = router.db_for_write(Session)
+        now = timezone.now()
+        expired = Session.objects.using(using).filter(
+            expire_date__lt=now,
+        ).order_by('expire_date').values_list('session_key', flat=True)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        sql = "DELETE FROM %s WHERE %s IN (%%s) AND %s < %%%%s" % (
+            qn(Session._meta.db_table), qn('session_key'), qn('expire_date'))
+        db_now = connection.ops.value_to_db_datetime(now)
+        deleted = 0
+        while True:
+            keys = list(expired[:batch_size])
+            if keys:
+                # Sessions refreshed since they were selected are kept, and
+                # aren't counted as deleted.
+                cursor = connection.cursor()
+                cursor.execute(sql % ', '.join(['%s'] * len(keys)), keys + [db_now])
+                transaction.commit_unless_managed(using=using)
+                deleted += cursor.rowcount
+            if len(keys) < batch_size:
+                return deleted
+            if sleep:
+                time.sleep(sleep)
+
 
 # At bottom to avoid circular import
 from django.contrib.sessions.models import Session
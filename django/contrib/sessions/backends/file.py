@@ -1,10 +1,13 @@
+import datetime
 import errno
 import os
 import tempfile
+import time
 
 from django.conf import settings
 from django.contrib.sessions.backends.base import SessionBase, CreateError
 from django.core.exceptions import SuspiciousOperation, ImproperlyConfigured
+from django.utils import timezone
 
 
 class SessionStore(SessionBase):
@@ -12,21 +15,25 @@ class SessionStore(SessionBase):
     Implements a file based session store.
     """
     def __init__(self, session_key=None):
-        self.storage_path = getattr(settings, "SESSION_FILE_PATH", None)
-        if not self.storage_path:
-            self.storage_path = tempfile.gettempdir()
+        self.storage_path = self._get_storage_path()
+        self.file_prefix = settings.SESSION_COOKIE_NAME
+        super(SessionStore, self).__init__(session_key)
+
+    VALID_KEY_CHARS = set("abcdef0123456789")
+
+    @classmethod
+    def _get_storage_path(cls):
+        storage_path = getattr(settings, "SESSION_FILE_PATH", None)
+        if not storage_path:
+            storage_path = tempfile.gettempdir()
 
         # Make sure the storage path is valid.
-        if not os.path.isdir(self.storage_path):
+        if not os.path.isdir(storage_path):
             raise ImproperlyConfigured(
                 "The session storage path %r doesn't exist. Please set your"
                 " SESSION_FILE_PATH setting to an existing directory in which"
-                " Django can store session data." % self.storage_path)
-
-        self.file_prefix = settings.SESSION_COOKIE_NAME
-        super(SessionStore, self).__init__(session_key)
-
-    VALID_KEY_CHARS = set("abcdef0123456789")
+                " Django can store session data." % storage_path)
+        return storage_path
 
     def _key_to_file(self, session_key=None):
         """
@@ -44,19 +51,49 @@ class SessionStore(SessionBase):
 
         return os.path.join(self.storage_path, self.file_prefix + session_key)
 
+    def _expiry_date(self, session_data, modified):
+        """
+        Returns the expiry date of session_data, stored in a file last
+        modified at the timestamp modified.
+        """
+        expiry = session_data.get('_session_expiry')
+        if isinstance(expiry, datetime.datetime):
+            return expiry
+        if not expiry:   # Checks both None and 0 cases
+            expiry = settings.SESSION_COOKIE_AGE
+        if settings.USE_TZ:
+            modified = datetime.datetime.utcfromtimestamp(modified)
+            modified = modified.replace(tzinfo=timezone.utc)
+        else:
+            modified = datetime.datetime.fromtimestamp(modified)
+        return modified + datetime.timedelta(seconds=expiry)
+
+    def _read(self, session_file):
+        """
+        Returns the decoded data of the open session_file. Raises EOFError or
+        SuspiciousOperation if it can't be decoded.
+        """
+        file_data = session_file.read()
+        # Don't fail if there is no data in the session file.
+        # We may have opened the empty placeholder file.
+        if file_data:
+            return self.decode(file_data)
+        return {}
+
     def load(self):
         session_data = {}
         try:
             session_file = open(self._key_to_file(), "rb")
             try:
-                file_data = session_file.read()
-                # Don't fail if there is no data in the session file.
-                # We may have opened the empty placeholder file.
-                if file_data:
-                    try:
-                        session_data = self.decode(file_data)
-                    except (EOFError, SuspiciousOperation):
+                try:
+                    session_data = self._read(session_file)
+                    modified = os.fstat(session_file.fileno()).st_mtime
+                    if self._expiry_date(session_data, modified) < timezone.now():
+                        session_data = {}
+                        self.delete()
                         self.create()
+                except (EOFError, SuspiciousOperation):
+                    self.create()
             finally:
                 session_file.close()
         except IOError:
@@ -130,6 +167,14 @@ class SessionStore(SessionBase):
         except (OSError, IOError, EOFError):
             pass
 
+    def touch(self):
+        if self.session_key is None:
+            return self.save()
+        try:
+            os.utime(self._key_to_file(), None)
+        except OSError:
+            self.save()
+
     def exists(self, session_key):
         return os.path.exists(self._key_to_file(session_key))
 
@@ -145,3 +190,53 @@ class SessionStore(SessionBase):
 
     def clean(self):
         pass
+
+    @classmethod
+    def clear_expired(cls, batch_size=1000, sleep=0):
+        """
+        Deletes the session files that have expired, pausing for sleep seconds
+        after every batch_size files examined.
+
+        Only files that weren't modified for SESSION_COOKIE_AGE seconds are
+        opened to look for a custom expiry date, so sessions given a shorter
+        expiry are left in place (load() ignores them) until then.
+        """
+        storage_path = cls._get_storage_path()
+        file_prefix = settings.SESSION_COOKIE_NAME
+        store = cls()
+        cutoff = time.time() - settings.SESSION_COOKIE_AGE
+        now = timezone.now()
+        deleted = examined = 0
+        for filename in os.listdir(storage_path):
+            session_key = filename[len(file_prefix):]
+            if (not filename.startswith(file_prefix) or not session_key or
+                    not set(session_key).issubset(cls.VALID_KEY_CHARS)):
+                # Not a session file, or a temporary file of save().
+                continue
+            if examined and not examined % batch_size and sleep:
+                time.sleep(sleep)
+            examined += 1
+            path = os.path.join(storage_path, filename)
+            try:
+                modified = os.path.getmtime(path)
+                if modified >= cutoff:
+                    continue
+                session_file = open(path, "rb")
+                try:
+                    try:
+                        session_data = store._read(session_file)
+                    except (EOFError, SuspiciousOperation):
+                        session_data = {}
+                finally:
+                    session_file.close()
+                if store._expiry_date(session_data, modified) >= now:
+                    continue
+                # Leave the session alone if it was saved or touched since.
+                if os.path.getmtime(path) != modified:
+                    continue
+                os.unlink(path)
+            except (OSError, IOError):
+                # The session was deleted or replaced in the meantime.
+                continue
+            deleted += 1
+        return deleted
@@ -1,24 +1,9 @@
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle
-
 from django.conf import settings
 from django.core import signing
 
 from django.contrib.sessions.backends.base import SessionBase
-
-
-class PickleSerializer(object):
-    """
-    Simple wrapper around pickle to be used in signing.dumps and
-    signing.loads.
-    """
-    def dumps(self, obj):
-        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
-
-    def loads(self, data):
-        return pickle.loads(data)
+# For backwards compatibility
+from django.contrib.sessions.serializers import PickleSerializer
 
 
 class SessionStore(SessionBase):
@@ -31,7 +16,7 @@ class SessionStore(SessionBase):
         """
         try:
             return signing.loads(self.session_key,
-                serializer=PickleSerializer,
+                serializer=self.serializer,
                 max_age=settings.SESSION_COOKIE_AGE,
                 salt='django.contrib.sessions.backends.signed_cookies')
         except (signing.BadSignature, ValueError):
@@ -72,6 +57,12 @@ class SessionStore(SessionBase):
         self._session_cache = {}
         self.modified = True
 
+    @classmethod
+    def clear_expired(cls, batch_size=1000, sleep=0):
+        # Expired cookies are simply rejected by load(); there's nothing
+        # stored on the server.
+        return 0
+
     def cycle_key(self):
         """
         Keeps the same data but with a new key.  To do this, we just have to
@@ -90,4 +81,4 @@ class SessionStore(SessionBase):
         session_cache = getattr(self, '_session_cache', {})
         return signing.dumps(session_cache, compress=True,
             salt='django.contrib.sessions.backends.signed_cookies',
-            serializer=PickleSerializer)
+            serializer=self.serializer)
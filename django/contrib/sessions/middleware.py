@@ -14,7 +14,8 @@ class SessionMiddleware(object):
     def process_response(self, request, response):
         """
         If request.session was modified, or if the configuration is to save the
-        session every time, save the changes and set a session cookie.
+        session every time, save the changes and set a session cookie. A
+        session whose data didn't change only has its expiry date updated.
         """
         try:
             accessed = request.session.accessed
@@ -32,8 +33,12 @@ class SessionMiddleware(object):
                     max_age = request.session.get_expiry_age()
                     expires_time = time.time() + max_age
                     expires = cookie_date(expires_time)
-                # Save the session data and refresh the client cookie.
-                request.session.save()
+                # Save the session data, or only update its expiry date if
+                # the data didn't change, and refresh the client cookie.
+                if request.session.has_changed():
+                    request.session.save()
+                else:
+                    request.session.touch()
                 response.set_cookie(settings.SESSION_COOKIE_NAME,
                         request.session.session_key, max_age=max_age,
                         expires=expires, domain=settings.SESSION_COOKIE_DOMAIN,
@@ -0,0 +1,27 @@
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from django.core.signing import JSONSerializer as BaseJSONSerializer
+
+
+class PickleSerializer(object):
+    """
+    Simple wrapper around pickle to be used in signing.dumps and
+    signing.loads.
+    """
+    def dumps(self, obj):
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+class JSONSerializer(BaseJSONSerializer):
+    """
+    Serializes session data as compact JSON, which is faster to encode and
+    decode than pickle and smaller for typical sessions. Only values that
+    JSON can represent may be stored in the session.
+    """
+    pass
@@ -1,8 +1,12 @@
 from __future__ import with_statement
 
 from datetime import datetime, timedelta
+from StringIO import StringIO
+import base64
+import os
 import shutil
 import tempfile
+import time
 
 from django.conf import settings
 from django.contrib.sessions.backends.db import SessionStore as DatabaseSession
@@ -12,7 +16,10 @@ from django.contrib.sessions.backends.file import SessionStore as FileSession
 from django.contrib.sessions.backends.signed_cookies import SessionStore as CookieSession
 from django.contrib.sessions.models import Session
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.contrib.sessions.serializers import JSONSerializer
 from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
+from django.core.management import call_command
+from django.db import connection
 from django.http import HttpResponse
 from django.test import TestCase, RequestFactory
 from django.test.utils import override_settings
@@ -285,6 +292,112 @@ class DatabaseSessionTests(SessionTestsMixin, TestCase):
         del self.session._session_cache
         self.assertEqual(self.session['y'], 2)
 
+    def test_has_changed(self):
+        self.session['x'] = [1]
+        self.session.save()
+        session = self.backend(self.session.session_key)
+        self.assertFalse(session.has_changed())
+        # Setting a key to the value it has doesn't change the session.
+        session['x'] = [1]
+        self.assertTrue(session.modified)
+        self.assertFalse(session.has_changed())
+        # Values changed in place are compared with the stored ones.
+        session['x'].append(2)
+        session['x'] = session['x']
+        self.assertTrue(session.has_changed())
+        session['x'] = [1]
+        session.modified = False
+        # Setting modified by hand always saves the session.
+        session.modified = True
+        session._modified_keys.clear()
+        self.assertTrue(session.has_changed())
+
+    def test_touch(self):
+        self.session['x'] = 1
+        self.session.save()
+        s = Session.objects.get(session_key=self.session.session_key)
+        Session.objects.filter(pk=s.pk).update(
+            expire_date=s.expire_date - timedelta(days=1))
+        session = self.backend(self.session.session_key)
+        # One query to load the session to find its expiry, one to update it.
+        with self.assertNumQueries(2):
+            session.touch()
+        touched = Session.objects.get(session_key=self.session.session_key)
+        self.assertEqual(touched.session_data, s.session_data)
+        self.assertTrue(touched.expire_date > s.expire_date - timedelta(days=1))
+
+    @override_settings(SESSION_SAVE_EVERY_REQUEST=True)
+    def test_middleware_skips_unchanged_data(self):
+        self.session['x'] = 1
+        self.session.save()
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = self.session.session_key
+        middleware = SessionMiddleware()
+        middleware.process_request(request)
+        request.session['x'] = 1
+        # Only the expiry date of the session is updated.
+        with self.assertNumQueries(1):
+            response = middleware.process_response(request, HttpResponse())
+        self.assertEqual(response.cookies[settings.SESSION_COOKIE_NAME].value,
+                         self.session.session_key)
+
+    @override_settings(
+        SESSION_SERIALIZER='django.contrib.sessions.serializers.JSONSerializer')
+    def test_json_serializer(self):
+        session = self.backend()
+        self.assertEqual(session.serializer, JSONSerializer)
+        session['x'] = [1, u'\xe9']
+        session.save()
+        s = Session.objects.get(session_key=session.session_key)
+        hash, serialized = base64.decodestring(s.session_data).split(':', 1)
+        self.assertEqual(serialized, '{"x":[1,"\\u00e9"]}')
+        self.assertEqual(self.backend(session.session_key)['x'], [1, u'\xe9'])
+
+    def test_clear_expired(self):
+        keys = []
+        for expiry in (-10, -5, 60):
+            session = self.backend()
+            session.set_expiry(expiry)
+            session.save()
+            keys.append(session.session_key)
+        # One query finds each batch of keys and one deletes it.
+        with self.assertNumQueries(5):
+            self.assertEqual(self.backend.clear_expired(batch_size=1), 2)
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            keys[2:])
+
+    def test_clear_expired_refreshed(self):
+        session = self.backend()
+        session.set_expiry(-10)
+        session.save()
+        old_cursor = connection.cursor
+        calls = []
+        def cursor():
+            calls.append(True)
+            if len(calls) == 2:
+                # The session is refreshed after its key was selected.
+                connection.cursor = old_cursor
+                Session.objects.filter(session_key=session.session_key).update(
+                    expire_date=timezone.now() + timedelta(days=1))
+            return old_cursor()
+        connection.cursor = cursor
+        try:
+            self.assertEqual(self.backend.clear_expired(), 0)
+        finally:
+            connection.cursor = old_cursor
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(Session.objects.filter(session_key=session.session_key).exists())
+
+    def test_cleanup_command(self):
+        session = self.backend()
+        session.set_expiry(-10)
+        session.save()
+        out = StringIO()
+        call_command('cleanup', batch_size=10, verbosity=2, stdout=out)
+        self.assertEqual(out.getvalue(), "Deleted 1 expired session.\n")
+        self.assertFalse(Session.objects.exists())
+
 
 DatabaseSessionWithTimeZoneTests = override_settings(USE_TZ=True)(DatabaseSessionTests)
 
@@ -334,6 +447,77 @@ class FileSessionTests(SessionTestsMixin, unittest.TestCase):
         self.assertRaises(SuspiciousOperation,
                           self.backend("a/b/c").load)
 
+    def test_save_every_request_in_place_change(self):
+        session = self.backend()
+        session['foo'] = {'bar': 1}
+        session.save()
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = session.session_key
+        with override_settings(SESSION_SAVE_EVERY_REQUEST=True,
+                SESSION_ENGINE='django.contrib.sessions.backends.file'):
+            middleware = SessionMiddleware()
+            middleware.process_request(request)
+            request.session['foo']['bar'] = 'baz'
+            self.assertFalse(request.session.modified)
+            middleware.process_response(request, HttpResponse())
+        session = self.backend(session.session_key)
+        self.assertEqual(session['foo'], {'bar': 'baz'})
+
+    def test_touch(self):
+        session = self.backend()
+        session['x'] = 1
+        session.save()
+        path = session._key_to_file()
+        os.utime(path, (0, 0))
+        session = self.backend(session.session_key)
+        session.touch()
+        self.assertTrue(os.path.getmtime(path) > 0)
+        self.assertEqual(self.backend(session.session_key)['x'], 1)
+        session.delete()
+
+    def create_session(self, age, expiry=None):
+        session = self.backend()
+        session['x'] = 1
+        session.set_expiry(expiry)
+        session.save()
+        modified = time.time() - age
+        os.utime(session._key_to_file(), (modified, modified))
+        return session.session_key
+
+    def test_load_expired(self):
+        session_key = self.create_session(settings.SESSION_COOKIE_AGE + 10)
+        session = self.backend(session_key)
+        self.assertEqual(session.load(), {})
+        self.assertNotEqual(session.session_key, session_key)
+        self.assertFalse(session.exists(session_key))
+
+    def test_clear_expired(self):
+        age = settings.SESSION_COOKIE_AGE + 10
+        expired = self.create_session(age)
+        current = self.create_session(10)
+        custom_expiry = self.create_session(age, expiry=age + 60)
+        custom_expired = self.create_session(10, expiry=5)
+        # Temporary files and other files are left alone.
+        open(os.path.join(self.temp_session_store,
+                          settings.SESSION_COOKIE_NAME + '_out_x'), 'w').close()
+        open(os.path.join(self.temp_session_store, 'other'), 'w').close()
+        self.assertEqual(self.backend.clear_expired(batch_size=2), 1)
+        session = self.backend()
+        self.assertFalse(session.exists(expired))
+        self.assertTrue(session.exists(current))
+        self.assertTrue(session.exists(custom_expiry))
+        self.assertEqual(len(os.listdir(self.temp_session_store)), 5)
+        # A file modified recently isn't examined, but load() rejects it.
+        self.assertTrue(session.exists(custom_expired))
+        self.assertEqual(self.backend(custom_expired).load(), {})
+
+    def test_cleanup_command(self):
+        self.create_session(settings.SESSION_COOKIE_AGE + 10)
+        with override_settings(
+                SESSION_ENGINE='django.contrib.sessions.backends.file'):
+            call_command('cleanup', verbosity=0)
+        self.assertEqual(os.listdir(self.temp_session_store), [])
+
 
 class CacheSessionTests(SessionTestsMixin, unittest.TestCase):
 
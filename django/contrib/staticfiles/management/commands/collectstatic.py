@@ -10,6 +10,7 @@ from django.utils.encoding import smart_str, smart_unicode
 from django.utils.datastructures import SortedDict
 
 from django.contrib.staticfiles import finders, storage
+from django.contrib.staticfiles.utils import parallel_map
 
 
 class Command(NoArgsCommand):
@@ -42,6 +43,9 @@ class Command(NoArgsCommand):
             dest='use_default_ignore_patterns', default=True,
             help="Don't ignore the common private glob-style patterns 'CVS', "
                 "'.*' and '*~'."),
+        make_option('--parallel', action='store', dest='parallel', type='int',
+            default=1, metavar='N',
+            help="Copy and post-process files using N threads."),
     )
     help = "Collect static files in a single location."
     requires_model_validation = False
@@ -77,6 +81,7 @@ class Command(NoArgsCommand):
             ignore_patterns += ['CVS', '.*', '*~']
         self.ignore_patterns = list(set(ignore_patterns))
         self.post_process = options['post_process']
+        self.parallel = max(int(options.get('parallel', 1)), 1)
 
     def collect(self):
         """
@@ -100,6 +105,7 @@ class Command(NoArgsCommand):
             handler = self.copy_file
 
         found_files = SortedDict()
+        first_found, duplicates = [], []
         for finder in finders.get_finders():
             for path, storage in finder.list(self.ignore_patterns):
                 # Prefix the relative path if the source storage contains it
@@ -107,14 +113,26 @@ class Command(NoArgsCommand):
                     prefixed_path = os.path.join(storage.prefix, path)
                 else:
                     prefixed_path = path
+                if prefixed_path in found_files:
+                    duplicates.append((path, prefixed_path, storage))
+                else:
+                    first_found.append((path, prefixed_path, storage))
                 found_files[prefixed_path] = (storage, path)
-                handler(path, prefixed_path, storage)
+
+        # The first file found for each path is the one that is collected,
+        # the handler only logs that the others are skipped.
+        for result in parallel_map(lambda args: handler(*args), first_found,
+                                   self.parallel):
+            pass
+        for path, prefixed_path, storage in duplicates:
+            handler(path, prefixed_path, storage)
 
         # Here we check if the storage backend has a post_process
         # method and pass it the list of modified files.
         if self.post_process and hasattr(self.storage, 'post_process'):
             processor = self.storage.post_process(found_files,
-                                                  dry_run=self.dry_run)
+                                                  dry_run=self.dry_run,
+                                                  parallel=self.parallel)
             for original_path, processed_path, processed in processor:
                 if processed:
                     self.log(u"Post-processed '%s' as '%s" %
@@ -12,12 +12,14 @@ from django.core.cache import (get_cache, InvalidCacheBackendError,
 from django.core.exceptions import ImproperlyConfigured
 from django.core.files.base import ContentFile
 from django.core.files.storage import FileSystemStorage, get_storage_class
+from django.utils import simplejson
 from django.utils.datastructures import SortedDict
 from django.utils.encoding import force_unicode, smart_str
 from django.utils.functional import LazyObject
 from django.utils.importlib import import_module
 
-from django.contrib.staticfiles.utils import check_settings, matches_patterns
+from django.contrib.staticfiles.utils import (check_settings,
+    matches_patterns, parallel_map)
 
 
 class StaticFilesStorage(FileSystemStorage):
@@ -45,6 +47,8 @@ class StaticFilesStorage(FileSystemStorage):
 
 
 class CachedFilesMixin(object):
+    manifest_name = 'staticfiles.json'
+    manifest_version = '1.0'
     patterns = (
         ("*.css", (
             r"""(url\(['"]{0,1}\s*(.*?)["']{0,1}\))""",
@@ -97,6 +101,20 @@ class CachedFilesMixin(object):
     def cache_key(self, name):
         return u'staticfiles:cache:%s' % name
 
+    def stored_name(self, name):
+        """
+        Returns the hashed name of the file with the given name, which may
+        include a query string.
+        """
+        cache_key = self.cache_key(name)
+        hashed_name = self.cache.get(cache_key)
+        if hashed_name is None:
+            hashed_name = self.hashed_name(name).replace('\\', '/')
+            # set the cache if there was a miss
+            # (e.g. if cache server goes down)
+            self.cache.set(cache_key, hashed_name)
+        return hashed_name
+
     def url(self, name, force=False):
         """
         Returns the real URL in DEBUG mode.
@@ -108,13 +126,7 @@ class CachedFilesMixin(object):
             if urlsplit(clean_name).path.endswith('/'):  # don't hash paths
                 hashed_name = name
             else:
-                cache_key = self.cache_key(name)
-                hashed_name = self.cache.get(cache_key)
-                if hashed_name is None:
-                    hashed_name = self.hashed_name(clean_name).replace('\\', '/')
-                    # set the cache if there was a miss
-                    # (e.g. if cache server goes down)
-                    self.cache.set(cache_key, hashed_name)
+                hashed_name = self.stored_name(clean_name)
 
         final_url = super(CachedFilesMixin, self).url(hashed_name)
 
@@ -170,7 +182,48 @@ class CachedFilesMixin(object):
             return 'url("%s")' % unquote(hashed_url)
         return converter
 
-    def post_process(self, paths, dry_run=False, **options):
+    def read_manifest(self):
+        """
+        Returns the hashed names and the source signatures stored in the
+        manifest by the previous run of collectstatic, as two dictionaries.
+        """
+        try:
+            manifest = self.open(self.manifest_name)
+        except IOError:
+            return {}, {}
+        try:
+            try:
+                stored = simplejson.loads(manifest.read())
+            except ValueError:
+                return {}, {}
+        finally:
+            manifest.close()
+        if stored.get('version') != self.manifest_version:
+            return {}, {}
+        return stored.get('paths', {}), stored.get('sources', {})
+
+    def save_manifest(self, hashed_names, sources):
+        payload = simplejson.dumps({
+            'version': self.manifest_version,
+            'paths': hashed_names,
+            'sources': sources,
+        }, sort_keys=True)
+        if self.exists(self.manifest_name):
+            self.delete(self.manifest_name)
+        self._save(self.manifest_name, ContentFile(smart_str(payload)))
+
+    def source_signature(self, storage, path):
+        """
+        Returns a string that changes when the source file of a static file
+        changes, or None if its storage can't tell.
+        """
+        try:
+            return u'%s %s' % (storage.modified_time(path).isoformat(),
+                               storage.size(path))
+        except (OSError, NotImplementedError, AttributeError):
+            return None
+
+    def post_process(self, paths, dry_run=False, parallel=1, **options):
         """
         Post process the given list of files (called from collectstatic).
 
@@ -183,6 +236,11 @@ class CachedFilesMixin(object):
 
         If either of these are performed on a file, then that file is considered
         post-processed.
+
+        The hashed names are recorded in a manifest along with the
+        modification time and size of the source files, so that files that
+        haven't changed since the last run aren't hashed again. Files are
+        processed with up to ``parallel`` threads.
         """
         # don't even dare to process the files if we're in dry run mode
         if dry_run:
@@ -193,53 +251,128 @@ class CachedFilesMixin(object):
 
         # build a list of adjustable files
         matches = lambda path: matches_patterns(path, self._patterns.keys())
-        adjustable_paths = [path for path in paths if matches(path)]
+        adjustable_paths = set([path for path in paths if matches(path)])
+
+        hashed_names, sources = self.read_manifest()
 
-        # then sort the files by the directory level
+        # Files that aren't adjusted and whose source didn't change since
+        # the last run keep their hashed name. Adjustable files are always
+        # processed again since their content depends on other files.
+        unchanged, changed = [], []
         path_level = lambda name: len(name.split(os.sep))
         for name in sorted(paths.keys(), key=path_level, reverse=True):
+            storage, path = paths[name]
+            signature = self.source_signature(storage, path)
+            if (name not in adjustable_paths and signature is not None and
+                    sources.get(name) == signature and
+                    name in hashed_names and self.exists(hashed_names[name])):
+                unchanged.append(name)
+            else:
+                changed.append(name)
+            sources[name] = signature
+
+        self.cache.set_many(dict([(self.cache_key(name), hashed_names[name])
+                                  for name in unchanged]))
+        for name in unchanged:
+            yield name, hashed_names[name], False
 
-            # use the original, local file, not the copied-but-unprocessed
-            # file, which might be somewhere far away, like S3
+        def process(name):
             storage, path = paths[name]
-            with storage.open(path) as original_file:
-
-                # generate the hash with the original content, even for
-                # adjustable files.
-                hashed_name = self.hashed_name(name, original_file)
-
-                # then get the original's file content..
-                if hasattr(original_file, 'seek'):
-                    original_file.seek(0)
-
-                hashed_file_exists = self.exists(hashed_name)
-                processed = False
-
-                # ..to apply each replacement pattern to the content
-                if name in adjustable_paths:
-                    content = original_file.read()
-                    converter = self.url_converter(name)
-                    for patterns in self._patterns.values():
-                        for pattern in patterns:
-                            content = pattern.sub(converter, content)
-                    if hashed_file_exists:
-                        self.delete(hashed_name)
-                    # then save the processed result
-                    content_file = ContentFile(smart_str(content))
-                    saved_name = self._save(hashed_name, content_file)
-                    hashed_name = force_unicode(saved_name.replace('\\', '/'))
+            return self.post_process_file(name, storage, path,
+                                          name in adjustable_paths)
+        for name, hashed_name, processed in parallel_map(process, changed,
+                                                         parallel):
+            hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+
+        self.save_manifest(hashed_names, sources)
+
+    def post_process_file(self, name, storage, path, adjustable):
+        """
+        Saves the hashed copy of the file found at ``path`` in ``storage``
+        and returns a ``(name, hashed_name, processed)`` tuple.
+        """
+        # use the original, local file, not the copied-but-unprocessed
+        # file, which might be somewhere far away, like S3
+        with storage.open(path) as original_file:
+
+            # generate the hash with the original content, even for
+            # adjustable files.
+            hashed_name = self.hashed_name(name, original_file)
+
+            # then get the original's file content..
+            if hasattr(original_file, 'seek'):
+                original_file.seek(0)
+
+            hashed_file_exists = self.exists(hashed_name)
+            processed = False
+
+            # ..to apply each replacement pattern to the content
+            if adjustable:
+                content = original_file.read()
+                converter = self.url_converter(name)
+                for patterns in self._patterns.values():
+                    for pattern in patterns:
+                        content = pattern.sub(converter, content)
+                if hashed_file_exists:
+                    self.delete(hashed_name)
+                # then save the processed result
+                content_file = ContentFile(smart_str(content))
+                saved_name = self._save(hashed_name, content_file)
+                hashed_name = force_unicode(saved_name.replace('\\', '/'))
+                processed = True
+            else:
+                # or handle the case in which neither processing nor
+                # a change to the original file happened
+                if not hashed_file_exists:
                     processed = True
-                else:
-                    # or handle the case in which neither processing nor
-                    # a change to the original file happened
-                    if not hashed_file_exists:
-                        processed = True
-                        saved_name = self._save(hashed_name, original_file)
-                        hashed_name = force_unicode(saved_name.replace('\\', '/'))
+                    saved_name = self._save(hashed_name, original_file)
+                    hashed_name = force_unicode(saved_name.replace('\\', '/'))
+
+            # and then set the cache accordingly
+            self.cache.set(self.cache_key(name), hashed_name)
+        return name, hashed_name, processed
+
+
+class ManifestFilesMixin(CachedFilesMixin):
+    """
+    A CachedFilesMixin that looks up hashed names in the manifest written by
+    collectstatic, which is read once when the storage is created, instead
+    of in the cache backend.
+    """
+    def __init__(self, *args, **kwargs):
+        super(ManifestFilesMixin, self).__init__(*args, **kwargs)
+        self.hashed_files = self.read_manifest()[0]
+        self._post_processing = False
+
+    def stored_name(self, name):
+        if self._post_processing:
+            # Files referenced by the files being processed may not be in the
+            # manifest yet.
+            return super(ManifestFilesMixin, self).stored_name(name)
+        parsed_name = urlsplit(unquote(name))
+        clean_name = parsed_name.path.strip()
+        hashed_name = self.hashed_files.get(clean_name)
+        if hashed_name is None:
+            raise ValueError("Missing staticfiles manifest entry for '%s'" %
+                             clean_name)
+        unparsed_name = list(parsed_name)
+        unparsed_name[2] = hashed_name
+        # Special casing for a @font-face hack, like url(myfont.eot?#iefix")
+        # http://www.fontspring.com/blog/the-new-bulletproof-font-face-syntax
+        if '?#' in name and not unparsed_name[3]:
+            unparsed_name[2] += '?'
+        return urlunsplit(unparsed_name)
 
-                # and then set the cache accordingly
-                self.cache.set(self.cache_key(name), hashed_name)
-                yield name, hashed_name, processed
+    def post_process(self, *args, **kwargs):
+        self._post_processing = True
+        try:
+            for processed in super(ManifestFilesMixin, self).post_process(
+                    *args, **kwargs):
+                yield processed
+        finally:
+            self._post_processing = False
+        self.hashed_files = self.read_manifest()[0]
 
 
 class CachedStaticFilesStorage(CachedFilesMixin, StaticFilesStorage):
@@ -250,6 +383,14 @@ class CachedStaticFilesStorage(CachedFilesMixin, StaticFilesStorage):
     pass
 
 
+class ManifestStaticFilesStorage(ManifestFilesMixin, StaticFilesStorage):
+    """
+    A static file system storage backend which also saves hashed copies of
+    the files it saves, and finds their names in the collectstatic manifest.
+    """
+    pass
+
+
 class AppStaticStorage(FileSystemStorage):
     """
     A file system storage backend that takes an app module and works
@@ -1,5 +1,8 @@
 import os
 import fnmatch
+import sys
+import threading
+import Queue
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
@@ -55,3 +58,53 @@ def check_settings(base_url=None):
             (settings.MEDIA_ROOT == settings.STATIC_ROOT)):
         raise ImproperlyConfigured("The MEDIA_ROOT and STATIC_ROOT "
                                    "settings must have different values")
+
+def parallel_map(function, items, workers=1):
+    """
+    Calls ``function`` with each of the given items, using up to ``workers``
+    threads, and yields the results in the order of the items.
+
+    If a call raises an exception, no further calls are started and the
+    iterator raises that exception.
+    """
+    items = list(items)
+    workers = min(workers, len(items))
+    if workers <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    tasks = Queue.Queue()
+    for task in enumerate(items):
+        tasks.put(task)
+    results = Queue.Queue()
+    stopped = []
+
+    def work():
+        while not stopped:
+            try:
+                index, item = tasks.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results.put((index, function(item), None))
+            except Exception:
+                stopped.append(True)
+                results.put((index, None, sys.exc_info()))
+
+    for i in range(workers):
+        thread = threading.Thread(target=work)
+        thread.setDaemon(True)
+        thread.start()
+
+    done = {}
+    try:
+        for position in xrange(len(items)):
+            while position not in done:
+                index, result, exc_info = results.get()
+                if exc_info is not None:
+                    raise exc_info[0], exc_info[1], exc_info[2]
+                done[index] = result
+            yield done.pop(position)
+    finally:
+        stopped.append(True)
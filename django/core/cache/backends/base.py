@@ -167,13 +167,19 @@ class BaseCache(object):
 
         If timeout is given, that timeout will be used for the key; otherwise
         the default cache timeout will be used.
+
+        Returns a list of the keys that couldn't be stored, which is empty if
+        they all were (or the backend can't tell).
         """
+        failed_keys = []
         for key, value in data.items():
-            self.set(key, value, timeout=timeout, version=version)
+            if self.set(key, value, timeout=timeout, version=version) is False:
+                failed_keys.append(key)
+        return failed_keys
 
     def delete_many(self, keys, version=None):
         """
-        Set a bunch of values in the cache at once.  For certain backends
+        Delete a bunch of values in the cache at once.  For certain backends
         (memcached), this is much more efficient than calling delete() multiple
         times.
         """
@@ -74,11 +74,104 @@ class DatabaseCache(BaseDatabaseCache):
         value = connections[db].ops.process_clob(row[1])
         return pickle.loads(base64.decodestring(value))
 
+    def get_many(self, keys, version=None):
+        key_map = {}
+        for key in keys:
+            made_key = self.make_key(key, version=version)
+            self.validate_key(made_key)
+            key_map[made_key] = key
+        if not key_map:
+            return {}
+        db = router.db_for_read(self.cache_model_class)
+        connection = connections[db]
+        table = connection.ops.quote_name(self._table)
+        cursor = connection.cursor()
+
+        rows = []
+        made_keys = key_map.keys()
+        batch_size = max(connection.ops.bulk_batch_size(['cache_key'], made_keys), 1)
+        for i in range(0, len(made_keys), batch_size):
+            batch = made_keys[i:i + batch_size]
+            cursor.execute("SELECT cache_key, value, expires FROM %s "
+                           "WHERE cache_key IN (%s)" % (table, ', '.join(['%s'] * len(batch))),
+                           batch)
+            rows.extend(cursor.fetchall())
+
+        now = timezone.now()
+        result = {}
+        expired_keys = []
+        for made_key, value, expires in rows:
+            if expires < now:
+                expired_keys.append(made_key)
+            else:
+                value = connection.ops.process_clob(value)
+                result[key_map[made_key]] = pickle.loads(base64.decodestring(value))
+        if expired_keys:
+            self._delete_keys(expired_keys)
+        return result
+
     def set(self, key, value, timeout=None, version=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
         self._base_set('set', key, value, timeout)
 
+    def set_many(self, data, timeout=None, version=None):
+        key_map = {}
+        values = {}
+        for key, value in data.items():
+            made_key = self.make_key(key, version=version)
+            self.validate_key(made_key)
+            key_map[made_key] = key
+            values[made_key] = value
+        if not values:
+            return []
+        if timeout is None:
+            timeout = self.default_timeout
+        db = router.db_for_write(self.cache_model_class)
+        connection = connections[db]
+        table = connection.ops.quote_name(self._table)
+        cursor = connection.cursor()
+
+        now, exp = self._prepare_write(db, cursor, timeout)
+        exp = connection.ops.value_to_db_datetime(exp)
+
+        failed_keys = []
+        made_keys = values.keys()
+        batch_size = max(connection.ops.bulk_batch_size(['cache_key', 'value', 'expires'], made_keys), 1)
+        for i in range(0, len(made_keys), batch_size):
+            batch = made_keys[i:i + batch_size]
+            try:
+                cursor.execute("SELECT cache_key FROM %s "
+                               "WHERE cache_key IN (%s)" % (table, ', '.join(['%s'] * len(batch))),
+                               batch)
+                existing = set([row[0] for row in cursor.fetchall()])
+                updates = []
+                inserts = []
+                for made_key in batch:
+                    pickled = pickle.dumps(values[made_key], pickle.HIGHEST_PROTOCOL)
+                    encoded = base64.encodestring(pickled).strip()
+                    if made_key in existing:
+                        updates.append((encoded, exp, made_key))
+                    else:
+                        inserts.append((made_key, encoded, exp))
+                if updates:
+                    cursor.executemany("UPDATE %s SET value = %%s, expires = %%s "
+                                       "WHERE cache_key = %%s" % table, updates)
+                if inserts:
+                    cursor.executemany("INSERT INTO %s (cache_key, value, expires) "
+                                       "VALUES (%%s, %%s, %%s)" % table, inserts)
+            except DatabaseError:
+                # Another process may have written some of these keys in the
+                # meantime; retry this batch one key at a time so only the
+                # keys that really can't be written are reported.
+                transaction.rollback_unless_managed(using=db)
+                for made_key in batch:
+                    if not self._base_set('set', made_key, values[made_key], timeout):
+                        failed_keys.append(key_map[made_key])
+            else:
+                transaction.commit_unless_managed(using=db)
+        return failed_keys
+
     def add(self, key, value, timeout=None, version=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
@@ -91,17 +184,7 @@ class DatabaseCache(BaseDatabaseCache):
         table = connections[db].ops.quote_name(self._table)
         cursor = connections[db].cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM %s" % table)
-        num = cursor.fetchone()[0]
-        now = timezone.now()
-        now = now.replace(microsecond=0)
-        if settings.USE_TZ:
-            exp = datetime.utcfromtimestamp(time.time() + timeout)
-        else:
-            exp = datetime.fromtimestamp(time.time() + timeout)
-        exp = exp.replace(microsecond=0)
-        if num > self._max_entries:
-            self._cull(db, cursor, now)
+        now, exp = self._prepare_write(db, cursor, timeout)
         pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
         encoded = base64.encodestring(pickled).strip()
         cursor.execute("SELECT cache_key, expires FROM %s "
@@ -125,6 +208,26 @@ class DatabaseCache(BaseDatabaseCache):
             transaction.commit_unless_managed(using=db)
             return True
 
+    def _prepare_write(self, db, cursor, timeout):
+        """
+        Culls the cache table if it holds too many entries and returns the
+        current time and the expiry time of entries written with the given
+        timeout, both without microseconds.
+        """
+        table = connections[db].ops.quote_name(self._table)
+        cursor.execute("SELECT COUNT(*) FROM %s" % table)
+        num = cursor.fetchone()[0]
+        now = timezone.now()
+        now = now.replace(microsecond=0)
+        if settings.USE_TZ:
+            exp = datetime.utcfromtimestamp(time.time() + timeout)
+        else:
+            exp = datetime.fromtimestamp(time.time() + timeout)
+        exp = exp.replace(microsecond=0)
+        if num > self._max_entries:
+            self._cull(db, cursor, now)
+        return now, exp
+
     def delete(self, key, version=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
@@ -136,6 +239,28 @@ class DatabaseCache(BaseDatabaseCache):
         cursor.execute("DELETE FROM %s WHERE cache_key = %%s" % table, [key])
         transaction.commit_unless_managed(using=db)
 
+    def delete_many(self, keys, version=None):
+        made_keys = []
+        for key in keys:
+            made_key = self.make_key(key, version=version)
+            self.validate_key(made_key)
+            made_keys.append(made_key)
+        if made_keys:
+            self._delete_keys(made_keys)
+
+    def _delete_keys(self, keys):
+        db = router.db_for_write(self.cache_model_class)
+        connection = connections[db]
+        table = connection.ops.quote_name(self._table)
+        cursor = connection.cursor()
+
+        batch_size = max(connection.ops.bulk_batch_size(['cache_key'], keys), 1)
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            cursor.execute("DELETE FROM %s WHERE cache_key IN (%s)"
+                           % (table, ', '.join(['%s'] * len(batch))), batch)
+        transaction.commit_unless_managed(using=db)
+
     def has_key(self, key, version=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
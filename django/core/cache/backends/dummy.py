@@ -33,7 +33,7 @@ class DummyCache(BaseCache):
         return False
 
     def set_many(self, data, timeout=0, version=None):
-        pass
+        return []
 
     def delete_many(self, keys, version=None):
         pass
@@ -49,14 +49,34 @@ class FileBasedCache(BaseCache):
         key = self.make_key(key, version=version)
         self.validate_key(key)
 
-        fname = self._key_to_file(key)
-        dirname = os.path.dirname(fname)
+        if timeout is None:
+            timeout = self.default_timeout
 
+        self._cull()
+        self._write(self._key_to_file(key), value, timeout)
+
+    def set_many(self, data, timeout=None, version=None):
         if timeout is None:
             timeout = self.default_timeout
 
+        # Cull once for the whole batch rather than walking the cache
+        # directory for every key.
         self._cull()
 
+        failed_keys = []
+        for key, value in data.items():
+            made_key = self.make_key(key, version=version)
+            self.validate_key(made_key)
+            if not self._write(self._key_to_file(made_key), value, timeout):
+                failed_keys.append(key)
+        return failed_keys
+
+    def _write(self, fname, value, timeout):
+        """
+        Writes value to fname along with its expiry time. Returns False if
+        the file couldn't be written.
+        """
+        dirname = os.path.dirname(fname)
         try:
             if not os.path.exists(dirname):
                 os.makedirs(dirname)
@@ -69,7 +89,8 @@ class FileBasedCache(BaseCache):
             finally:
                 f.close()
         except (IOError, OSError):
-            pass
+            return False
+        return True
 
     def delete(self, key, version=None):
         key = self.make_key(key, version=version)
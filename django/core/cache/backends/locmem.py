@@ -7,6 +7,10 @@ try:
     import cPickle as pickle
 except ImportError:
     import pickle
+try:
+    import threading
+except ImportError:
+    import dummy_threading as threading
 
 from django.core.cache.backends.base import BaseCache
 from django.utils.synch import RWLock
@@ -16,6 +20,7 @@ from django.utils.synch import RWLock
 _caches = {}
 _expire_info = {}
 _locks = {}
+_shards = {}
 
 class LocMemCache(BaseCache):
     def __init__(self, name, params):
@@ -138,6 +143,258 @@ class LocMemCache(BaseCache):
         self._cache.clear()
         self._expire_info.clear()
 
+
+# Indexes into the entries of a _Shard's linked list.
+PREV, NEXT, KEY, VALUE, EXPIRES = 0, 1, 2, 3, 4
+
+class _Shard(object):
+    """
+    One lock-striped slice of a ShardedLocMemCache.
+
+    Entries are kept in a dict and threaded onto a circular doubly-linked list
+    in order of use, most recent first, so that the least recently used entry
+    can be found and evicted in constant time. All methods must be called with
+    ``lock`` held.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.map = {}
+        self.root = root = []
+        root[:] = [root, root, None, None, None]
+        self.hits = self.misses = self.evictions = 0
+
+    def _unlink(self, entry):
+        entry[PREV][NEXT] = entry[NEXT]
+        entry[NEXT][PREV] = entry[PREV]
+
+    def _link_first(self, entry):
+        root = self.root
+        entry[PREV] = root
+        entry[NEXT] = root[NEXT]
+        root[NEXT][PREV] = entry
+        root[NEXT] = entry
+
+    def lookup(self, key, now, touch=True):
+        """
+        Returns the live entry for key, or None. Expired entries are removed.
+        """
+        entry = self.map.get(key)
+        if entry is None:
+            return None
+        if entry[EXPIRES] <= now:
+            self.remove(key)
+            return None
+        if touch and self.root[NEXT] is not entry:
+            self._unlink(entry)
+            self._link_first(entry)
+        return entry
+
+    def store(self, key, value, expires, max_entries, cull_frequency):
+        entry = self.map.get(key)
+        if entry is not None:
+            entry[VALUE] = value
+            entry[EXPIRES] = expires
+            self._unlink(entry)
+            self._link_first(entry)
+            return
+        if len(self.map) >= max_entries:
+            if cull_frequency == 0:
+                self.evictions += len(self.map)
+                self.clear()
+            else:
+                self.remove(self.root[PREV][KEY])
+                self.evictions += 1
+        entry = [None, None, key, value, expires]
+        self._link_first(entry)
+        self.map[key] = entry
+
+    def remove(self, key):
+        entry = self.map.pop(key, None)
+        if entry is not None:
+            self._unlink(entry)
+
+    def clear(self):
+        self.map.clear()
+        root = self.root
+        root[:] = [root, root, None, None, None]
+
+
+class ShardedLocMemCache(BaseCache):
+    """
+    An in-memory cache for multi-threaded processes.
+
+    Keys are spread over ``SHARDS`` independently locked shards so that
+    threads rarely wait for each other, and each shard evicts its least
+    recently used entry when it's full. With the ``PICKLE`` option set to
+    False, values are stored as they are instead of as pickles; only do that
+    for values that are never mutated after being cached.
+    """
+    def __init__(self, name, params):
+        BaseCache.__init__(self, params)
+        options = params.get('OPTIONS', {})
+        try:
+            num_shards = max(int(options.get('SHARDS', 16)), 1)
+        except (ValueError, TypeError):
+            num_shards = 16
+        self._pickle = options.get('PICKLE', True)
+        self._shards = _shards.setdefault(name, [_Shard() for i in range(num_shards)])
+        num_shards = len(self._shards)
+        self._shard_max_entries = max((self._max_entries + num_shards - 1) // num_shards, 1)
+
+    def _get_shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _group_by_shard(self, keys):
+        """
+        Returns a list of (shard, keys) pairs so that each shard's lock is
+        only taken once for a batch of keys.
+        """
+        groups = {}
+        for key in keys:
+            shard = self._get_shard(key)
+            groups.setdefault(id(shard), (shard, []))[1].append(key)
+        return groups.values()
+
+    def _dumps(self, value):
+        if self._pickle:
+            return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return value
+
+    def _loads(self, value):
+        if self._pickle:
+            return pickle.loads(value)
+        return value
+
+    def _store(self, shard, key, value, expires):
+        shard.store(key, value, expires, self._shard_max_entries, self._cull_frequency)
+
+    def _expires(self, timeout):
+        if timeout is None:
+            timeout = self.default_timeout
+        return time.time() + timeout
+
+    def add(self, key, value, timeout=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        value = self._dumps(value)
+        shard = self._get_shard(key)
+        with shard.lock:
+            if shard.lookup(key, time.time(), touch=False) is not None:
+                return False
+            self._store(shard, key, value, self._expires(timeout))
+            return True
+
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        shard = self._get_shard(key)
+        with shard.lock:
+            entry = shard.lookup(key, time.time())
+            if entry is None:
+                shard.misses += 1
+                return default
+            shard.hits += 1
+            value = entry[VALUE]
+        return self._loads(value)
+
+    def get_many(self, keys, version=None):
+        key_map = {}
+        for key in keys:
+            made_key = self.make_key(key, version=version)
+            self.validate_key(made_key)
+            key_map[made_key] = key
+        found = {}
+        now = time.time()
+        for shard, shard_keys in self._group_by_shard(key_map):
+            with shard.lock:
+                for made_key in shard_keys:
+                    entry = shard.lookup(made_key, now)
+                    if entry is None:
+                        shard.misses += 1
+                    else:
+                        shard.hits += 1
+                        found[key_map[made_key]] = entry[VALUE]
+        for key, value in found.items():
+            found[key] = self._loads(value)
+        return found
+
+    def set(self, key, value, timeout=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        value = self._dumps(value)
+        shard = self._get_shard(key)
+        with shard.lock:
+            self._store(shard, key, value, self._expires(timeout))
+
+    def set_many(self, data, timeout=None, version=None):
+        values = {}
+        for key, value in data.items():
+            made_key = self.make_key(key, version=version)
+            self.validate_key(made_key)
+            values[made_key] = self._dumps(value)
+        expires = self._expires(timeout)
+        for shard, shard_keys in self._group_by_shard(values):
+            with shard.lock:
+                for made_key in shard_keys:
+                    self._store(shard, made_key, values[made_key], expires)
+        return []
+
+    def incr(self, key, delta=1, version=None):
+        made_key = self.make_key(key, version=version)
+        self.validate_key(made_key)
+        shard = self._get_shard(made_key)
+        with shard.lock:
+            entry = shard.lookup(made_key, time.time())
+            if entry is None:
+                raise ValueError("Key '%s' not found" % key)
+            new_value = self._loads(entry[VALUE]) + delta
+            entry[VALUE] = self._dumps(new_value)
+        return new_value
+
+    def has_key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        shard = self._get_shard(key)
+        with shard.lock:
+            return shard.lookup(key, time.time(), touch=False) is not None
+
+    def delete(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        shard = self._get_shard(key)
+        with shard.lock:
+            shard.remove(key)
+
+    def delete_many(self, keys, version=None):
+        made_keys = []
+        for key in keys:
+            made_key = self.make_key(key, version=version)
+            self.validate_key(made_key)
+            made_keys.append(made_key)
+        for shard, shard_keys in self._group_by_shard(made_keys):
+            with shard.lock:
+                for made_key in shard_keys:
+                    shard.remove(made_key)
+
+    def clear(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear()
+
+    def stats(self):
+        """
+        Returns a dictionary with the number of entries in the cache and the
+        number of hits, misses and evictions since it was created.
+        """
+        stats = {'entries': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+        for shard in self._shards:
+            with shard.lock:
+                stats['entries'] += len(shard.map)
+                stats['hits'] += shard.hits
+                stats['misses'] += shard.misses
+                stats['evictions'] += shard.evictions
+        return stats
+
 # For backwards compatibility
 class CacheClass(LocMemCache):
     pass
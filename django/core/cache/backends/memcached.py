@@ -113,10 +113,13 @@ class BaseMemcachedCache(BaseCache):
 
     def set_many(self, data, timeout=0, version=None):
         safe_data = {}
+        original_keys = {}
         for key, value in data.items():
-            key = self.make_key(key, version=version)
-            safe_data[key] = value
-        self._cache.set_multi(safe_data, self._get_memcache_timeout(timeout))
+            safe_key = self.make_key(key, version=version)
+            safe_data[safe_key] = value
+            original_keys[safe_key] = key
+        failed_keys = self._cache.set_multi(safe_data, self._get_memcache_timeout(timeout))
+        return [original_keys[k] for k in failed_keys or []]
 
     def delete_many(self, keys, version=None):
         l = lambda x: self.make_key(x, version=version)
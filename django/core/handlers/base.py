@@ -13,6 +13,7 @@ class BaseHandler(object):
     # Changes that are always applied to a response (in this order).
     response_fixes = [
         http.fix_location_header,
+        http.partial_content,
         http.conditional_content_removal,
         http.fix_IE_for_attach,
         http.fix_IE_for_vary,
@@ -30,6 +31,8 @@ class BaseHandler(object):
         """
         from django.conf import settings
         from django.core import exceptions
+        from django.core.handlers.timing import PHASES, load_collectors, timed
+        collectors = load_collectors(settings.MIDDLEWARE_TIMING_COLLECTORS)
         self._view_middleware = []
         self._template_response_middleware = []
         self._response_middleware = []
@@ -54,16 +57,24 @@ class BaseHandler(object):
             except exceptions.MiddlewareNotUsed:
                 continue
 
-            if hasattr(mw_instance, 'process_request'):
-                request_middleware.append(mw_instance.process_request)
-            if hasattr(mw_instance, 'process_view'):
-                self._view_middleware.append(mw_instance.process_view)
-            if hasattr(mw_instance, 'process_template_response'):
-                self._template_response_middleware.insert(0, mw_instance.process_template_response)
-            if hasattr(mw_instance, 'process_response'):
-                self._response_middleware.insert(0, mw_instance.process_response)
-            if hasattr(mw_instance, 'process_exception'):
-                self._exception_middleware.insert(0, mw_instance.process_exception)
+            methods = {}
+            for phase in PHASES:
+                method = getattr(mw_instance, phase, None)
+                if method is not None and collectors:
+                    # Timing is only paid for when something collects it.
+                    method = timed(method, phase, middleware_path, collectors)
+                methods[phase] = method
+
+            if methods['process_request'] is not None:
+                request_middleware.append(methods['process_request'])
+            if methods['process_view'] is not None:
+                self._view_middleware.append(methods['process_view'])
+            if methods['process_template_response'] is not None:
+                self._template_response_middleware.insert(0, methods['process_template_response'])
+            if methods['process_response'] is not None:
+                self._response_middleware.insert(0, methods['process_response'])
+            if methods['process_exception'] is not None:
+                self._exception_middleware.insert(0, methods['process_exception'])
 
         # We only assign to this when initialization is complete as it is used
         # as a flag for initialization being complete.
@@ -81,7 +92,7 @@ class BaseHandler(object):
             # resolver is set
             urlconf = settings.ROOT_URLCONF
             urlresolvers.set_urlconf(urlconf)
-            resolver = urlresolvers.RegexURLResolver(r'^/', urlconf)
+            resolver = urlresolvers.get_resolver(urlconf)
             try:
                 response = None
                 # Apply request middleware
@@ -0,0 +1,146 @@
+"""
+Timing of middleware methods.
+
+When the MIDDLEWARE_TIMING_COLLECTORS setting lists collectors, the handler
+wraps each middleware method it loads so that the time spent in every call is
+passed to the record() method of each collector, along with the request, the
+phase (the name of the middleware method, such as 'process_request') and the
+path of the middleware class in MIDDLEWARE_CLASSES. Middleware methods aren't
+wrapped at all when no collector is configured.
+"""
+import inspect
+import threading
+from timeit import default_timer
+
+from django.core import exceptions
+from django.utils.importlib import import_module
+from django.utils.log import getLogger
+
+PHASES = (
+    'process_request',
+    'process_view',
+    'process_template_response',
+    'process_response',
+    'process_exception',
+)
+
+
+def load_collectors(paths):
+    """
+    Returns the collectors at the given dotted paths. A path can name a
+    collector class, which is instantiated without arguments, or a collector
+    instance.
+    """
+    collectors = []
+    for path in paths:
+        try:
+            module, attr = path.rsplit('.', 1)
+        except ValueError:
+            raise exceptions.ImproperlyConfigured("%s isn't a timing collector path" % path)
+        try:
+            mod = import_module(module)
+        except ImportError, e:
+            raise exceptions.ImproperlyConfigured('Error importing timing collector module %s: "%s"' % (module, e))
+        try:
+            collector = getattr(mod, attr)
+        except AttributeError:
+            raise exceptions.ImproperlyConfigured('Timing collector module "%s" does not define a "%s" collector' % (module, attr))
+        if inspect.isclass(collector):
+            collector = collector()
+        collectors.append(collector)
+    return collectors
+
+def timed(method, phase, name, collectors):
+    """
+    Returns a function that calls method and reports how long the call took
+    to the collectors, even when it raises an exception.
+    """
+    collectors = tuple(collectors)
+    def timed_method(request, *args):
+        start = default_timer()
+        try:
+            return method(request, *args)
+        finally:
+            duration = default_timer() - start
+            for collector in collectors:
+                collector.record(request, phase, name, duration)
+    return timed_method
+
+
+class BaseCollector(object):
+    """
+    Base class for timing collectors.
+    """
+    def record(self, request, phase, name, duration):
+        """
+        Records that the phase method of the middleware at path name took
+        duration seconds for request.
+        """
+        raise NotImplementedError
+
+
+class MemoryCollector(BaseCollector):
+    """
+    Keeps the number of calls and the total and maximum durations of each
+    middleware method in memory, for the current process.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, request, phase, name, duration):
+        key = (phase, name)
+        self._lock.acquire()
+        try:
+            count, total, maximum = self._stats.get(key, (0, 0.0, 0.0))
+            self._stats[key] = (count + 1, total + duration, max(maximum, duration))
+        finally:
+            self._lock.release()
+
+    def stats(self):
+        """
+        Returns a dictionary mapping (phase, name) pairs to (count, total,
+        maximum) tuples, with durations in seconds.
+        """
+        self._lock.acquire()
+        try:
+            return self._stats.copy()
+        finally:
+            self._lock.release()
+
+    def phase_stats(self):
+        """
+        Returns a dictionary mapping phases to (count, total) pairs, where
+        count is the number of middleware calls in that phase and total the
+        time they took together.
+        """
+        phases = {}
+        for (phase, name), (count, total, maximum) in self.stats().items():
+            phase_count, phase_total = phases.get(phase, (0, 0.0))
+            phases[phase] = (phase_count + count, phase_total + total)
+        return phases
+
+    def reset(self):
+        self._lock.acquire()
+        try:
+            self._stats = {}
+        finally:
+            self._lock.release()
+
+
+class LoggingCollector(BaseCollector):
+    """
+    Logs the duration of each middleware call to the 'django.request.timing'
+    logger at the DEBUG level.
+    """
+    def __init__(self):
+        self.logger = getLogger('django.request.timing')
+
+    def record(self, request, phase, name, duration):
+        self.logger.debug('%s.%s: %.3fms', name, phase, duration * 1000,
+            extra={
+                'request': request,
+                'phase': phase,
+                'middleware': name,
+                'duration': duration,
+            })
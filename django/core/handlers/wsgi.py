@@ -251,4 +251,8 @@ class WSGIHandler(base.BaseHandler):
         for c in response.cookies.values():
             response_headers.append(('Set-Cookie', str(c.output(header=''))))
         start_response(status, response_headers)
+        file_to_stream = getattr(response, 'file_to_stream', None)
+        if file_to_stream is not None and 'wsgi.file_wrapper' in environ:
+            # Let the server send the file, with sendfile() for instance.
+            return environ['wsgi.file_wrapper'](file_to_stream, response.block_size)
         return response
@@ -1,11 +1,35 @@
-from django.core.management.base import NoArgsCommand
-from django.utils import timezone
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand, CommandError
 
 class Command(NoArgsCommand):
+    option_list = NoArgsCommand.option_list + (
+        make_option('--batch-size', action='store', dest='batch_size',
+            type='int', default=1000,
+            help='The number of expired sessions to remove at a time. '
+                 'Defaults to 1000.'),
+        make_option('--sleep', action='store', dest='sleep', type='float',
+            default=0, help='The number of seconds to pause between two '
+                            'batches, to limit the load on the session '
+                            'store. Defaults to 0.'),
+    )
     help = "Can be run as a cronjob or directly to clean out old data from the database (only expired sessions at the moment)."
 
     def handle_noargs(self, **options):
-        from django.db import transaction
-        from django.contrib.sessions.models import Session
-        Session.objects.filter(expire_date__lt=timezone.now()).delete()
-        transaction.commit_unless_managed()
+        from django.conf import settings
+        from django.utils.importlib import import_module
+
+        verbosity = int(options.get('verbosity', 1))
+        batch_size = int(options.get('batch_size', 1000))
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        engine = import_module(settings.SESSION_ENGINE)
+        try:
+            deleted = engine.SessionStore.clear_expired(
+                batch_size=batch_size, sleep=float(options.get('sleep', 0)))
+        except NotImplementedError:
+            raise CommandError("Session engine '%s' doesn't support clearing "
+                               "expired sessions." % settings.SESSION_ENGINE)
+        if verbosity >= 2:
+            self.stdout.write("Deleted %d expired session%s.\n" %
+                              (deleted, deleted != 1 and 's' or ''))
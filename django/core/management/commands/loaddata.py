@@ -6,6 +6,7 @@ import sys
 import os
 import gzip
 import zipfile
+from StringIO import StringIO
 from optparse import make_option
 import traceback
 
@@ -16,6 +17,7 @@ from django.core.management.color import no_style
 from django.db import (connections, router, transaction, DEFAULT_DB_ALIAS,
       IntegrityError, DatabaseError)
 from django.db.models import get_apps
+from django.db.models.fields import AutoField
 from django.utils.itercompat import product
 
 try:
@@ -24,6 +26,150 @@ try:
 except ImportError:
     has_bz2 = False
 
+def save_object(obj, using):
+    """
+    Saves a DeserializedObject, naming the object in database errors.
+    """
+    try:
+        obj.save(using=using)
+    except (DatabaseError, IntegrityError), e:
+        msg = "Could not load %(app_label)s.%(object_name)s(pk=%(pk)s): %(error_msg)s" % {
+                'app_label': obj.object._meta.app_label,
+                'object_name': obj.object._meta.object_name,
+                'pk': obj.object.pk,
+                'error_msg': e
+            }
+        raise e.__class__, e.__class__(msg), sys.exc_info()[2]
+
+
+class BulkLoader(object):
+    """
+    Saves DeserializedObjects like DeserializedObject.save() does, but groups
+    consecutive objects of the same model and writes the new ones, and the
+    rows of their many-to-many relations, with batched INSERTs.
+
+    Objects that can't be inserted in bulk are saved one at a time, after the
+    objects buffered before them, so that rows are still written in the order
+    of the fixture.
+    """
+    batch_size = 1000
+
+    def __init__(self, using):
+        self.using = using
+        self.model = None
+        self.objects = []
+        self.pks = set()
+
+    def can_bulk_save(self, obj):
+        model = obj.object.__class__
+        opts = model._meta
+        if opts.parents or opts.proxy or opts.order_with_respect_to:
+            return False
+        if obj.object.pk is None:
+            return False
+        # Objects with natural keys may be looked up in the database while
+        # the rest of the fixture is deserialized, so they're saved at once.
+        if hasattr(model._default_manager, 'get_by_natural_key'):
+            return False
+        for field in opts.many_to_many:
+            if obj.m2m_data and field.name in obj.m2m_data:
+                if not field.rel.through._meta.auto_created:
+                    return False
+                if field.rel.symmetrical and field.rel.to == model:
+                    return False
+        return True
+
+    def save(self, obj):
+        if not self.can_bulk_save(obj):
+            self.flush()
+            save_object(obj, self.using)
+            return
+        model, pk = obj.object.__class__, obj.object.pk
+        if (model is not self.model or pk in self.pks or
+                len(self.objects) >= self.batch_size):
+            self.flush()
+            self.model = model
+        self.objects.append(obj)
+        self.pks.add(pk)
+
+    def flush(self):
+        """
+        Writes the buffered objects. Objects whose rows already exist are
+        saved one at a time, like DeserializedObject.save() would.
+        """
+        objects, self.objects, self.pks = self.objects, [], set()
+        if not objects:
+            return
+        model = self.model
+        opts = model._meta
+        ops = connections[self.using].ops
+        manager = model._base_manager.db_manager(self.using)
+
+        pks = [obj.object.pk for obj in objects]
+        existing = set()
+        batch_size = max(ops.bulk_batch_size([opts.pk], pks), 1)
+        for i in xrange(0, len(pks), batch_size):
+            existing.update(manager.filter(pk__in=pks[i:i + batch_size])
+                                   .values_list('pk', flat=True))
+        new_objects = []
+        for obj in objects:
+            if obj.object.pk in existing:
+                save_object(obj, self.using)
+            else:
+                new_objects.append(obj)
+        if not new_objects:
+            return
+
+        try:
+            self.insert(model, [obj.object for obj in new_objects],
+                        opts.local_fields, raw=True)
+            for field in opts.many_to_many:
+                self.insert_m2m(field, new_objects)
+        except (DatabaseError, IntegrityError), e:
+            if len(new_objects) == 1:
+                pks = 'pk=%s' % new_objects[0].object.pk
+            else:
+                pks = 'pk=%s to pk=%s, %d objects' % (new_objects[0].object.pk,
+                    new_objects[-1].object.pk, len(new_objects))
+            msg = "Could not load %(app_label)s.%(object_name)s(%(pks)s): %(error_msg)s" % {
+                    'app_label': opts.app_label,
+                    'object_name': opts.object_name,
+                    'pks': pks,
+                    'error_msg': e
+                }
+            raise e.__class__, e.__class__(msg), sys.exc_info()[2]
+        for obj in new_objects:
+            obj.object._state.db = self.using
+            obj.object._state.adding = False
+            obj.m2m_data = None
+
+    def insert_m2m(self, field, objects):
+        objects = [obj for obj in objects
+                   if obj.m2m_data and field.name in obj.m2m_data]
+        if not objects:
+            return
+        through = field.rel.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        rows = []
+        for obj in objects:
+            seen = set()
+            for pk in obj.m2m_data[field.name]:
+                if pk not in seen:
+                    seen.add(pk)
+                    rows.append(through(**{source: obj.object.pk, target: pk}))
+        if rows:
+            fields = [f for f in through._meta.local_fields
+                      if not isinstance(f, AutoField)]
+            self.insert(through, rows, fields)
+
+    def insert(self, model, objs, fields, raw=False):
+        ops = connections[self.using].ops
+        batch_size = max(ops.bulk_batch_size(fields, objs), 1)
+        for i in xrange(0, len(objs), batch_size):
+            model._base_manager._insert(objs[i:i + batch_size], fields=fields,
+                                        using=self.using, raw=raw)
+
 class Command(BaseCommand):
     help = 'Installs the named fixture(s) in the database.'
     args = "fixture [fixture ...]"
@@ -32,6 +178,9 @@ class Command(BaseCommand):
         make_option('--database', action='store', dest='database',
             default=DEFAULT_DB_ALIAS, help='Nominates a specific database to load '
                 'fixtures into. Defaults to the "default" database.'),
+        make_option('--bulk', action='store_true', dest='bulk', default=False,
+            help='Insert the objects of each model with batched INSERT '
+                'statements. No signals are sent for the objects saved.'),
     )
 
     def handle(self, *fixture_labels, **options):
@@ -56,6 +205,7 @@ class Command(BaseCommand):
         # if commit=False, the data load SQL will become part of
         # the transaction in place when loaddata was invoked.
         commit = options.get('commit', True)
+        bulk = options.get('bulk', False)
 
         # Keep a count of the installed objects and fixtures
         fixture_count = 0
@@ -82,8 +232,16 @@ class Command(BaseCommand):
                 zipfile.ZipFile.__init__(self, *args, **kwargs)
                 if settings.DEBUG:
                     assert len(self.namelist()) == 1, "Zip-compressed fixtures must contain only one file."
-            def read(self):
-                return zipfile.ZipFile.read(self, self.namelist()[0])
+                self._member = None
+            def read(self, *args):
+                if self._member is None:
+                    name = self.namelist()[0]
+                    if hasattr(zipfile.ZipFile, 'open'):
+                        # Decompress the fixture as it's read.
+                        self._member = self.open(name)
+                    else:
+                        self._member = StringIO(zipfile.ZipFile.read(self, name))
+                return self._member.read(*args)
 
         compression_types = {
             None:   open,
@@ -186,22 +344,20 @@ class Command(BaseCommand):
                                             (format, fixture_name, humanize(fixture_dir)))
 
                                     objects = serializers.deserialize(format, fixture, using=using)
+                                    if bulk:
+                                        loader = BulkLoader(using)
 
                                     for obj in objects:
                                         objects_in_fixture += 1
                                         if router.allow_syncdb(using, obj.object.__class__):
                                             loaded_objects_in_fixture += 1
                                             models.add(obj.object.__class__)
-                                            try:
-                                                obj.save(using=using)
-                                            except (DatabaseError, IntegrityError), e:
-                                                msg = "Could not load %(app_label)s.%(object_name)s(pk=%(pk)s): %(error_msg)s" % {
-                                                        'app_label': obj.object._meta.app_label,
-                                                        'object_name': obj.object._meta.object_name,
-                                                        'pk': obj.object.pk,
-                                                        'error_msg': e
-                                                    }
-                                                raise e.__class__, e.__class__(msg), sys.exc_info()[2]
+                                            if bulk:
+                                                loader.save(obj)
+                                            else:
+                                                save_object(obj, using)
+                                    if bulk:
+                                        loader.flush()
 
                                     loaded_object_count += loaded_objects_in_fixture
                                     fixture_object_count += objects_in_fixture
@@ -0,0 +1,108 @@
+import os
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand, CommandError
+from django.core.management.commands.makemessages import handle_extensions
+
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+
+def find_templates(dirs, extensions):
+    """
+    Returns the sorted names of the templates with the given extensions
+    found in the given directories, relative to the directory they're in.
+    """
+    names = set()
+    for template_dir in dirs:
+        for dirpath, dirnames, filenames in os.walk(template_dir):
+            for filename in filenames:
+                if os.path.splitext(filename)[1] not in extensions:
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = path[len(template_dir):].lstrip(os.sep)
+                names.add(name.replace(os.sep, '/'))
+    return sorted(names)
+
+def template_source_loaders():
+    """
+    Returns the TEMPLATE_LOADERS setting, with the cached loader replaced by
+    the loaders it wraps.
+    """
+    from django.conf import settings
+    loaders = []
+    for loader in settings.TEMPLATE_LOADERS:
+        if isinstance(loader, (tuple, list)) and loader[0] == CACHED_LOADER:
+            loaders.extend(loader[1])
+        elif loader != CACHED_LOADER:
+            loaders.append(loader)
+    return loaders
+
+
+class Command(NoArgsCommand):
+    option_list = NoArgsCommand.option_list + (
+        make_option('--extension', '-e', dest='extensions', action='append',
+            default=[], help='The file extension(s) of the templates to '
+                'load (default: "html,txt"). Separate multiple extensions '
+                'with commas, or use -e multiple times.'),
+        make_option('--clear', action='store_true', dest='clear', default=False,
+            help='Clear the template cache before filling it. Note that '
+                'this clears every key stored in the cache.'),
+    )
+    help = ("Parses the templates found in TEMPLATE_DIRS and in the templates "
+            "directories of installed applications and stores them in the "
+            "cache set by TEMPLATE_CACHE_ALIAS.")
+
+    requires_model_validation = False
+
+    def handle_noargs(self, **options):
+        from django.conf import settings
+        from django.template.base import TemplateDoesNotExist
+        from django.template.loaders.app_directories import app_template_dirs
+        from django.template.loaders.cached import Loader
+
+        verbosity = int(options.get('verbosity', 1))
+        extensions = handle_extensions(options.get('extensions') or ['html,txt'],
+                                       ignored=())
+
+        if settings.TEMPLATE_CACHE_ALIAS is None:
+            raise CommandError("The TEMPLATE_CACHE_ALIAS setting isn't set.")
+        if settings.TEMPLATE_DEBUG:
+            raise CommandError("Parsed templates aren't cached when "
+                               "TEMPLATE_DEBUG is True.")
+
+        loader = Loader(template_source_loaders())
+        cache = loader.parsed_template_cache
+        if options.get('clear'):
+            cache.clear()
+            if verbosity >= 1:
+                self.stdout.write("Cleared the template cache.\n")
+
+        dirs = list(settings.TEMPLATE_DIRS) + list(app_template_dirs)
+        stored = skipped = 0
+        for name in find_templates(dirs, extensions):
+            try:
+                source, origin = loader.find_template(name, parse=False)
+                if hasattr(source, 'render'):
+                    # This template's loader parses templates itself.
+                    skipped += 1
+                    continue
+                key = loader.parsed_template_key(name, source)
+                loader.get_parsed_template(source, origin, name)
+            except TemplateDoesNotExist:
+                skipped += 1
+                continue
+            except Exception, e:
+                skipped += 1
+                if verbosity >= 1:
+                    self.stderr.write("Failed to parse %s: %s\n" % (name, e))
+                continue
+            if cache.has_key(key):
+                stored += 1
+                if verbosity >= 2:
+                    self.stdout.write("Stored %s\n" % name)
+            else:
+                skipped += 1
+                if verbosity >= 2:
+                    self.stdout.write("Skipped %s (it can't be pickled)\n" % name)
+        if verbosity >= 1:
+            self.stdout.write("%d template%s stored, %d skipped.\n" %
+                              (stored, stored != 1 and 's' or '', skipped))
@@ -12,33 +12,150 @@ from django.core.serializers.python import Deserializer as PythonDeserializer
 from django.utils import simplejson
 from django.utils.timezone import is_aware
 
+# The number of characters read from the stream at a time by Deserializer.
+READ_SIZE = 64 * 1024
+
 class Serializer(PythonSerializer):
     """
     Convert a queryset to JSON.
+
+    Objects are written to the stream one at a time, and the output is the
+    same as that of simplejson.dump() for the list of all the objects.
     """
     internal_use_only = False
 
-    def end_serialization(self):
+    def start_serialization(self):
+        super(Serializer, self).start_serialization()
         if simplejson.__version__.split('.') >= ['2', '1', '3']:
             # Use JS strings to represent Python Decimal instances (ticket #16850)
             self.options.update({'use_decimal': False})
-        simplejson.dump(self.objects, self.stream, cls=DjangoJSONEncoder, **self.options)
+        # Find out how the encoder lays out a list with these options.
+        layout = simplejson.dumps([1, 2], **self.options)
+        first, second = layout.index('1'), layout.index('2')
+        self._list_start = layout[:first]
+        self._item_separator = layout[first + 1:second]
+        self._list_end = layout[second + 1:]
+        # Each item of the list is indented one level deeper than it would be
+        # on its own.
+        self._item_newline = self._list_start[1:]
+        self._empty = True
+
+    def end_object(self, obj):
+        data = simplejson.dumps(self.get_dump_object(obj),
+                                cls=DjangoJSONEncoder, **self.options)
+        if self._item_newline:
+            data = data.replace('\n', self._item_newline)
+        if self._empty:
+            self.stream.write(self._list_start)
+            self._empty = False
+        else:
+            self.stream.write(self._item_separator)
+        self.stream.write(data)
+        self._current = None
+
+    def end_serialization(self):
+        if self._empty:
+            self.stream.write(simplejson.dumps([], **self.options))
+        else:
+            self.stream.write(self._list_end)
 
     def getvalue(self):
         if callable(getattr(self.stream, 'getvalue', None)):
             return self.stream.getvalue()
 
 
+class JSONStreamReader(object):
+    """
+    Reads JSON values from a stream one at a time, keeping only the part of
+    the stream that hasn't been decoded yet in memory.
+    """
+    whitespace = ' \t\n\r'
+
+    def __init__(self, stream, read_size=READ_SIZE):
+        self.stream = stream
+        self.read_size = read_size
+        self.decoder = simplejson.JSONDecoder()
+        self.data = ''
+        self.index = 0
+        self.eof = False
+
+    def read_more(self):
+        # Reading at least as much as is buffered makes the cost of decoding
+        # a value that spans many reads linear in its size.
+        chunk = self.stream.read(max(self.read_size, len(self.data) - self.index))
+        self.data = self.data[self.index:] + chunk
+        self.index = 0
+        self.eof = not chunk
+
+    def next_char(self):
+        """
+        Skips whitespace and returns the next character, without consuming
+        it, or an empty string at the end of the stream.
+        """
+        while True:
+            while self.index < len(self.data) and self.data[self.index] in self.whitespace:
+                self.index += 1
+            if self.index < len(self.data):
+                return self.data[self.index]
+            if self.eof:
+                return ''
+            self.read_more()
+
+    def decode(self):
+        """
+        Decodes and returns the next JSON value.
+        """
+        while True:
+            self.next_char()
+            try:
+                value, end = self.decoder.raw_decode(self.data, idx=self.index)
+            except ValueError:
+                # The value may be incomplete.
+                if self.eof:
+                    raise
+            else:
+                # A number at the end of the buffer could continue in the
+                # next read.
+                if end < len(self.data) or self.eof:
+                    self.index = end
+                    return value
+            self.read_more()
+
+def iter_json_list(stream, read_size=READ_SIZE):
+    """
+    Parses a JSON list from stream and yields its items one at a time.
+    """
+    reader = JSONStreamReader(stream, read_size)
+    if reader.next_char() != '[':
+        raise ValueError("Expected a JSON list.")
+    reader.index += 1
+    if reader.next_char() == ']':
+        reader.index += 1
+    else:
+        while True:
+            yield reader.decode()
+            char = reader.next_char()
+            reader.index += 1
+            if char == ']':
+                break
+            elif char != ',':
+                raise ValueError("Expected ',' or ']' after a list item.")
+    if reader.next_char():
+        raise ValueError("Extra data after the JSON list.")
+
 def Deserializer(stream_or_string, **options):
     """
     Deserialize a stream or string of JSON data.
+
+    The data is parsed one object at a time, so that large fixtures don't
+    have to fit in memory.
     """
     if isinstance(stream_or_string, basestring):
         stream = StringIO(stream_or_string)
     else:
         stream = stream_or_string
     try:
-        for obj in PythonDeserializer(simplejson.load(stream), **options):
+        for obj in PythonDeserializer(iter_json_list(stream), **options):
             yield obj
     except GeneratorExit:
         raise
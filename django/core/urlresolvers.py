@@ -8,8 +8,9 @@ a string) and returns a tuple in this format:
 """
 
 import re
-from threading import local
+from threading import local, Lock
 
+from django.conf import settings
 from django.http import Http404
 from django.core.exceptions import ImproperlyConfigured, ViewDoesNotExist
 from django.utils.datastructures import MultiValueDict
@@ -113,9 +114,11 @@ get_callable = memoize(get_callable, _callable_cache, 1)
 
 def get_resolver(urlconf):
     if urlconf is None:
-        from django.conf import settings
         urlconf = settings.ROOT_URLCONF
-    return RegexURLResolver(r'^/', urlconf)
+    resolver = RegexURLResolver(r'^/', urlconf)
+    if settings.URL_RESOLVER_CACHE_SIZE:
+        resolver.match_cache = MatchCache(settings.URL_RESOLVER_CACHE_SIZE)
+    return resolver
 get_resolver = memoize(get_resolver, _resolver_cache, 1)
 
 def get_ns_resolver(ns_pattern, resolver):
@@ -136,6 +139,169 @@ def get_mod_func(callback):
         return callback, ''
     return callback[:dot], callback[dot+1:]
 
+# Characters that have a special meaning in regular expressions.
+_REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+_INLINE_FLAGS_RE = re.compile(r'\(\?[iLmsux]+\)')
+
+def _has_top_level_alternation(pattern):
+    """
+    Returns True if the regular expression pattern has a "|" outside of any
+    group or character class.
+    """
+    depth = 0
+    i, length = 0, len(pattern)
+    while i < length:
+        c = pattern[i]
+        if c == '\\':
+            i += 1
+        elif c == '[':
+            # Skip the character class. A "]" right after "[" or "[^" is a
+            # literal.
+            i += 1
+            if pattern[i:i + 1] == '^':
+                i += 1
+            if pattern[i:i + 1] == ']':
+                i += 1
+            while i < length and pattern[i] != ']':
+                if pattern[i] == '\\':
+                    i += 1
+                i += 1
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return True
+        i += 1
+    return False
+
+def literal_prefix(pattern):
+    """
+    Returns the literal text that every string matched by searching for the
+    regular expression pattern must start with. Returns an empty string if
+    nothing is known about the start of matches, e.g. when the pattern isn't
+    anchored with "^".
+    """
+    if (not pattern.startswith('^') or _INLINE_FLAGS_RE.search(pattern) or
+            _has_top_level_alternation(pattern)):
+        return u''
+    prefix = []
+    i, length = 1, len(pattern)
+    while i < length:
+        c = pattern[i]
+        if c == '\\':
+            if i + 1 == length or pattern[i + 1].isalnum():
+                # A character class like \d, or a backreference.
+                break
+            c = pattern[i + 1]
+            end = i + 2
+        elif c in _REGEX_SPECIAL_CHARS:
+            break
+        else:
+            end = i + 1
+        if pattern[end:end + 1] in ('*', '?', '{'):
+            # The character is optional.
+            break
+        prefix.append(c)
+        i = end
+    return u''.join(prefix)
+
+class PrefixIndex(object):
+    """
+    A trie of the literal prefixes of a list of URL patterns, used to find
+    the patterns that may match a path without trying all of them.
+    """
+    def __init__(self, prefixes):
+        # Each node is a (children, positions) tuple, where positions lists
+        # the patterns whose prefix ends at that node.
+        self.root = ({}, [])
+        for position, prefix in enumerate(prefixes):
+            node = self.root
+            for c in prefix:
+                node = node[0].setdefault(c, ({}, []))
+            node[1].append(position)
+
+    def candidates(self, path):
+        """
+        Returns the positions, in order, of the patterns whose prefix is a
+        prefix of path.
+        """
+        node = self.root
+        positions = list(node[1])
+        for c in path:
+            node = node[0].get(c)
+            if node is None:
+                break
+            positions.extend(node[1])
+        positions.sort()
+        return positions
+
+class MatchCache(object):
+    """
+    A thread-safe mapping that holds at most max_size entries and forgets the
+    least recently used ones first.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        self._lock.acquire()
+        try:
+            # Entries are [previous, next, key, value] lists forming a
+            # circular list around self._root, most recently used first.
+            self._root = root = []
+            root[:] = [root, root, None, None]
+            self._map = {}
+        finally:
+            self._lock.release()
+
+    def __len__(self):
+        return len(self._map)
+
+    def get(self, key, default=None):
+        self._lock.acquire()
+        try:
+            entry = self._map.get(key)
+            if entry is None:
+                return default
+            self._move_to_front(entry)
+            return entry[3]
+        finally:
+            self._lock.release()
+
+    def set(self, key, value):
+        self._lock.acquire()
+        try:
+            entry = self._map.get(key)
+            if entry is not None:
+                entry[3] = value
+                self._move_to_front(entry)
+                return
+            if len(self._map) >= self.max_size:
+                oldest = self._root[0]
+                oldest[0][1] = self._root
+                self._root[0] = oldest[0]
+                del self._map[oldest[2]]
+            root = self._root
+            entry = [root, root[1], key, value]
+            root[1][0] = entry
+            root[1] = entry
+            self._map[key] = entry
+        finally:
+            self._lock.release()
+
+    def _move_to_front(self, entry):
+        previous, next = entry[0], entry[1]
+        previous[1] = next
+        next[0] = previous
+        root = self._root
+        entry[0] = root
+        entry[1] = root[1]
+        root[1][0] = entry
+        root[1] = entry
+
 class LocaleRegexProvider(object):
     """
     A mixin to provide a default regex property which can vary by active
@@ -230,16 +396,35 @@ class RegexURLResolver(LocaleRegexProvider):
         self._reverse_dict = {}
         self._namespace_dict = {}
         self._app_dict = {}
+        # Whether the reverse lookups depend on the active language; unknown
+        # until _populate() runs.
+        self._localized = None
+        self._reverse_candidates = {}
+        self._prefix_index = {}
+        # Set by get_resolver() when URL_RESOLVER_CACHE_SIZE isn't 0.
+        self.match_cache = None
 
     def __repr__(self):
         return smart_str(u'<%s %s (%s:%s) %s>' % (self.__class__.__name__, self.urlconf_name, self.app_name, self.namespace, self.regex.pattern))
 
+    def _get_language_key(self):
+        """
+        Returns the key of the reverse lookups for the active language, which
+        is None for resolvers whose patterns don't depend on the language.
+        """
+        if self._localized is False:
+            return None
+        return get_language()
+
     def _populate(self):
         lookups = MultiValueDict()
         namespaces = {}
         apps = {}
-        language_code = get_language()
+        localized = False
         for pattern in reversed(self.url_patterns):
+            if not isinstance(getattr(pattern, '_regex', None), basestring):
+                # A translated regex, or a LocaleRegexURLResolver.
+                localized = True
             p_pattern = pattern.regex.pattern
             if p_pattern.startswith('^'):
                 p_pattern = p_pattern[1:]
@@ -260,50 +445,93 @@ class RegexURLResolver(LocaleRegexProvider):
                         namespaces[namespace] = (p_pattern + prefix, sub_pattern)
                     for app_name, namespace_list in pattern.app_dict.items():
                         apps.setdefault(app_name, []).extend(namespace_list)
+                    if pattern._localized:
+                        localized = True
             else:
                 bits = normalize(p_pattern)
                 lookups.appendlist(pattern.callback, (bits, p_pattern, pattern.default_args))
                 if pattern.name is not None:
                     lookups.appendlist(pattern.name, (bits, p_pattern, pattern.default_args))
-        self._reverse_dict[language_code] = lookups
-        self._namespace_dict[language_code] = namespaces
-        self._app_dict[language_code] = apps
+        self._localized = localized
+        language_key = self._get_language_key()
+        self._reverse_dict[language_key] = lookups
+        self._namespace_dict[language_key] = namespaces
+        self._app_dict[language_key] = apps
 
     @property
     def reverse_dict(self):
-        language_code = get_language()
-        if language_code not in self._reverse_dict:
+        language_key = self._get_language_key()
+        if language_key not in self._reverse_dict:
             self._populate()
-        return self._reverse_dict[language_code]
+            language_key = self._get_language_key()
+        return self._reverse_dict[language_key]
 
     @property
     def namespace_dict(self):
-        language_code = get_language()
-        if language_code not in self._namespace_dict:
+        language_key = self._get_language_key()
+        if language_key not in self._namespace_dict:
             self._populate()
-        return self._namespace_dict[language_code]
+            language_key = self._get_language_key()
+        return self._namespace_dict[language_key]
 
     @property
     def app_dict(self):
-        language_code = get_language()
-        if language_code not in self._app_dict:
+        language_key = self._get_language_key()
+        if language_key not in self._app_dict:
             self._populate()
-        return self._app_dict[language_code]
+            language_key = self._get_language_key()
+        return self._app_dict[language_key]
+
+    def _get_prefix_index(self, patterns):
+        """
+        Returns a PrefixIndex of the literal prefixes of the given URL
+        patterns for the active language. The index is built again if
+        patterns are added to the list or if it's replaced.
+        """
+        language_code = get_language()
+        entry = self._prefix_index.get(language_code)
+        if entry is None or entry[0] is not patterns or entry[1] != len(patterns):
+            prefixes = []
+            for pattern in patterns:
+                regex = getattr(pattern, 'regex', None)
+                flags = re.IGNORECASE | re.MULTILINE | re.VERBOSE
+                if regex is None or regex.flags & flags:
+                    prefixes.append(u'')
+                else:
+                    prefixes.append(literal_prefix(regex.pattern))
+            entry = (patterns, len(patterns), PrefixIndex(prefixes))
+            self._prefix_index[language_code] = entry
+        return entry[2]
 
     def resolve(self, path):
-        tried = []
+        if self.match_cache is None:
+            return self._resolve(path)
+        key = (get_language(), path)
+        match = self.match_cache.get(key)
+        if match is None:
+            match = self._resolve(path)
+            self.match_cache.set(key, match)
+        # Callers may change the arguments of the match they get.
+        return ResolverMatch(match.func, match.args, match.kwargs.copy(),
+                             match.url_name, match.app_name, match.namespaces)
+
+    def _resolve(self, path):
         match = self.regex.search(path)
         if match:
             new_path = path[match.end():]
-            for pattern in self.url_patterns:
+            patterns = self.url_patterns
+            if settings.URL_RESOLVER_INDEX:
+                positions = self._get_prefix_index(patterns).candidates(new_path)
+            else:
+                positions = xrange(len(patterns))
+            # The Resolver404 "tried" list is only built if nothing matches.
+            sub_tried_lists = {}
+            for position in positions:
+                pattern = patterns[position]
                 try:
                     sub_match = pattern.resolve(new_path)
                 except Resolver404, e:
-                    sub_tried = e.args[0].get('tried')
-                    if sub_tried is not None:
-                        tried.extend([[pattern] + t for t in sub_tried])
-                    else:
-                        tried.append([pattern])
+                    sub_tried_lists[position] = e.args[0].get('tried')
                 else:
                     if sub_match:
                         sub_match_dict = dict([(smart_str(k), v) for k, v in match.groupdict().items()])
@@ -311,6 +539,14 @@ class RegexURLResolver(LocaleRegexProvider):
                         for k, v in sub_match.kwargs.iteritems():
                             sub_match_dict[smart_str(k)] = v
                         return ResolverMatch(sub_match.func, sub_match.args, sub_match_dict, sub_match.url_name, self.app_name or sub_match.app_name, [self.namespace] + sub_match.namespaces)
+            # Patterns skipped thanks to the index couldn't have matched, so
+            # they appear in the list like patterns that didn't match.
+            tried = []
+            for position, pattern in enumerate(patterns):
+                sub_tried = sub_tried_lists.get(position)
+                if sub_tried is not None:
+                    tried.extend([[pattern] + t for t in sub_tried])
+                else:
                     tried.append([pattern])
             raise Resolver404({'tried': tried, 'path': new_path})
         raise Resolver404({'path' : path})
@@ -360,29 +596,26 @@ class RegexURLResolver(LocaleRegexProvider):
             lookup_view = get_callable(lookup_view, True)
         except (ImportError, AttributeError), e:
             raise NoReverseMatch("Error importing '%s': %s." % (lookup_view, e))
-        possibilities = self.reverse_dict.getlist(lookup_view)
-        prefix_norm, prefix_args = normalize(_prefix)[0]
-        for possibility, pattern, defaults in possibilities:
-            for result, params in possibility:
-                if args:
-                    if len(args) != len(params) + len(prefix_args):
-                        continue
-                    unicode_args = [force_unicode(val) for val in args]
-                    candidate =  (prefix_norm + result) % dict(zip(prefix_args + params, unicode_args))
-                else:
-                    if set(kwargs.keys() + defaults.keys()) != set(params + defaults.keys() + prefix_args):
-                        continue
-                    matches = True
-                    for k, v in defaults.items():
-                        if kwargs.get(k, v) != v:
-                            matches = False
-                            break
-                    if not matches:
-                        continue
-                    unicode_kwargs = dict([(k, force_unicode(v)) for (k, v) in kwargs.items()])
-                    candidate = (prefix_norm + result) % unicode_kwargs
-                if re.search(u'^%s%s' % (_prefix, pattern), candidate, re.UNICODE):
-                    return candidate
+        if args:
+            signature = len(args)
+        else:
+            signature = frozenset(kwargs)
+        for format, params, regex, defaults in self._get_reverse_candidates(lookup_view, _prefix, signature):
+            if args:
+                unicode_args = [force_unicode(val) for val in args]
+                candidate = format % dict(zip(params, unicode_args))
+            else:
+                matches = True
+                for k, v in defaults.items():
+                    if kwargs.get(k, v) != v:
+                        matches = False
+                        break
+                if not matches:
+                    continue
+                unicode_kwargs = dict([(k, force_unicode(v)) for (k, v) in kwargs.items()])
+                candidate = format % unicode_kwargs
+            if regex.search(candidate):
+                return candidate
         # lookup_view can be URL label, or dotted path, or callable, Any of
         # these can be passed in at the top, but callables are not friendly in
         # error messages.
@@ -395,6 +628,43 @@ class RegexURLResolver(LocaleRegexProvider):
         raise NoReverseMatch("Reverse for '%s' with arguments '%s' and keyword "
                 "arguments '%s' not found." % (lookup_view_s, args, kwargs))
 
+    def _get_reverse_candidates(self, lookup_view, _prefix, signature):
+        """
+        Returns a list of (format, params, regex, defaults) tuples for the
+        URLs that lookup_view may be reversed to with the given prefix and
+        arguments, in order. The signature of the arguments is the number of
+        positional arguments, or the set of keyword argument names.
+
+        Substituting the arguments in format gives a candidate URL, which is
+        valid if the compiled regex matches it.
+        """
+        if self._localized is None:
+            self._populate()
+        key = (self._get_language_key(), lookup_view, _prefix, signature)
+        try:
+            return self._reverse_candidates[key]
+        except KeyError:
+            pass
+        prefix_norm, prefix_args = normalize(_prefix)[0]
+        candidates = []
+        for possibility, pattern, defaults in self.reverse_dict.getlist(lookup_view):
+            regex = None
+            for result, params in possibility:
+                params = prefix_args + params
+                if isinstance(signature, int):
+                    if signature != len(params):
+                        continue
+                elif signature.union(defaults) != set(params).union(defaults):
+                    continue
+                if regex is None:
+                    regex = re.compile(u'^%s%s' % (_prefix, pattern), re.UNICODE)
+                candidates.append((prefix_norm + result, params, regex, defaults))
+        if candidates:
+            # Lookups that can't succeed aren't stored, so that the size of
+            # this cache is bounded by the URLconf.
+            self._reverse_candidates[key] = candidates
+        return candidates
+
 class LocaleRegexURLResolver(RegexURLResolver):
     """
     A URL resolver that always matches the active language code as URL prefix.
@@ -40,10 +40,11 @@ connection = DefaultConnectionProxy()
 backend = load_backend(connection.settings_dict['ENGINE'])
 
 # Register an event that closes the database connection
-# when a Django request is finished.
+# when a Django request is finished, unless it is configured to persist
+# (see the CONN_MAX_AGE and CONN_POOL_SIZE database settings).
 def close_connection(**kwargs):
     for conn in connections.all():
-        conn.close()
+        conn.close_if_unusable_or_obsolete()
 signals.request_finished.connect(close_connection)
 
 # Register an event that resets connection.queries
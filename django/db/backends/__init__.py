@@ -4,11 +4,12 @@ try:
     import thread
 except ImportError:
     import dummy_thread as thread
+import time
 from contextlib import contextmanager
 
 from django.conf import settings
 from django.db import DEFAULT_DB_ALIAS
-from django.db.backends import util
+from django.db.backends import pool, util
 from django.db.transaction import TransactionManagementError
 from django.utils.importlib import import_module
 from django.utils.timezone import is_aware
@@ -39,6 +40,10 @@ class BaseDatabaseWrapper(object):
         self._thread_ident = thread.get_ident()
         self.allow_thread_sharing = allow_thread_sharing
 
+        # Connection persistence: the time after which the current connection
+        # should be closed at the end of a request, or None to keep it open.
+        self.close_at = None
+
     def __eq__(self, other):
         return self.alias == other.alias
 
@@ -299,14 +304,132 @@ class BaseDatabaseWrapper(object):
             self.connection.close()
             self.connection = None
 
+    def is_usable(self):
+        """
+        Tests whether the current connection is still alive. Backends that
+        support connection pooling override this; it's used to weed out
+        broken connections when they are taken from the pool.
+        """
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        """
+        Called at the end of each request. Closes the connection if it has
+        outlived CONN_MAX_AGE or was left in the middle of a transaction.
+        Otherwise the connection is kept for the next request, or handed back
+        to the pool for this database when CONN_POOL_SIZE is set.
+        """
+        if self.connection is None:
+            return
+        if (self.settings_dict.get('CONN_MAX_AGE', 0) == 0 or
+                self.transaction_state or self._dirty or
+                (self.close_at is not None and time.time() >= self.close_at)):
+            self.close()
+            return
+        # End the transaction implicitly opened by the request, so the next
+        # request starts with a clean connection.
+        try:
+            self._rollback()
+        except Exception:
+            self.close()
+            return
+        connection_pool = self._get_connection_pool()
+        if connection_pool is not None:
+            self.validate_thread_sharing()
+            if not connection_pool.release(self.connection, self.close_at):
+                self.connection.close()
+            self.connection = None
+
+    def close_pooled_connections(self):
+        """
+        Closes all the idle connections pooled for this database.
+        """
+        connection_pool = self._get_connection_pool()
+        if connection_pool is not None:
+            for connection in connection_pool.clear():
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _get_connection_pool(self):
+        size = self.settings_dict.get('CONN_POOL_SIZE')
+        if not size or not self.features.supports_connection_pooling:
+            return None
+        return pool.get_pool(self.alias, self.settings_dict['NAME'], size)
+
+    def _checkout_connection(self):
+        """
+        Takes a healthy idle connection from the pool, if pooling is enabled
+        and the pool isn't empty. Broken connections are discarded.
+        """
+        connection_pool = self._get_connection_pool()
+        if connection_pool is None:
+            return
+        while True:
+            self.connection, self.close_at = connection_pool.checkout()
+            if self.connection is None:
+                return
+            if self.is_usable():
+                self._init_reused_connection()
+                return
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+
+    def _init_reused_connection(self):
+        """
+        A hook for backends that keep per-wrapper state about the connection,
+        called when a connection opened by another wrapper is taken from the
+        pool.
+        """
+        pass
+
+    def _open_cursor(self, cursor_factory):
+        """
+        Returns a cursor created by cursor_factory, taking care of connection
+        reuse: a connection is first looked for in the pool and, if a new one
+        has to be opened, the time after which it should be closed is noted.
+        """
+        if self.connection is None:
+            self._checkout_connection()
+        new_connection = self.connection is None
+        cursor = cursor_factory()
+        if new_connection:
+            max_age = self.settings_dict.get('CONN_MAX_AGE', 0)
+            if max_age is None:
+                self.close_at = None
+            else:
+                self.close_at = time.time() + max_age
+        return cursor
+
     def cursor(self):
         self.validate_thread_sharing()
+        return self._wrap_cursor(self._open_cursor(self._cursor))
+
+    def server_side_cursor(self):
+        """
+        Returns a cursor that keeps the result set on the database server and
+        transfers rows to the client only as they are fetched. Backends that
+        don't support server-side cursors return a regular cursor instead.
+        """
+        self.validate_thread_sharing()
+        return self._wrap_cursor(self._open_cursor(self._server_side_cursor))
+
+    def _server_side_cursor(self):
+        """
+        Backends that support server-side cursors (see the
+        ``can_use_server_side_cursors`` feature) should override this method
+        to return an unwrapped streaming cursor.
+        """
+        return self._cursor()
+
+    def _wrap_cursor(self, cursor):
         if (self.use_debug_cursor or
             (self.use_debug_cursor is None and settings.DEBUG)):
-            cursor = self.make_debug_cursor(self._cursor())
-        else:
-            cursor = util.CursorWrapper(self._cursor(), self)
-        return cursor
+            return self.make_debug_cursor(cursor)
+        return util.CursorWrapper(cursor, self)
 
     def make_debug_cursor(self, cursor):
         return util.CursorDebugWrapper(cursor, self)
@@ -318,6 +441,9 @@ class BaseDatabaseFeatures(object):
     needs_datetime_string_cast = True
     empty_fetchmany_value = []
     update_can_self_select = True
+    # Do the values in a CASE expression in an UPDATE need to be cast to the
+    # column's type?
+    requires_casted_case_in_updates = False
 
     # Does the backend distinguish between '' and None?
     interprets_empty_strings_as_nulls = False
@@ -327,7 +453,18 @@ class BaseDatabaseFeatures(object):
     ignores_nulls_in_unique_constraints = True
 
     can_use_chunked_reads = True
+    # Can the backend stream a result set with a server-side cursor instead
+    # of transferring it to the client in one go?
+    can_use_server_side_cursors = False
+    # Can other queries be run on a connection while rows are being read from
+    # a server-side cursor?
+    allows_queries_during_server_side_reads = False
+    # Can connections be shared between DatabaseWrappers in different threads
+    # through the connection pool (see CONN_POOL_SIZE)?
+    supports_connection_pooling = False
     can_return_id_from_insert = False
+    # Can a multi-row INSERT return the ids of all the rows it created?
+    can_return_ids_from_bulk_insert = False
     has_bulk_insert = False
     uses_autocommit = False
     uses_savepoints = False
@@ -470,6 +607,14 @@ class BaseDatabaseOperations(object):
         """
         return None
 
+    def bulk_batch_size(self, fields, objs):
+        """
+        Returns the maximum number of the objects in objs that can be inserted
+        in a single query, given that the values of fields are inserted for
+        each of them.
+        """
+        return len(objs)
+
     def date_extract_sql(self, lookup_type, field_name):
         """
         Given a lookup_type of 'year', 'month' or 'day', returns the SQL that
@@ -528,6 +673,14 @@ class BaseDatabaseOperations(object):
         """
         return cursor.fetchone()[0]
 
+    def fetch_returned_insert_ids(self, cursor):
+        """
+        Given a cursor object that has just performed a multi-row
+        INSERT...RETURNING statement into a table that has an auto-incrementing
+        ID, returns the list of newly created IDs, in insertion order.
+        """
+        return [row[0] for row in cursor.fetchall()]
+
     def field_cast_sql(self, db_type):
         """
         Given a column type (e.g. 'BLOB', 'VARCHAR'), returns the SQL necessary
@@ -356,6 +356,9 @@ class BaseDatabaseCreation(object):
         database already exists. Returns the name of the test database created.
         """
         self.connection.close()
+        # Idle pooled connections would prevent the database from being
+        # dropped.
+        self.connection.close_pooled_connections()
         test_database_name = self.connection.settings_dict['NAME']
         if verbosity >= 1:
             test_db_repr = ''
@@ -24,6 +24,7 @@ if (version < (1,2,1) or (version[:3] == (1, 2, 1) and
 
 from MySQLdb.converters import conversions
 from MySQLdb.constants import FIELD_TYPE, CLIENT
+from MySQLdb.cursors import SSCursor
 
 from django.db import utils
 from django.db.backends import *
@@ -149,6 +150,8 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     supports_timezones = False
     requires_explicit_null_ordering_when_grouping = True
     allows_primary_key_0 = False
+    can_use_server_side_cursors = True
+    supports_connection_pooling = True
 
     def __init__(self, connection):
         super(DatabaseFeatures, self).__init__(connection)
@@ -344,7 +347,18 @@ class DatabaseWrapper(BaseDatabaseWrapper):
                 self.connection = None
         return False
 
-    def _cursor(self):
+    def is_usable(self):
+        try:
+            self.connection.ping()
+        except DatabaseError:
+            return False
+        return True
+
+    def _init_reused_connection(self):
+        self.features.uses_savepoints = \
+            self.get_server_version() >= (5, 0, 3)
+
+    def _cursor(self, cursorclass=None):
         new_connection = False
         if not self._valid_connection():
             new_connection = True
@@ -376,14 +390,23 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             self.features.uses_savepoints = \
                 self.get_server_version() >= (5, 0, 3)
             connection_created.send(sender=self.__class__, connection=self)
-        cursor = self.connection.cursor()
         if new_connection:
             # SQL_AUTO_IS_NULL in MySQL controls whether an AUTO_INCREMENT column
             # on a recently-inserted row will return when the field is tested for
             # NULL.  Disabling this value brings this aspect of MySQL in line with
             # SQL standards.
+            cursor = self.connection.cursor()
             cursor.execute('SET SQL_AUTO_IS_NULL = 0')
-        return CursorWrapper(cursor)
+            cursor.close()
+        # MySQLdb falls back to the connection's default cursor class when
+        # cursorclass is None.
+        return CursorWrapper(self.connection.cursor(cursorclass))
+
+    def _server_side_cursor(self):
+        # SSCursor uses mysql_use_result(), so rows are read from the server
+        # as they are fetched. No other query may be run on the connection
+        # until all of them have been read or the cursor has been closed.
+        return self._cursor(cursorclass=SSCursor)
 
     def _rollback(self):
         try:
@@ -0,0 +1,91 @@
+"""
+An in-process pool of idle database connections, shared between the
+DatabaseWrapper objects of every thread.
+
+Pooling is enabled per database with the CONN_POOL_SIZE setting. Each
+DatabaseWrapper still owns at most one connection at a time; it takes one
+from the pool the first time it needs a cursor and hands it back at the end
+of the request.
+"""
+try:
+    import threading
+except ImportError:
+    import dummy_threading as threading
+
+
+class ConnectionPool(object):
+    """
+    A thread-safe stack of idle DB-API connections for one database.
+
+    Connections are stored along with the time at which they should be
+    closed (or None if they may be kept forever), so that CONN_MAX_AGE is
+    honoured across all the wrappers that use a connection.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def checkout(self):
+        """
+        Returns a (connection, close_at) tuple for the most recently released
+        connection, or (None, None) if there are no idle connections.
+        """
+        self._lock.acquire()
+        try:
+            if self._idle:
+                return self._idle.pop()
+        finally:
+            self._lock.release()
+        return None, None
+
+    def release(self, connection, close_at):
+        """
+        Puts a connection back into the pool. Returns False if the pool is
+        already full, in which case the caller is responsible for closing the
+        connection.
+        """
+        self._lock.acquire()
+        try:
+            if len(self._idle) < self.max_size:
+                self._idle.append((connection, close_at))
+                return True
+        finally:
+            self._lock.release()
+        return False
+
+    def clear(self):
+        """
+        Empties the pool and returns the connections it held, so the caller
+        can close them.
+        """
+        self._lock.acquire()
+        try:
+            idle, self._idle = self._idle, []
+        finally:
+            self._lock.release()
+        return [connection for connection, close_at in idle]
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(alias, name, max_size):
+    """
+    Returns the pool for the database with the given alias and NAME, creating
+    it on first use. The NAME is part of the key because the test runner
+    points an alias at a different database while it's running.
+    """
+    key = (alias, name)
+    _pools_lock.acquire()
+    try:
+        try:
+            return _pools[key]
+        except KeyError:
+            pool = _pools[key] = ConnectionPool(max_size)
+            return pool
+    finally:
+        _pools_lock.release()
@@ -3,6 +3,7 @@ PostgreSQL database backend for Django.
 
 Requires psycopg 2: http://initd.org/projects/psycopg2
 """
+import itertools
 import sys
 
 from django.db import utils
@@ -75,6 +76,8 @@ class CursorWrapper(object):
 class DatabaseFeatures(BaseDatabaseFeatures):
     needs_datetime_string_cast = False
     can_return_id_from_insert = True
+    can_return_ids_from_bulk_insert = True
+    requires_casted_case_in_updates = True
     requires_rollback_on_dirty_transaction = True
     has_real_datatype = True
     can_defer_constraint_checks = True
@@ -83,6 +86,9 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     has_bulk_insert = True
     supports_tablespaces = True
     can_distinct_on_fields = True
+    can_use_server_side_cursors = True
+    allows_queries_during_server_side_reads = True
+    supports_connection_pooling = True
 
 class DatabaseWrapper(BaseDatabaseWrapper):
     vendor = 'postgresql'
@@ -120,6 +126,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         self.introspection = DatabaseIntrospection(self)
         self.validation = BaseDatabaseValidation(self)
         self._pg_version = None
+        self._named_cursor_counter = itertools.count(1)
 
     def check_constraints(self, table_names=None):
         """
@@ -148,13 +155,21 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             )
             raise
 
+    def is_usable(self):
+        try:
+            # Use a psycopg cursor directly, bypassing Django's utilities.
+            self.connection.cursor().execute("SELECT 1")
+        except Database.Error:
+            return False
+        return True
+
     def _get_pg_version(self):
         if self._pg_version is None:
             self._pg_version = get_version(self.connection)
         return self._pg_version
     pg_version = property(_get_pg_version)
 
-    def _cursor(self):
+    def _cursor(self, name=None):
         settings_dict = self.settings_dict
         if self.connection is None:
             if settings_dict['NAME'] == '':
@@ -194,10 +209,24 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             self.connection.set_isolation_level(self.isolation_level)
             self._get_pg_version()
             connection_created.send(sender=self.__class__, connection=self)
-        cursor = self.connection.cursor()
+        if name is None:
+            cursor = self.connection.cursor()
+        elif self.features.uses_autocommit:
+            # Named cursors only live as long as the transaction that
+            # created them, unless they are declared WITH HOLD.
+            cursor = self.connection.cursor(name, withhold=True)
+        else:
+            cursor = self.connection.cursor(name)
         cursor.tzinfo_factory = utc_tzinfo_factory if settings.USE_TZ else None
         return CursorWrapper(cursor)
 
+    def _server_side_cursor(self):
+        # psycopg2 declares a server-side cursor for every named cursor. The
+        # name only has to be unique within the connection.
+        name = '_django_curs_%d_%d' % (
+            thread.get_ident(), self._named_cursor_counter.next())
+        return self._cursor(name=name)
+
     def _enter_transaction_management(self, managed):
         """
         Switch the isolation level when needing transaction support, so that
@@ -190,6 +190,19 @@ class DatabaseOperations(BaseDatabaseOperations):
         # No field, or the field isn't known to be a decimal or integer
         return value
 
+    def bulk_batch_size(self, fields, objs):
+        """
+        SQLite allows at most 999 query parameters and 500 terms in a compound
+        SELECT (the SQLITE_MAX_VARIABLE_NUMBER and SQLITE_MAX_COMPOUND_SELECT
+        compile-time defaults).
+        """
+        if len(fields) == 1:
+            return 500
+        elif len(fields) > 1:
+            return 999 // len(fields)
+        else:
+            return len(objs)
+
     def bulk_insert_sql(self, fields, num_values):
         res = []
         res.append("SELECT %s" % ", ".join(
@@ -369,6 +369,71 @@ class Model(object):
         super(Model, self).__init__()
         signals.post_init.send(sender=self.__class__, instance=self)
 
+    @classmethod
+    def from_db(cls, db, values, attnames=None):
+        """
+        Creates an instance from a row of ``values`` loaded from the database
+        with alias ``db``. ``attnames`` gives the attribute name of each value
+        and defaults to the attnames of all the model's fields, in order;
+        fields left out of it must be deferred on ``cls``.
+        """
+        return cls._row_loader(attnames)(db, values)
+
+    @classmethod
+    def _row_loader(cls, attnames=None):
+        """
+        Returns a function that takes (db, values) and does the work of
+        from_db(). The checks for the fast path are made once, here, so that
+        QuerySet.iterator() doesn't repeat them for every row.
+
+        The fast path skips __init__() entirely and fills in the instance's
+        __dict__ directly. It's only taken when no class in the MRO other than
+        Model defines __init__() -- a mixin listed after Model is reached
+        through super() -- and nothing is listening to pre_init or post_init
+        for this model; otherwise the instance is built by calling the class
+        as usual.
+        """
+        fields = cls._meta.fields
+        if attnames is None:
+            attnames = [f.attname for f in fields]
+        attnames = tuple(attnames)
+        full_row = attnames == tuple([f.attname for f in fields])
+
+        custom_init = any('__init__' in klass.__dict__ for klass in cls.__mro__
+                          if klass is not Model and klass is not object)
+        if (custom_init or signals.pre_init.has_listeners(cls) or
+                signals.post_init.has_listeners(cls)):
+            def load(db, values):
+                if full_row:
+                    obj = cls(*values)
+                else:
+                    obj = cls(**dict(izip(attnames, values)))
+                obj._state.db = db
+                obj._state.adding = False
+                return obj
+            return load
+
+        # Fields with a data descriptor on the class (custom fields using
+        # SubfieldBase, FileField, ...) must still be assigned through it.
+        setters = []
+        for i, attname in enumerate(attnames):
+            for klass in cls.__mro__:
+                if attname in klass.__dict__:
+                    if hasattr(type(klass.__dict__[attname]), '__set__'):
+                        setters.append((i, attname))
+                    break
+
+        new = object.__new__
+        def load(db, values):
+            obj = new(cls)
+            obj.__dict__.update(izip(attnames, values))
+            for i, attname in setters:
+                setattr(obj, attname, values[i])
+            state = obj._state = ModelState(db)
+            state.adding = False
+            return obj
+        return load
+
     def __repr__(self):
         try:
             u = unicode(self)
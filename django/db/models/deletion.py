@@ -77,6 +77,9 @@ class Collector(object):
         self.batches = {} # {model: {field: set([instances])}}
         self.field_updates = {} # {model: {(field, value): set([instances])}}
         self.dependencies = {} # {model: set([models])}
+        # QuerySets that can be deleted with a single DELETE, without fetching
+        # their rows (see can_fast_delete).
+        self.fast_deletes = []
 
     def add(self, objs, source=None, nullable=False, reverse_dependency=False):
         """
@@ -123,6 +126,41 @@ class Collector(object):
             model, {}).setdefault(
             (field, value), set()).update(objs)
 
+    def can_fast_delete(self, objs, from_field=None):
+        """
+        Determines if the objects in 'objs' can be deleted with a single
+        DELETE, without being fetched first. That's the case if 'objs' is a
+        QuerySet whose model has no parents, nothing that cascades or is
+        updated when it's deleted, and no pre_delete or post_delete
+        receivers.
+
+        If 'objs' are being collected because of a cascade, 'from_field' is
+        the foreign key being followed; only CASCADE relations are deleted
+        without looking at the objects.
+        """
+        if from_field is not None and from_field.rel.on_delete is not CASCADE:
+            return False
+        if not (hasattr(objs, 'model') and hasattr(objs, '_raw_delete')):
+            return False
+        model = objs.model
+        if (signals.pre_delete.has_listeners(model) or
+                signals.post_delete.has_listeners(model) or
+                signals.m2m_changed.has_listeners(model)):
+            return False
+        opts = model._meta
+        if opts.parents:
+            return False
+        # Foreign keys pointing to this model, including the ones from the
+        # intermediary tables of many-to-many relations.
+        for related in opts.get_all_related_objects(include_hidden=True):
+            if related.field.rel.on_delete is not DO_NOTHING:
+                return False
+        # Generic relations cascade as well.
+        for relation in opts.many_to_many:
+            if not relation.rel.through:
+                return False
+        return True
+
     def collect(self, objs, source=None, nullable=False, collect_related=True,
         source_attr=None, reverse_dependency=False):
         """
@@ -140,6 +178,9 @@ class Collector(object):
         models, the one case in which the cascade follows the forwards
         direction of an FK rather than the reverse direction.)
         """
+        if self.can_fast_delete(objs):
+            self.fast_deletes.append(objs)
+            return
         new_objs = self.add(objs, source, nullable,
                             reverse_dependency=reverse_dependency)
         if not new_objs:
@@ -163,6 +204,9 @@ class Collector(object):
                     self.add_batch(related.model, field, new_objs)
                 else:
                     sub_objs = self.related_objects(related, new_objs)
+                    if self.can_fast_delete(sub_objs, from_field=field):
+                        self.fast_deletes.append(sub_objs)
+                        continue
                     if not sub_objs:
                         continue
                     field.rel.on_delete(self, field, sub_objs, self.using)
@@ -228,6 +272,10 @@ class Collector(object):
                     sender=model, instance=obj, using=self.using
                 )
 
+        # fast deletes
+        for qs in self.fast_deletes:
+            qs._raw_delete(using=self.using)
+
         # update fields
         for model, instances_for_fieldvalues in self.field_updates.iteritems():
             query = sql.UpdateQuery(model)
@@ -236,10 +236,12 @@ class SingleRelatedObjectDescriptor(object):
         db = router.db_for_read(self.related.model, **db_hints)
         return self.related.model._base_manager.using(db)
 
-    def get_prefetch_query_set(self, instances):
+    def get_prefetch_query_set(self, instances, queryset=None):
+        if queryset is None:
+            queryset = self.get_query_set()
         vals = set(instance._get_pk_val() for instance in instances)
         params = {'%s__pk__in' % self.related.field.name: vals}
-        return (self.get_query_set(),
+        return (queryset.filter(**params),
                 attrgetter(self.related.field.attname),
                 lambda obj: obj._get_pk_val(),
                 True,
@@ -315,14 +317,16 @@ class ReverseSingleRelatedObjectDescriptor(object):
         else:
             return QuerySet(self.field.rel.to).using(db)
 
-    def get_prefetch_query_set(self, instances):
+    def get_prefetch_query_set(self, instances, queryset=None):
+        if queryset is None:
+            queryset = self.get_query_set()
         vals = set(getattr(instance, self.field.attname) for instance in instances)
         other_field = self.field.rel.get_related_field()
         if other_field.rel:
             params = {'%s__pk__in' % self.field.rel.field_name: vals}
         else:
             params = {'%s__in' % self.field.rel.field_name: vals}
-        return (self.get_query_set().filter(**params),
+        return (queryset.filter(**params),
                 attrgetter(self.field.rel.field_name),
                 attrgetter(self.field.attname),
                 True,
@@ -460,11 +464,13 @@ class ForeignRelatedObjectsDescriptor(object):
                     db = self._db or router.db_for_read(self.model, instance=self.instance)
                     return super(RelatedManager, self).get_query_set().using(db).filter(**self.core_filters)
 
-            def get_prefetch_query_set(self, instances):
-                db = self._db or router.db_for_read(self.model)
+            def get_prefetch_query_set(self, instances, queryset=None):
+                if queryset is None:
+                    queryset = super(RelatedManager, self).get_query_set()
+                db = queryset._db or self._db or router.db_for_read(self.model)
                 query = {'%s__%s__in' % (rel_field.name, attname):
                              set(getattr(obj, attname) for obj in instances)}
-                qs = super(RelatedManager, self).get_query_set().using(db).filter(**query)
+                qs = queryset.using(db).filter(**query)
                 return (qs,
                         attrgetter(rel_field.get_attname()),
                         attrgetter(attname),
@@ -542,12 +548,14 @@ def create_many_related_manager(superclass, rel):
                 db = self._db or router.db_for_read(self.instance.__class__, instance=self.instance)
                 return super(ManyRelatedManager, self).get_query_set().using(db)._next_is_sticky().filter(**self.core_filters)
 
-        def get_prefetch_query_set(self, instances):
+        def get_prefetch_query_set(self, instances, queryset=None):
             from django.db import connections
-            db = self._db or router.db_for_read(self.model)
+            if queryset is None:
+                queryset = super(ManyRelatedManager, self).get_query_set()
+            db = queryset._db or self._db or router.db_for_read(self.model)
             query = {'%s__pk__in' % self.query_field_name:
                          set(obj._get_pk_val() for obj in instances)}
-            qs = super(ManyRelatedManager, self).get_query_set().using(db)._next_is_sticky().filter(**query)
+            qs = queryset.using(db)._next_is_sticky().filter(**query)
 
             # M2M: need to annotate the query in order to get the primary model
             # that the secondary model was actually related to. We know that
@@ -6,12 +6,14 @@ import copy
 import itertools
 import sys
 
+from django.conf import settings
 from django.db import connections, router, transaction, IntegrityError
 from django.db.models.fields import AutoField
 from django.db.models.query_utils import (Q, select_related_descend,
     deferred_class_factory, InvalidQuery)
 from django.db.models.deletion import Collector
 from django.db.models import sql
+from django.db.models.sql.constants import GET_ITERATOR_CHUNK_SIZE
 from django.utils.functional import partition
 
 # Used to control how many objects are worked with at once in some cases (e.g.
@@ -40,6 +42,7 @@ class QuerySet(object):
         self._for_write = False
         self._prefetch_related_lookups = []
         self._prefetch_done = False
+        self.prefetch_stats = None
 
     ########################
     # PYTHON MAGIC METHODS #
@@ -228,10 +231,15 @@ class QuerySet(object):
     # METHODS THAT DO DATABASE QUERIES #
     ####################################
 
-    def iterator(self):
+    def iterator(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
         """
         An iterator over the results from applying this QuerySet to the
         database.
+
+        Rows are fetched from the database chunk_size at a time. Passing
+        server_side=True streams the rows through a server-side cursor on
+        backends that support it, so that memory use stays flat no matter how
+        many rows are returned.
         """
         fill_cache = False
         if connections[self.db].features.supports_select_related:
@@ -270,8 +278,8 @@ class QuerySet(object):
 
         skip = None
         if load_fields and not fill_cache:
-            # Some fields have been deferred, so we have to initialise
-            # via keyword arguments.
+            # Some fields may have been deferred, in which case the row only
+            # holds values for the remaining ones.
             skip = set()
             init_list = []
             for field in fields:
@@ -279,7 +287,11 @@ class QuerySet(object):
                     skip.add(field.attname)
                 else:
                     init_list.append(field.attname)
+        if skip is not None:
             model_cls = deferred_class_factory(self.model, skip)
+            load = model_cls._row_loader(init_list)
+        elif not fill_cache:
+            load = self.model._row_loader()
 
         # Cache db and model outside the loop
         db = self.db
@@ -288,22 +300,14 @@ class QuerySet(object):
         if fill_cache:
             klass_info = get_klass_info(model, max_depth=max_depth,
                                         requested=requested, only_load=only_load)
-        for row in compiler.results_iter():
+        for row in compiler.results_iter(chunk_size=chunk_size,
+                                         server_side=server_side):
             if fill_cache:
                 obj, _ = get_cached_row(row, index_start, db, klass_info,
                                         offset=len(aggregate_select))
             else:
-                if skip:
-                    row_data = row[index_start:aggregate_start]
-                    obj = model_cls(**dict(zip(init_list, row_data)))
-                else:
-                    # Omit aggregates in object creation.
-                    obj = model(*row[index_start:aggregate_start])
-
-                # Store the source database of the object
-                obj._state.db = db
-                # This object came from the database; it's not being added.
-                obj._state.adding = False
+                # Omit aggregates in object creation.
+                obj = load(db, row[index_start:aggregate_start])
 
             if extra_select:
                 for i, k in enumerate(extra_select):
@@ -377,12 +381,15 @@ class QuerySet(object):
         obj.save(force_insert=True, using=self.db)
         return obj
 
-    def bulk_create(self, objs):
+    def bulk_create(self, objs, batch_size=None):
         """
         Inserts each of the instances into the database. This does *not* call
-        save() on each of the instances, does not send any pre/post save
-        signals, and does not set the primary key attribute if it is an
-        autoincrement field.
+        save() on each of the instances and does not send any pre/post save
+        signals. The primary key attribute of an autoincrement field is only
+        set on backends that can return the ids of a multi-row insert.
+
+        The objects are inserted batch_size at a time, and never more than the
+        backend can take in a single query.
         """
         # So this case is fun. When you bulk insert you don't get the primary
         # keys back (if it's an autoincrement), so you can't insert into the
@@ -392,6 +399,7 @@ class QuerySet(object):
         # tables to get the primary keys back, and then doing a single bulk
         # insert into the childmost table. We're punting on these for now
         # because they are relatively rare cases.
+        assert batch_size is None or batch_size > 0
         if self.model._meta.parents:
             raise ValueError("Can't bulk create an inherited model")
         if not objs:
@@ -407,13 +415,23 @@ class QuerySet(object):
         try:
             if (connection.features.can_combine_inserts_with_and_without_auto_increment_pk
                 and self.model._meta.has_auto_field):
-                self.model._base_manager._insert(objs, fields=fields, using=self.db)
+                self._batched_insert(objs, fields, batch_size)
             else:
                 objs_with_pk, objs_without_pk = partition(lambda o: o.pk is None, objs)
                 if objs_with_pk:
-                    self.model._base_manager._insert(objs_with_pk, fields=fields, using=self.db)
+                    self._batched_insert(objs_with_pk, fields, batch_size)
                 if objs_without_pk:
-                    self.model._base_manager._insert(objs_without_pk, fields=[f for f in fields if not isinstance(f, AutoField)], using=self.db)
+                    fields = [f for f in fields if not isinstance(f, AutoField)]
+                    return_ids = (self.model._meta.has_auto_field and
+                        connection.features.can_return_ids_from_bulk_insert)
+                    ids = self._batched_insert(objs_without_pk, fields,
+                                               batch_size, return_ids)
+                    if return_ids:
+                        pk_attname = self.model._meta.pk.attname
+                        for obj, pk in itertools.izip(objs_without_pk, ids):
+                            setattr(obj, pk_attname, pk)
+                            obj._state.db = self.db
+                            obj._state.adding = False
             if forced_managed:
                 transaction.commit(using=self.db)
             else:
@@ -424,6 +442,30 @@ class QuerySet(object):
 
         return objs
 
+    def _batched_insert(self, objs, fields, batch_size, return_ids=False):
+        """
+        Helper for bulk_create() that inserts objs one batch at a time, using
+        batches no larger than the backend allows. If return_ids is True,
+        returns the list of the new primary keys.
+        """
+        ops = connections[self.db].ops
+        max_batch_size = max(ops.bulk_batch_size(fields, objs), 1)
+        if batch_size:
+            batch_size = min(batch_size, max_batch_size)
+        else:
+            batch_size = max_batch_size
+        ids = []
+        for i in xrange(0, len(objs), batch_size):
+            batch = objs[i:i + batch_size]
+            result = self.model._base_manager._insert(batch, fields=fields,
+                using=self.db, return_id=return_ids)
+            if return_ids:
+                if len(batch) == 1:
+                    ids.append(result)
+                else:
+                    ids.extend(result)
+        return ids
+
     def get_or_create(self, **kwargs):
         """
         Looks up an object with the given kwargs, creating one if necessary.
@@ -514,6 +556,14 @@ class QuerySet(object):
         self._result_cache = None
     delete.alters_data = True
 
+    def _raw_delete(self, using):
+        """
+        Deletes the objects matched by this QuerySet with a single DELETE,
+        without fetching them. No signals are sent and nothing cascades.
+        """
+        sql.DeleteQuery(self.model).delete_qs(self, using)
+    _raw_delete.alters_data = True
+
     def update(self, **kwargs):
         """
         Updates all elements in the current QuerySet, setting all the given
@@ -542,6 +592,56 @@ class QuerySet(object):
         return rows
     update.alters_data = True
 
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        Updates the given fields of each of the instances in the database,
+        setting each row to the values held by its own instance. Rows are
+        updated batch_size instances at a time, with one query per batch.
+        Returns the number of rows matched.
+        """
+        assert self.query.can_filter(), \
+                "Cannot update a query once a slice has been taken."
+        assert batch_size is None or batch_size > 0
+        if not fields:
+            raise ValueError("Field names must be given to bulk_update().")
+        if any(obj.pk is None for obj in objs):
+            raise ValueError("All bulk_update() objects must have a primary key set.")
+        if not objs:
+            return 0
+        self._for_write = True
+        connection = connections[self.db]
+        # Each object needs a parameter for its primary key in every CASE, a
+        # parameter for each of its values, and one more in the WHERE clause.
+        opts = self.model._meta
+        param_fields = ([opts.pk] * (len(fields) + 1) +
+                        [opts.get_field_by_name(name)[0] for name in fields])
+        max_batch_size = max(connection.ops.bulk_batch_size(param_fields, objs), 1)
+        if batch_size:
+            batch_size = min(batch_size, max_batch_size)
+        else:
+            batch_size = max_batch_size
+        if not transaction.is_managed(using=self.db):
+            transaction.enter_transaction_management(using=self.db)
+            forced_managed = True
+        else:
+            forced_managed = False
+        rows = 0
+        try:
+            for i in xrange(0, len(objs), batch_size):
+                query = self.query.clone(sql.UpdateQuery)
+                query.add_update_cases(fields, objs[i:i + batch_size])
+                rows += query.get_compiler(self.db).execute_sql(None)
+            if forced_managed:
+                transaction.commit(using=self.db)
+            else:
+                transaction.commit_unless_managed(using=self.db)
+        finally:
+            if forced_managed:
+                transaction.leave_transaction_management(using=self.db)
+        self._result_cache = None
+        return rows
+    bulk_update.alters_data = True
+
     def _update(self, values):
         """
         A version of update that accepts field objects instead of field names.
@@ -564,7 +664,8 @@ class QuerySet(object):
 
     def _prefetch_related_objects(self):
         # This method can only be called once the result cache has been filled.
-        prefetch_related_objects(self._result_cache, self._prefetch_related_lookups)
+        self.prefetch_stats = prefetch_related_objects(self._result_cache,
+                                                       self._prefetch_related_lookups)
         self._prefetch_done = True
 
     ##################################################
@@ -696,6 +797,9 @@ class QuerySet(object):
         Many-To-One and Many-To-Many related objects when the QuerySet is
         evaluated.
 
+        Lookups are strings or Prefetch objects, which give the QuerySet to
+        fetch the related objects with.
+
         When prefetch_related() is called more than once, the list of lookups to
         prefetch is appended to. If prefetch_related(None) is called, the
         the list is cleared.
@@ -934,7 +1038,7 @@ class ValuesQuerySet(QuerySet):
         # QuerySet.clone() will also set up the _fields attribute with the
         # names of the model fields to select.
 
-    def iterator(self):
+    def iterator(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
         # Purge any extra columns that haven't been explicitly asked for
         extra_names = self.query.extra_select.keys()
         field_names = self.field_names
@@ -942,7 +1046,9 @@ class ValuesQuerySet(QuerySet):
 
         names = extra_names + field_names + aggregate_names
 
-        for row in self.query.get_compiler(self.db).results_iter():
+        results = self.query.get_compiler(self.db).results_iter(
+            chunk_size=chunk_size, server_side=server_side)
+        for row in results:
             yield dict(zip(names, row))
 
     def _setup_query(self):
@@ -1056,12 +1162,14 @@ class ValuesQuerySet(QuerySet):
 
 
 class ValuesListQuerySet(ValuesQuerySet):
-    def iterator(self):
+    def iterator(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
+        results = self.query.get_compiler(self.db).results_iter(
+            chunk_size=chunk_size, server_side=server_side)
         if self.flat and len(self._fields) == 1:
-            for row in self.query.get_compiler(self.db).results_iter():
+            for row in results:
                 yield row[0]
         elif not self.query.extra_select and not self.query.aggregate_select:
-            for row in self.query.get_compiler(self.db).results_iter():
+            for row in results:
                 yield tuple(row)
         else:
             # When extra(select=...) or an annotation is involved, the extra
@@ -1080,7 +1188,7 @@ class ValuesListQuerySet(ValuesQuerySet):
             else:
                 fields = names
 
-            for row in self.query.get_compiler(self.db).results_iter():
+            for row in results:
                 data = dict(zip(names, row))
                 yield tuple([data[f] for f in fields])
 
@@ -1093,8 +1201,9 @@ class ValuesListQuerySet(ValuesQuerySet):
 
 
 class DateQuerySet(QuerySet):
-    def iterator(self):
-        return self.query.get_compiler(self.db).results_iter()
+    def iterator(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
+        return self.query.get_compiler(self.db).results_iter(
+            chunk_size=chunk_size, server_side=server_side)
 
     def _setup_query(self):
         """
@@ -1139,7 +1248,7 @@ class EmptyQuerySet(QuerySet):
         c._result_cache = []
         return c
 
-    def iterator(self):
+    def iterator(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
         # This slightly odd construction is because we need an empty generator
         # (it raises StopIteration immediately).
         yield iter([]).next()
@@ -1225,6 +1334,12 @@ class EmptyQuerySet(QuerySet):
         """
         return 0
 
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        Don't update anything.
+        """
+        return 0
+
     def aggregate(self, *args, **kwargs):
         """
         Return a dict mapping the aggregate names to None
@@ -1576,19 +1691,81 @@ def insert_query(model, objs, fields, return_id=False, raw=False, using=None):
     return query.get_compiler(using=using).execute_sql(return_id)
 
 
+class Prefetch(object):
+    """
+    A prefetch_related() lookup whose last level is fetched with a custom
+    QuerySet instead of the related model's default manager.
+    """
+    def __init__(self, lookup, queryset=None):
+        self.lookup = lookup
+        self.queryset = queryset
+
+    def __repr__(self):
+        return '<Prefetch: %s>' % self.lookup
+
+
+def _group_by_class(objs):
+    """
+    Splits objs into lists of instances of the same class, in the order in
+    which each class is first seen.
+    """
+    groups = {}
+    ordered = []
+    for obj in objs:
+        cls = obj.__class__
+        try:
+            groups[cls].append(obj)
+        except KeyError:
+            group = groups[cls] = [obj]
+            ordered.append(group)
+    return ordered
+
+
+def _logged_query_count():
+    """
+    Returns the number of queries logged on all the database connections,
+    which only happens when DEBUG is True.
+    """
+    return sum([len(connections[alias].queries) for alias in connections])
+
+
 def prefetch_related_objects(result_cache, related_lookups):
     """
     Helper function for prefetch_related functionality
 
     Populates prefetched objects caches for a list of results
-    from a QuerySet
+    from a QuerySet. Lookups are strings or Prefetch objects.
+
+    If DEBUG is True, returns a dictionary mapping each lookup that caused a
+    query to a dictionary of the number of 'instances' it was prefetched for,
+    the number of 'queries' that took, and the number of queries 'saved'
+    compared to fetching the related objects instance by instance. Otherwise
+    returns None.
     """
     from django.db.models.sql.constants import LOOKUP_SEP
 
     if len(result_cache) == 0:
         return # nothing to do
 
-    model = result_cache[0].__class__
+    if settings.DEBUG:
+        stats = {}
+    else:
+        stats = None
+
+    # Custom querysets given with Prefetch objects, keyed by their lookup.
+    custom_querysets = {}
+    lookups = []
+    for lookup in related_lookups:
+        if isinstance(lookup, Prefetch):
+            if lookup.queryset is not None:
+                if lookup.lookup in lookups:
+                    raise ValueError("'%s' lookup was already seen with a "
+                                     "different queryset. You may need to "
+                                     "adjust the ordering of your lookups."
+                                     % lookup.lookup)
+                custom_querysets.setdefault(lookup.lookup, lookup.queryset)
+            lookup = lookup.lookup
+        lookups.append(lookup)
 
     # We need to be able to dynamically add to the list of prefetch_related
     # lookups that we look up (see below).  So we need some book keeping to
@@ -1599,7 +1776,7 @@ def prefetch_related_objects(result_cache, related_lookups):
     auto_lookups = [] # we add to this as we go through.
     followed_descriptors = set() # recursion protection
 
-    all_lookups = itertools.chain(related_lookups, auto_lookups)
+    all_lookups = itertools.chain(lookups, auto_lookups)
     for lookup in all_lookups:
         if lookup in done_lookups:
             # We've done exactly this already, skip the whole thing
@@ -1634,33 +1811,58 @@ def prefetch_related_objects(result_cache, related_lookups):
             if not good_objects:
                 break
 
+            current_lookup = LOOKUP_SEP.join(attrs[0:level+1])
+            if level == len(attrs) - 1:
+                queryset = custom_querysets.get(lookup)
+            else:
+                queryset = None
+            if current_lookup in done_queries:
+                if queryset is not None:
+                    raise ValueError("'%s' lookup was already seen with a "
+                                     "different queryset. You may need to "
+                                     "adjust the ordering of your lookups."
+                                     % current_lookup)
+                # Check we didn't do this already
+                obj_list = done_queries[current_lookup]
+                continue
+
             # Descend down tree
 
-            # We assume that objects retrieved are homogenous (which is the premise
-            # of prefetch_related), so what applies to first object applies to all.
-            first_obj = obj_list[0]
-            prefetcher, descriptor, attr_found, is_fetched = get_prefetcher(first_obj, attr)
-
-            if not attr_found:
-                raise AttributeError("Cannot find '%s' on %s object, '%s' is an invalid "
-                                     "parameter to prefetch_related()" %
-                                     (attr, first_obj.__class__.__name__, lookup))
-
-            if level == len(attrs) - 1 and prefetcher is None:
-                # Last one, this *must* resolve to something that supports
-                # prefetching, otherwise there is no point adding it and the
-                # developer asking for it has made a mistake.
-                raise ValueError("'%s' does not resolve to a item that supports "
-                                 "prefetching - this is an invalid parameter to "
-                                 "prefetch_related()." % lookup)
-
-            if prefetcher is not None and not is_fetched:
-                # Check we didn't do this already
-                current_lookup = LOOKUP_SEP.join(attrs[0:level+1])
-                if current_lookup in done_queries:
-                    obj_list = done_queries[current_lookup]
-                else:
-                    obj_list, additional_prl = prefetch_one_level(obj_list, prefetcher, attr)
+            # The objects at one level are usually homogenous, but a generic
+            # foreign key can lead to instances of several models, so each
+            # class is dealt with separately.
+            new_obj_list = []
+            cache_results = False
+            for instances in _group_by_class(obj_list):
+                first_obj = instances[0]
+                prefetcher, descriptor, attr_found, is_fetched = get_prefetcher(first_obj, attr)
+
+                if not attr_found:
+                    raise AttributeError("Cannot find '%s' on %s object, '%s' is an invalid "
+                                         "parameter to prefetch_related()" %
+                                         (attr, first_obj.__class__.__name__, lookup))
+
+                if level == len(attrs) - 1 and prefetcher is None:
+                    # Last one, this *must* resolve to something that supports
+                    # prefetching, otherwise there is no point adding it and the
+                    # developer asking for it has made a mistake.
+                    raise ValueError("'%s' does not resolve to a item that supports "
+                                     "prefetching - this is an invalid parameter to "
+                                     "prefetch_related()." % lookup)
+
+                if prefetcher is not None and not is_fetched:
+                    if stats is not None:
+                        num_queries = _logged_query_count()
+                    rel_objs, additional_prl = prefetch_one_level(
+                        instances, prefetcher, attr, queryset)
+                    if stats is not None:
+                        num_queries = _logged_query_count() - num_queries
+                        lookup_stats = stats.setdefault(current_lookup,
+                            {'instances': 0, 'queries': 0, 'saved': 0})
+                        lookup_stats['instances'] += len(instances)
+                        lookup_stats['queries'] += num_queries
+                        lookup_stats['saved'] = max(
+                            lookup_stats['instances'] - lookup_stats['queries'], 0)
                     # We need to ensure we don't keep adding lookups from the
                     # same relationships to stop infinite recursion. So, if we
                     # are already on an automatically added lookup, don't add
@@ -1670,19 +1872,25 @@ def prefetch_related_objects(result_cache, related_lookups):
                         for f in additional_prl:
                             new_prl = LOOKUP_SEP.join([current_lookup, f])
                             auto_lookups.append(new_prl)
-                        done_queries[current_lookup] = obj_list
+                        cache_results = True
                     followed_descriptors.add(descriptor)
-            else:
-                # Either a singly related object that has already been fetched
-                # (e.g. via select_related), or hopefully some other property
-                # that doesn't support prefetching but needs to be traversed.
-
-                # We replace the current list of parent objects with that list.
-                obj_list = [getattr(obj, attr) for obj in obj_list]
-
-                # Filter out 'None' so that we can continue with nullable
-                # relations.
-                obj_list = [obj for obj in obj_list if obj is not None]
+                    new_obj_list.extend(rel_objs)
+                else:
+                    # Either a singly related object that has already been fetched
+                    # (e.g. via select_related), or hopefully some other property
+                    # that doesn't support prefetching but needs to be traversed.
+
+                    # We replace the current list of parent objects with that list.
+                    # Filter out 'None' so that we can continue with nullable
+                    # relations.
+                    for obj in instances:
+                        rel_obj = getattr(obj, attr)
+                        if rel_obj is not None:
+                            new_obj_list.append(rel_obj)
+            if cache_results:
+                done_queries[current_lookup] = new_obj_list
+            obj_list = new_obj_list
+    return stats
 
 
 def get_prefetcher(instance, attr):
@@ -1728,19 +1936,20 @@ def get_prefetcher(instance, attr):
     return prefetcher, rel_obj_descriptor, attr_found, is_fetched
 
 
-def prefetch_one_level(instances, prefetcher, attname):
+def prefetch_one_level(instances, prefetcher, attname, queryset=None):
     """
     Helper function for prefetch_related_objects
 
     Runs prefetches on all instances using the prefetcher object,
-    assigning results to relevant caches in instance.
+    assigning results to relevant caches in instance. If queryset is given,
+    the related objects are fetched with it rather than the default manager.
 
     The prefetched objects are returned, along with any additional
     prefetches that must be done due to prefetch_related lookups
     found from default managers.
     """
     # prefetcher must have a method get_prefetch_query_set() which takes a list
-    # of instances, and returns a tuple:
+    # of instances and an optional queryset to start from, and returns a tuple:
 
     # (queryset of instances of self.model that are related to passed in instances,
     #  callable that gets value to be matched for returned instances,
@@ -1752,7 +1961,7 @@ def prefetch_one_level(instances, prefetcher, attname):
     # in a dictionary.
 
     rel_qs, rel_obj_attr, instance_attr, single, cache_name =\
-        prefetcher.get_prefetch_query_set(instances)
+        prefetcher.get_prefetch_query_set(instances, queryset)
     # We have to handle the possibility that the default manager itself added
     # prefetch_related lookups to the QuerySet we just got back. We don't want to
     # trigger the prefetch_related functionality by evaluating the query.
@@ -9,6 +9,7 @@ circular import difficulties.
 import weakref
 
 from django.db.backends import util
+from django.db.models.loading import get_model
 from django.utils import tree
 
 
@@ -157,6 +158,13 @@ def deferred_class_factory(model, attrs):
     name = "%s_Deferred_%s" % (model.__name__, '_'.join(sorted(list(attrs))))
     name = util.truncate_name(name, 80, 32)
 
+    # Building the class only to have the app cache hand back the existing
+    # one is expensive, so look it up first.
+    deferred_model = get_model(model._meta.app_label, name,
+                               seed_cache=False, only_installed=False)
+    if deferred_model is not None:
+        return deferred_model
+
     overrides = dict([(attr, DeferredAttribute(attr, model))
             for attr in attrs])
     overrides["Meta"] = Meta
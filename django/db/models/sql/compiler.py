@@ -11,6 +11,39 @@ from django.db.models.sql.query import get_proxied_model, get_order_dir, Query
 from django.db.utils import DatabaseError
 
 
+class CompiledSQLCache(object):
+    """
+    A bounded, process-wide mapping from query shapes (see
+    SQLCompiler.get_shape_key()) to the SQL compiled for them.
+
+    Queries with the same shape produce the same SQL string, only with
+    different parameters, so the string can be reused and only the parameters
+    recomputed.
+    """
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self.enabled = True
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        if len(self._cache) >= self.max_entries:
+            # Shapes are usually few and hot, so there's no need for anything
+            # cleverer than starting again.
+            self._cache.clear()
+        self._cache[key] = value
+
+    def clear(self):
+        self._cache.clear()
+
+compiled_sql_cache = CompiledSQLCache()
+
+
 class SQLCompiler(object):
     def __init__(self, query, connection, using):
         self.query = query
@@ -62,6 +95,13 @@ class SQLCompiler(object):
             return '', ()
 
         self.pre_sql_setup()
+        shape_key, shape_params = self.get_shape_key(with_limits, with_col_aliases)
+        if shape_key is not None:
+            cached = compiled_sql_cache.get(shape_key)
+            if cached is not None:
+                sql, ordering_aliases = cached
+                self.query.ordering_aliases = list(ordering_aliases)
+                return sql, tuple(shape_params)
         # After executing the query, we must get rid of any joins the query
         # setup created. So, take note of alias counts before the query ran.
         # However we do not want to get rid of stuff done in pre_sql_setup(),
@@ -147,7 +187,53 @@ class SQLCompiler(object):
         # Finally do cleanup - get rid of the joins we created above.
         self.query.reset_refcounts(self.refcounts_before)
 
-        return ' '.join(result), tuple(params)
+        sql = ' '.join(result)
+        if shape_key is not None:
+            compiled_sql_cache.set(shape_key,
+                (sql, tuple(self.query.ordering_aliases)))
+        return sql, tuple(params)
+
+    def get_shape_key(self, with_limits=True, with_col_aliases=False):
+        """
+        Returns a (key, params) tuple for looking up this query in the
+        compiled-SQL cache. The key captures everything that as_sql() uses to
+        build the SQL string (but not the parameter values) and params are the
+        parameters as_sql() would return.
+
+        Only plain model and values() queries are cached: (None, None) is
+        returned for queries using extra(), aggregation, select_related() or
+        anything in the where clause that isn't a simple column lookup.
+        """
+        query = self.query
+        if (not compiled_sql_cache.enabled or type(query) is not Query or
+                query.extra or query.extra_tables or query.aggregates or
+                query.group_by is not None or query.having.children or
+                query.select_related):
+            return None, None
+        for col in query.select:
+            if not isinstance(col, tuple):
+                return None, None
+        where_shape, params = query.where.get_shape(self.connection)
+        if where_shape is None:
+            return None, None
+        deferred_names, defer = query.deferred_loading
+        key = (
+            self.__class__, self.connection.alias, with_limits,
+            with_col_aliases, query.model, tuple(query.tables),
+            frozenset(query.alias_map.iteritems()),
+            frozenset(query.alias_refcount.iteritems()),
+            frozenset(query.join_map.iteritems()),
+            frozenset(query.included_inherited_models.iteritems()),
+            tuple(query.select), query.default_cols,
+            frozenset(deferred_names), defer,
+            tuple(query.order_by), tuple(query.extra_order_by),
+            query.default_ordering, query.standard_ordering,
+            query.distinct, tuple(query.distinct_fields),
+            query.low_mark, query.high_mark,
+            query.select_for_update, query.select_for_update_nowait,
+            where_shape,
+        )
+        return key, params
 
     def as_nested_sql(self):
         """
@@ -748,9 +834,13 @@ class SQLCompiler(object):
         self.query.deferred_to_data(columns, self.query.deferred_to_columns_cb)
         return columns
 
-    def results_iter(self):
+    def results_iter(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
         """
         Returns an iterator over the results from executing this query.
+
+        Rows are fetched from the database chunk_size at a time. If
+        server_side is True, a server-side cursor is used (when the backend
+        supports it) so the result set isn't held in client memory.
         """
         resolve_columns = hasattr(self, 'resolve_columns')
         fields = None
@@ -760,7 +850,8 @@ class SQLCompiler(object):
         # are released.
         if self.query.select_for_update and transaction.is_managed(self.using):
             transaction.set_dirty(self.using)
-        for rows in self.execute_sql(MULTI):
+        for rows in self.execute_sql(MULTI, chunk_size=chunk_size,
+                                     server_side=server_side):
             for row in rows:
                 if resolve_columns:
                     if fields is None:
@@ -791,7 +882,8 @@ class SQLCompiler(object):
 
                 yield row
 
-    def execute_sql(self, result_type=MULTI):
+    def execute_sql(self, result_type=MULTI, chunk_size=GET_ITERATOR_CHUNK_SIZE,
+                    server_side=False):
         """
         Run the query against the database and returns the result(s). The
         return value is a single data item if result_type is SINGLE, or an
@@ -803,6 +895,11 @@ class SQLCompiler(object):
         subclasses such as InsertQuery). It's possible, however, that no query
         is needed, as the filters describe an empty set. In that case, None is
         returned, to avoid any unnecessary database interaction.
+
+        In the MULTI case, rows are fetched chunk_size at a time. If
+        server_side is True and the backend supports it, the rows are read
+        through a server-side cursor, which is closed once the results have
+        been exhausted.
         """
         try:
             sql, params = self.as_sql()
@@ -814,7 +911,12 @@ class SQLCompiler(object):
             else:
                 return
 
-        cursor = self.connection.cursor()
+        server_side = (server_side and result_type == MULTI and
+                       self.connection.features.can_use_server_side_cursors)
+        if server_side:
+            cursor = self.connection.server_side_cursor()
+        else:
+            cursor = self.connection.cursor()
         cursor.execute(sql, params)
 
         if not result_type:
@@ -825,12 +927,14 @@ class SQLCompiler(object):
             return cursor.fetchone()
 
         # The MULTI case.
+        sentinel = self.connection.features.empty_fetchmany_value
         if self.query.ordering_aliases:
             result = order_modified_iter(cursor, len(self.query.ordering_aliases),
-                    self.connection.features.empty_fetchmany_value)
+                    sentinel, chunk_size)
         else:
-            result = iter((lambda: cursor.fetchmany(GET_ITERATOR_CHUNK_SIZE)),
-                    self.connection.features.empty_fetchmany_value)
+            result = iter((lambda: cursor.fetchmany(chunk_size)), sentinel)
+        if server_side:
+            return closing_iter(cursor, result)
         if not self.connection.features.can_use_chunked_reads:
             # If we are using non-chunked reads, we return the same data
             # structure as normally, but ensure it is all read into memory
@@ -886,9 +990,16 @@ class SQLInsertCompiler(SQLCompiler):
                 for val in values
             ]
         if self.return_id and self.connection.features.can_return_id_from_insert:
-            params = params[0]
             col = "%s.%s" % (qn(opts.db_table), qn(opts.pk.column))
-            result.append("VALUES (%s)" % ", ".join(placeholders[0]))
+            if len(values) == 1:
+                params = params[0]
+                result.append("VALUES (%s)" % ", ".join(placeholders[0]))
+            else:
+                # A single multi-row INSERT that returns all the new ids.
+                params = [v for val in params for v in val]
+                result.append("VALUES %s" % ", ".join([
+                    "(%s)" % ", ".join(p) for p in placeholders
+                ]))
             r_fmt, r_params = self.connection.ops.return_insert_id()
             result.append(r_fmt % col)
             params += r_params
@@ -903,13 +1014,21 @@ class SQLInsertCompiler(SQLCompiler):
             ]
 
     def execute_sql(self, return_id=False):
-        assert not (return_id and len(self.query.objs) != 1)
+        """
+        Runs the insert. If return_id is True, returns the id of the new row
+        or, when several objects were inserted (which is only allowed if the
+        backend can_return_ids_from_bulk_insert), the list of their ids.
+        """
+        assert not (return_id and len(self.query.objs) != 1 and
+                    not self.connection.features.can_return_ids_from_bulk_insert)
         self.return_id = return_id
         cursor = self.connection.cursor()
         for sql, params in self.as_sql():
             cursor.execute(sql, params)
         if not (return_id and cursor):
             return
+        if len(self.query.objs) != 1:
+            return self.connection.ops.fetch_returned_insert_ids(cursor)
         if self.connection.features.can_return_id_from_insert:
             return self.connection.ops.fetch_returned_insert_id(cursor)
         return self.connection.ops.last_insert_id(cursor,
@@ -927,7 +1046,8 @@ class SQLDeleteCompiler(SQLCompiler):
         qn = self.quote_name_unless_alias
         result = ['DELETE FROM %s' % qn(self.query.tables[0])]
         where, params = self.query.where.as_sql(qn=qn, connection=self.connection)
-        result.append('WHERE %s' % where)
+        if where:
+            result.append('WHERE %s' % where)
         return ' '.join(result), tuple(params)
 
 class SQLUpdateCompiler(SQLCompiler):
@@ -950,12 +1070,6 @@ class SQLUpdateCompiler(SQLCompiler):
             else:
                 val = field.get_db_prep_save(val, connection=self.connection)
 
-            # Getting the placeholder for the field.
-            if hasattr(field, 'get_placeholder'):
-                placeholder = field.get_placeholder(val, self.connection)
-            else:
-                placeholder = '%s'
-
             if hasattr(val, 'evaluate'):
                 val = SQLEvaluator(val, self.query, allow_joins=False)
             name = field.column
@@ -964,6 +1078,11 @@ class SQLUpdateCompiler(SQLCompiler):
                 values.append('%s = %s' % (qn(name), sql))
                 update_params.extend(params)
             elif val is not None:
+                # Getting the placeholder for the field.
+                if hasattr(field, 'get_placeholder'):
+                    placeholder = field.get_placeholder(val, self.connection)
+                else:
+                    placeholder = '%s'
                 values.append('%s = %s' % (qn(name), placeholder))
                 update_params.append(val)
             else:
@@ -1058,7 +1177,7 @@ class SQLAggregateCompiler(SQLCompiler):
         return (sql, params)
 
 class SQLDateCompiler(SQLCompiler):
-    def results_iter(self):
+    def results_iter(self, chunk_size=GET_ITERATOR_CHUNK_SIZE, server_side=False):
         """
         Returns an iterator over the results from executing this query.
         """
@@ -1071,7 +1190,8 @@ class SQLDateCompiler(SQLCompiler):
             needs_string_cast = self.connection.features.needs_datetime_string_cast
 
         offset = len(self.query.extra_select)
-        for rows in self.execute_sql(MULTI):
+        for rows in self.execute_sql(MULTI, chunk_size=chunk_size,
+                                     server_side=server_side):
             for row in rows:
                 date = row[offset]
                 if resolve_columns:
@@ -1088,13 +1208,26 @@ def empty_iter():
     yield iter([]).next()
 
 
-def order_modified_iter(cursor, trim, sentinel):
+def order_modified_iter(cursor, trim, sentinel,
+                        chunk_size=GET_ITERATOR_CHUNK_SIZE):
     """
     Yields blocks of rows from a cursor. We use this iterator in the special
     case when extra output columns have been added to support ordering
     requirements. We must trim those extra columns before anything else can use
     the results, since they're only needed to make the SQL valid.
     """
-    for rows in iter((lambda: cursor.fetchmany(GET_ITERATOR_CHUNK_SIZE)),
-            sentinel):
+    for rows in iter((lambda: cursor.fetchmany(chunk_size)), sentinel):
         yield [r[:-trim] for r in rows]
+
+
+def closing_iter(cursor, blocks):
+    """
+    Yields the blocks of rows produced by a server-side cursor, closing the
+    cursor once they are exhausted (or the iterator is discarded) so the
+    server can release the result set.
+    """
+    try:
+        for rows in blocks:
+            yield rows
+    finally:
+        cursor.close()
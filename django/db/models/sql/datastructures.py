@@ -44,3 +44,39 @@ class Date(object):
         else:
             col = self.col
         return connection.ops.date_trunc_sql(self.lookup_type, col)
+
+class CaseUpdate(object):
+    """
+    The new value of a column in a bulk update: a CASE expression that picks
+    the value for each row by its primary key.
+    """
+    def __init__(self, field, pk_field, cases):
+        self.field = field
+        self.pk_field = pk_field
+        self.cases = cases
+
+    def prepare_database_save(self, field):
+        return self
+
+    def as_sql(self, qn, connection):
+        field = self.field
+        pk_column = qn(self.pk_field.column)
+        if connection.features.requires_casted_case_in_updates:
+            cast_sql = 'CAST(%%s AS %s)' % field.db_type(connection=connection)
+        else:
+            cast_sql = '%s'
+        result, params = ['CASE'], []
+        for pk, value in self.cases:
+            params.append(self.pk_field.get_db_prep_value(pk, connection=connection))
+            value = field.get_db_prep_save(value, connection=connection)
+            if value is None:
+                placeholder = 'NULL'
+            else:
+                if hasattr(field, 'get_placeholder'):
+                    placeholder = field.get_placeholder(value, connection)
+                else:
+                    placeholder = '%s'
+                params.append(value)
+            result.append('WHEN %s = %%s THEN %s' % (pk_column, cast_sql % placeholder))
+        result.append('ELSE %s END' % qn(field.column))
+        return ' '.join(result), params
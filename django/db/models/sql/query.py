@@ -256,13 +256,23 @@ class Query(object):
         obj.dupe_avoidance = self.dupe_avoidance.copy()
         obj.select = self.select[:]
         obj.tables = self.tables[:]
-        obj.where = copy.deepcopy(self.where, memo=memo)
+        # The where-trees, the extra dicts, the masks and the deferred loading
+        # data are shared with the clone and copied (or replaced) only when
+        # one of the queries changes them. A deep copy is only made when the
+        # query itself is being deep-copied.
+        if memo is None:
+            obj.where = self.where.clone()
+        else:
+            obj.where = copy.deepcopy(self.where, memo=memo)
         obj.where_class = self.where_class
         if self.group_by is None:
             obj.group_by = None
         else:
             obj.group_by = self.group_by[:]
-        obj.having = copy.deepcopy(self.having, memo=memo)
+        if memo is None:
+            obj.having = self.having.clone()
+        else:
+            obj.having = copy.deepcopy(self.having, memo=memo)
         obj.order_by = self.order_by[:]
         obj.low_mark, obj.high_mark = self.low_mark, self.high_mark
         obj.distinct = self.distinct
@@ -271,11 +281,11 @@ class Query(object):
         obj.select_for_update_nowait = self.select_for_update_nowait
         obj.select_related = self.select_related
         obj.related_select_cols = []
-        obj.aggregates = copy.deepcopy(self.aggregates, memo=memo)
-        if self.aggregate_select_mask is None:
-            obj.aggregate_select_mask = None
+        if self.aggregates:
+            obj.aggregates = copy.deepcopy(self.aggregates, memo=memo)
         else:
-            obj.aggregate_select_mask = self.aggregate_select_mask.copy()
+            obj.aggregates = SortedDict()
+        obj.aggregate_select_mask = self.aggregate_select_mask
         # _aggregate_select_cache cannot be copied, as doing so breaks the
         # (necessary) state in which both aggregates and
         # _aggregate_select_cache point to the same underlying objects.
@@ -283,18 +293,15 @@ class Query(object):
         # used.
         obj._aggregate_select_cache = None
         obj.max_depth = self.max_depth
-        obj.extra = self.extra.copy()
-        if self.extra_select_mask is None:
-            obj.extra_select_mask = None
-        else:
-            obj.extra_select_mask = self.extra_select_mask.copy()
-        if self._extra_select_cache is None:
-            obj._extra_select_cache = None
-        else:
-            obj._extra_select_cache = self._extra_select_cache.copy()
+        obj.extra = self.extra
+        obj.extra_select_mask = self.extra_select_mask
+        obj._extra_select_cache = self._extra_select_cache
         obj.extra_tables = self.extra_tables
         obj.extra_order_by = self.extra_order_by
-        obj.deferred_loading = copy.deepcopy(self.deferred_loading, memo=memo)
+        if memo is None:
+            obj.deferred_loading = self.deferred_loading
+        else:
+            obj.deferred_loading = copy.deepcopy(self.deferred_loading, memo=memo)
         if self.filter_is_sticky and self.used_aliases:
             obj.used_aliases = self.used_aliases.copy()
         else:
@@ -508,7 +515,7 @@ class Query(object):
         # Now relabel a copy of the rhs where-clause and add it to the current
         # one.
         if rhs.where:
-            w = copy.deepcopy(rhs.where)
+            w = rhs.where.clone()
             w.relabel_aliases(change_map)
             if not self.where:
                 # Since 'self' matches everything, add an explicit "include
@@ -541,7 +548,10 @@ class Query(object):
             if self.extra and rhs.extra:
                 raise ValueError("When merging querysets using 'or', you "
                         "cannot have extra(select=...) on both sides.")
-        self.extra.update(rhs.extra)
+        if rhs.extra:
+            # The extra dict may be shared with clones of this query.
+            self.extra = self.extra.copy()
+            self.extra.update(rhs.extra)
         extra_select_mask = set()
         if self.extra_select_mask is not None:
             extra_select_mask.update(self.extra_select_mask)
@@ -1789,6 +1799,8 @@ class Query(object):
                     pos = entry.find("%s", pos + 2)
                 select_pairs[name] = (entry, entry_params)
             # This is order preserving, since self.extra_select is a SortedDict.
+            # The extra dict may be shared with clones of this query.
+            self.extra = self.extra.copy()
             self.extra.update(select_pairs)
         if where or params:
             self.where.add(ExtraWhere(where, params), AND)
@@ -3,9 +3,10 @@ Query subclasses which provide extra functionality beyond simple data retrieval.
 """
 
 from django.core.exceptions import FieldError
+from django.db import connections
 from django.db.models.fields import DateField, FieldDoesNotExist
 from django.db.models.sql.constants import *
-from django.db.models.sql.datastructures import Date
+from django.db.models.sql.datastructures import CaseUpdate, Date
 from django.db.models.sql.query import Query
 from django.db.models.sql.where import AND, Constraint
 
@@ -41,6 +42,30 @@ class DeleteQuery(Query):
                     pk_list[offset : offset + GET_ITERATOR_CHUNK_SIZE]), AND)
             self.do_query(self.model._meta.db_table, where, using=using)
 
+    def delete_qs(self, query, using):
+        """
+        Deletes the rows matched by the QuerySet 'query' without fetching
+        them. If the QuerySet only refers to this model's own table, its WHERE
+        clause is used as is. Otherwise the rows are picked by primary key in
+        a subquery or, on backends that can't select from the table being
+        deleted from, by fetching their primary keys first.
+        """
+        innerq = query.query.clone()
+        # Make sure both queries have the base table in use.
+        innerq.get_initial_alias()
+        self.get_initial_alias()
+        innerq_used_tables = [t for t in innerq.tables
+                              if innerq.alias_refcount[t]]
+        if (innerq_used_tables == self.tables and not innerq.having and
+                not innerq.extra_tables):
+            self.where = innerq.where
+        elif connections[using].features.update_can_self_select:
+            self.add_filter(('pk__in', query))
+        else:
+            self.delete_batch(list(query.values_list('pk', flat=True)), using)
+            return
+        self.get_compiler(using).execute_sql(None)
+
 class UpdateQuery(Query):
     """
     Represents an "update" SQL query.
@@ -95,6 +120,26 @@ class UpdateQuery(Query):
             values_seq.append((field, model, val))
         return self.add_update_fields(values_seq)
 
+    def add_update_cases(self, field_names, objs):
+        """
+        Sets each of the named fields to the value it has on the instance in
+        objs with the same primary key, and limits the update to the rows of
+        those instances. Used by the public bulk_update() method on querysets.
+        """
+        values = {}
+        pk_list = [obj.pk for obj in objs]
+        for name in field_names:
+            field, model, direct, m2m = self.model._meta.get_field_by_name(name)
+            if not direct or m2m:
+                raise FieldError('Cannot bulk update model field %r (only non-relations and foreign keys permitted).' % field)
+            if field.primary_key:
+                raise FieldError('Cannot bulk update the primary key field %r.' % field)
+            pk_field = (model or self.model)._meta.pk
+            values[name] = CaseUpdate(field, pk_field,
+                [(obj.pk, getattr(obj, field.attname)) for obj in objs])
+        self.add_update_values(values)
+        self.add_filter(('pk__in', pk_list))
+
     def add_update_fields(self, values_seq):
         """
         Turn a sequence of (field, model, value) triples into an update query.
@@ -4,6 +4,7 @@ Code to manage the creation and SQL rendering of 'where' constraints.
 
 from __future__ import absolute_import
 
+import copy
 import datetime
 from itertools import repeat
 
@@ -36,6 +37,21 @@ class WhereNode(tree.Node):
     """
     default = AND
 
+    def clone(self):
+        """
+        Returns a copy of this node that can be modified independently of the
+        original.
+
+        Only the list of children is copied; the children themselves are
+        shared. That's safe because the query construction code only ever
+        modifies the root node of a where-tree, and relabel_aliases() replaces
+        children instead of modifying them. Cloning a query therefore doesn't
+        pay for the whole size of its where-tree.
+        """
+        obj = self._new_instance(self.children, self.connector, self.negated)
+        obj.subtree_parents = [parent.clone() for parent in self.subtree_parents]
+        return obj
+
     def add(self, data, connector):
         """
         Add a node to the where-tree. If the data is a list or tuple, it is
@@ -214,6 +230,60 @@ class WhereNode(tree.Node):
 
         raise TypeError('Invalid lookup_type: %r' % lookup_type)
 
+    def get_shape(self, connection):
+        """
+        Returns a (shape, params) tuple, where shape is a hashable description
+        of everything in this node that affects the SQL produced by as_sql()
+        and params are the parameters as_sql() would return.
+
+        Nodes for which the SQL can depend on anything other than the shape
+        (custom children, subqueries, expressions and so on) return
+        (None, None). The compiled-SQL cache only reuses SQL for queries whose
+        where clause has a shape.
+        """
+        if type(self) is not WhereNode:
+            return None, None
+        shape = [self.connector, self.negated]
+        result_params = []
+        for child in self.children:
+            if isinstance(child, WhereNode):
+                child_shape, params = child.get_shape(connection)
+                if child_shape is None:
+                    return None, None
+            elif isinstance(child, tuple):
+                child_shape, params = self.get_atom_shape(child, connection)
+                if child_shape is None:
+                    return None, None
+            else:
+                return None, None
+            shape.append(child_shape)
+            result_params.extend(params)
+        return tuple(shape), result_params
+
+    def get_atom_shape(self, child, connection):
+        """
+        Returns the shape and parameters of a leaf node, mirroring the
+        processing done by make_atom(), or (None, None) if the leaf's SQL
+        can't be derived from its shape.
+        """
+        lvalue, lookup_type, value_annot, params_or_value = child
+        if hasattr(lvalue, 'process'):
+            try:
+                lvalue, params = lvalue.process(lookup_type, params_or_value, connection)
+            except EmptyShortCircuit:
+                return None, None
+        elif isinstance(lvalue, tuple):
+            params = Field().get_db_prep_lookup(lookup_type, params_or_value,
+                connection=connection, prepared=True)
+        else:
+            return None, None
+        if not isinstance(lvalue, tuple) or hasattr(params, 'as_sql'):
+            return None, None
+        empty_string = (connection.features.interprets_empty_strings_as_nulls and
+            lookup_type == 'exact' and len(params) == 1 and params[0] == '')
+        shape = (lvalue, lookup_type, value_annot, len(params), empty_string)
+        return shape, params
+
     def sql_for_columns(self, data, qn, connection):
         """
         Returns the SQL fragment used for the left-hand side of a column
@@ -231,26 +301,38 @@ class WhereNode(tree.Node):
         """
         Relabels the alias values of any children. 'change_map' is a dictionary
         mapping old (current) alias values to the new values.
+
+        Children can be shared with other where-trees (see clone()), so they
+        are replaced by relabeled copies rather than modified in place.
         """
         if not node:
             node = self
         for pos, child in enumerate(node.children):
-            if hasattr(child, 'relabel_aliases'):
+            if isinstance(child, WhereNode):
+                child = child.clone()
+                child.relabel_aliases(change_map)
+            elif hasattr(child, 'relabel_aliases'):
+                child = copy.deepcopy(child)
                 child.relabel_aliases(change_map)
             elif isinstance(child, tree.Node):
+                child = child._new_instance(child.children, child.connector,
+                                            child.negated)
                 self.relabel_aliases(change_map, child)
             elif isinstance(child, (list, tuple)):
-                if isinstance(child[0], (list, tuple)):
-                    elt = list(child[0])
-                    if elt[0] in change_map:
-                        elt[0] = change_map[elt[0]]
-                        node.children[pos] = (tuple(elt),) + child[1:]
+                lvalue, value = child[0], child[3]
+                if isinstance(lvalue, (list, tuple)):
+                    if lvalue[0] in change_map:
+                        lvalue = (change_map[lvalue[0]],) + tuple(lvalue[1:])
                 else:
-                    child[0].relabel_aliases(change_map)
+                    lvalue = copy.copy(lvalue)
+                    lvalue.relabel_aliases(change_map)
 
                 # Check if the query value also requires relabelling
-                if hasattr(child[3], 'relabel_aliases'):
-                    child[3].relabel_aliases(change_map)
+                if hasattr(value, 'relabel_aliases'):
+                    value = copy.deepcopy(value)
+                    value.relabel_aliases(change_map)
+                child = (lvalue,) + tuple(child[1:3]) + (value,)
+            node.children[pos] = child
 
 class EverythingNode(object):
     """
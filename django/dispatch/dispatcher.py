@@ -146,6 +146,16 @@ class Signal(object):
         finally:
             self.lock.release()
 
+    def has_listeners(self, sender=None):
+        """
+        Returns True if any live receiver would be called by send(sender).
+        Lets callers skip building the arguments for a signal that nobody is
+        listening to.
+        """
+        if not self.receivers:
+            return False
+        return bool(self._live_receivers(_make_id(sender)))
+
     def send(self, sender, **named):
         """
         Send signal from sender to all connected receivers.
@@ -3,6 +3,7 @@ from __future__ import absolute_import
 import datetime
 import os
 import re
+import stat
 import sys
 import time
 import warnings
@@ -726,6 +727,128 @@ class HttpResponse(object):
             raise Exception("This %s instance cannot tell its position" % self.__class__)
         return sum([len(str(chunk)) for chunk in self._container])
 
+class FileResponse(HttpResponse):
+    """
+    An HTTP response whose content is read from an open file, block_size
+    bytes at a time.
+
+    As long as its content isn't replaced, the WSGI handler passes the file
+    to the server's wsgi.file_wrapper, which can send it without reading it
+    through Python. Responses to Range requests only contain the requested
+    bytes of the file (see set_range()).
+    """
+    block_size = 8192
+
+    def __init__(self, file_obj, mimetype=None, status=None,
+            content_type=None, block_size=None):
+        super(FileResponse, self).__init__(mimetype=mimetype, status=status,
+                                           content_type=content_type)
+        if block_size:
+            self.block_size = block_size
+        self.file_obj = file_obj
+        self.file_size = self._get_file_size()
+        self._range = None
+        self._started = False
+        self._container = self._read_chunks()
+        self._base_content_is_iter = True
+        self._streams_file = True
+        if self.file_size is not None:
+            self['Content-Length'] = self.file_size
+            if self.accepts_ranges:
+                self['Accept-Ranges'] = 'bytes'
+
+    def _get_file_size(self):
+        try:
+            statobj = os.fstat(self.file_obj.fileno())
+        except (AttributeError, IOError, OSError, ValueError):
+            # Django's File objects know their size.
+            return getattr(self.file_obj, 'size', None)
+        if stat.S_ISREG(statobj.st_mode):
+            return statobj.st_size
+        return None
+
+    def _read_chunks(self):
+        self._started = True
+        file_obj, remaining = self.file_obj, None
+        if self._range is not None:
+            start, stop = self._range
+            file_obj.seek(start)
+            remaining = stop - start
+        while remaining is None or remaining > 0:
+            if remaining is None:
+                chunk = file_obj.read(self.block_size)
+            else:
+                chunk = file_obj.read(min(self.block_size, remaining))
+                remaining -= len(chunk)
+            if not chunk:
+                break
+            yield chunk
+
+    def _get_content(self):
+        if self._streams_file:
+            # Keep the content, it can only be read from the file once.
+            self.content = ''.join(self._container)
+            self.file_obj.close()
+        return super(FileResponse, self)._get_content()
+
+    def _set_content(self, value):
+        # The new content may still read from the file, for instance to
+        # compress it, so the file is only closed with the response.
+        self._streams_file = False
+        super(FileResponse, self)._set_content(value)
+
+    content = property(_get_content, _set_content)
+
+    def accepts_ranges(self):
+        """
+        True if the content of the response is still the whole file and the
+        file's size is known, so that set_range() can be called.
+        """
+        return (self._streams_file and not self._started and
+                self.file_size is not None and hasattr(self.file_obj, 'seek'))
+    accepts_ranges = property(accepts_ranges)
+
+    def set_range(self, start, stop):
+        """
+        Restricts the content of the response to the bytes of the file from
+        start up to, but not including, stop, and sets the status code to
+        206 (Partial Content).
+        """
+        self._range = (start, stop)
+        self.status_code = 206
+        self['Content-Range'] = 'bytes %d-%d/%d' % (start, stop - 1, self.file_size)
+        self['Content-Length'] = stop - start
+
+    def file_to_stream(self):
+        """
+        The file to pass to wsgi.file_wrapper, positioned at the start of the
+        content, or None if the content must be iterated over instead. That's
+        the case if the content was replaced or consumed, or if it ends before
+        the end of the file, since file wrappers send everything up to the end
+        of the file.
+        """
+        if not self._streams_file or self._started:
+            return None
+        if self._range is not None:
+            start, stop = self._range
+            if stop != self.file_size:
+                return None
+            self.file_obj.seek(start)
+        return self.file_obj
+    file_to_stream = property(file_to_stream)
+
+    def close(self):
+        if self.file_obj is not None:
+            self.file_obj.close()
+        super(FileResponse, self).close()
+
+    def __getstate__(self):
+        # Open files can't be pickled; keep the content read from it instead.
+        self.content = self.content
+        state = super(FileResponse, self).__getstate__()
+        state['file_obj'] = None
+        return state
+
 class HttpResponseRedirect(HttpResponse):
     status_code = 302
 
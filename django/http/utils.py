@@ -1,6 +1,7 @@
 """
 Functions that modify an HTTP request or response in some way.
 """
+from django.utils.http import parse_range_header
 
 # This group of functions are run as part of the response handling, after
 # everything else, including all response middleware. Think of them as
@@ -20,6 +21,35 @@ def fix_location_header(request, response):
         response['Location'] = request.build_absolute_uri(response['Location'])
     return response
 
+def partial_content(request, response):
+    """
+    Restricts responses that can send a part of their content, such as
+    FileResponse, to the byte range asked for in the Range header of a GET
+    request, as described in RFC 2616, section 14.35. A request for several
+    ranges gets the whole content, as does a request whose If-Range header
+    doesn't match the ETag or Last-Modified header of the response.
+    """
+    range_header = request.META.get('HTTP_RANGE')
+    if (not range_header or request.method not in ('GET', 'HEAD') or
+            response.status_code != 200 or
+            not getattr(response, 'accepts_ranges', False)):
+        return response
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range not in (response.get('ETag'),
+                                     response.get('Last-Modified')):
+        return response
+    ranges = parse_range_header(range_header, response.file_size)
+    if ranges is None or len(ranges) > 1:
+        return response
+    if ranges:
+        response.set_range(*ranges[0])
+    else:
+        response.status_code = 416
+        response.content = ''
+        response['Content-Range'] = 'bytes */%d' % response.file_size
+        response['Content-Length'] = 0
+    return response
+
 def conditional_content_removal(request, response):
     """
     Removes the content of responses for HEAD requests, 1xx, 204 and 304
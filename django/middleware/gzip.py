@@ -1,19 +1,42 @@
 import re
+from itertools import chain
 
-from django.utils.text import compress_string
+from django.conf import settings
+from django.utils.text import compress_sequence, compress_string
 from django.utils.cache import patch_vary_headers
 
 re_accepts_gzip = re.compile(r'\bgzip\b')
 
+def encode_chunks(chunks, charset):
+    """
+    Yields the chunks of the content of a response as the response itself
+    would when iterated over.
+    """
+    for chunk in chunks:
+        if isinstance(chunk, unicode):
+            chunk = chunk.encode(charset)
+        yield str(chunk)
+
 class GZipMiddleware(object):
     """
     This middleware compresses content if the browser allows gzip compression.
     It sets the Vary header accordingly, so that caches will base their storage
     on the Accept-Encoding header.
+
+    Responses whose content is an iterator are compressed as they are sent,
+    without reading their whole content in memory.
     """
     def process_response(self, request, response):
-        # It's not worth attempting to compress really short responses.
-        if len(response.content) < 200:
+        streaming = getattr(response, '_base_content_is_iter', False)
+        min_length = settings.GZIP_MIN_LENGTH
+
+        # It's not worth attempting to compress really short responses. The
+        # length of streamed content is only known from its Content-Length.
+        if streaming:
+            length = response.get('Content-Length', '')
+            if length.isdigit() and int(length) < min_length:
+                return response
+        elif len(response.content) < min_length:
             return response
 
         patch_vary_headers(response, ('Accept-Encoding',))
@@ -32,15 +55,34 @@ class GZipMiddleware(object):
         if not re_accepts_gzip.search(ae):
             return response
 
-        # Return the compressed content only if it's actually shorter.
-        compressed_content = compress_string(response.content)
-        if len(compressed_content) >= len(response.content):
-            return response
+        if streaming:
+            # Read just enough of the content to tell whether it's short.
+            chunks = encode_chunks(response._container, response._charset)
+            head, length = [], 0
+            while length < min_length:
+                try:
+                    chunk = chunks.next()
+                except StopIteration:
+                    response.content = ''.join(head)
+                    return response
+                head.append(chunk)
+                length += len(chunk)
+            response.content = compress_sequence(chain(head, chunks),
+                                                 settings.GZIP_COMPRESS_LEVEL)
+            # The length of the compressed content isn't known in advance,
+            # and byte ranges of it can't be served.
+            del response['Content-Length']
+            del response['Accept-Ranges']
+        else:
+            # Return the compressed content only if it's actually shorter.
+            compressed_content = compress_string(response.content,
+                                                 settings.GZIP_COMPRESS_LEVEL)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response['Content-Length'] = str(len(response.content))
 
         if response.has_header('ETag'):
             response['ETag'] = re.sub('"$', ';gzip"', response['ETag'])
-
-        response.content = compressed_content
         response['Content-Encoding'] = 'gzip'
-        response['Content-Length'] = str(len(response.content))
         return response
@@ -141,6 +141,21 @@ class Template(object):
         finally:
             context.render_context.pop()
 
+    def _stream(self, context):
+        return self.nodelist.stream(context)
+
+    def stream(self, context):
+        """
+        Like render(), but returns an iterator over the pieces of the output,
+        which are produced as rendering goes along.
+        """
+        context.render_context.push()
+        try:
+            for bit in self._stream(context):
+                yield bit
+        finally:
+            context.render_context.pop()
+
 def compile_string(template_string, origin):
     "Compiles template_string into NodeList ready for rendering"
     if settings.TEMPLATE_DEBUG:
@@ -150,7 +165,11 @@ def compile_string(template_string, origin):
         lexer_class, parser_class = Lexer, Parser
     lexer = lexer_class(template_string, origin)
     parser = parser_class(lexer.tokenize())
-    return parser.parse()
+    nodelist = parser.parse()
+    if settings.TEMPLATE_COMPILE and not settings.TEMPLATE_DEBUG:
+        from django.template.codegen import compile_nodelist
+        nodelist = compile_nodelist(nodelist)
+    return nodelist
 
 class Token(object):
     def __init__(self, token_type, contents):
@@ -794,6 +813,14 @@ class Node(object):
         """
         pass
 
+    def stream(self, context):
+        """
+        Return an iterator over the pieces of the rendered node. Nodes that
+        can produce their output bit by bit override this; by default it's
+        the result of render() in one piece.
+        """
+        yield self.render(context)
+
     def __iter__(self):
         yield self
 
@@ -826,6 +853,14 @@ class NodeList(list):
             bits.append(force_unicode(bit))
         return mark_safe(u''.join(bits))
 
+    def stream(self, context):
+        for node in self:
+            if isinstance(node, Node):
+                for bit in self.stream_node(node, context):
+                    yield force_unicode(bit)
+            else:
+                yield force_unicode(node)
+
     def get_nodes_by_type(self, nodetype):
         "Return a list of all nodes of the given type"
         nodes = []
@@ -836,6 +871,9 @@ class NodeList(list):
     def render_node(self, node, context):
         return node.render(context)
 
+    def stream_node(self, node, context):
+        return node.stream(context)
+
 class TextNode(Node):
     def __init__(self, s):
         self.s = s
@@ -0,0 +1,209 @@
+"""
+Compilation of parsed templates to Python functions.
+
+When the TEMPLATE_COMPILE setting is True, the node lists of every template
+are replaced after parsing by CompiledNodeLists. The render() method of a
+CompiledNodeList is a function generated for that list of nodes: text becomes
+a constant, variables are resolved with the lookup path learned on previous
+renders and other nodes are rendered by calling their render() method
+directly. The output is the same as that of NodeList.render().
+"""
+import types
+from copy import copy
+
+from django.conf import settings
+from django.template.base import (Node, NodeList, TextNode, VariableNode,
+    Variable, VariableDoesNotExist, _render_value_in_context)
+from django.utils.encoding import force_unicode
+from django.utils.safestring import mark_safe
+
+# The kinds of lookup a LearnedVariable can remember.
+ATTRIBUTE_LOOKUP = 'attribute'
+INDEX_LOOKUP = 'index'
+
+
+class LearnedVariable(Variable):
+    """
+    A Variable that remembers how each part of its lookup was resolved.
+
+    Variable._resolve_lookup() tries a dictionary lookup, an attribute lookup
+    and a list-index lookup in turn, and relies on exceptions to move from
+    one to the next. When a part of the lookup turns out to be an attribute
+    of an object whose type doesn't support item access at all, or an index
+    into a list or tuple, the next lookup on an object of the same type goes
+    straight to the kind of lookup that worked.
+    """
+    def __init__(self, var):
+        super(LearnedVariable, self).__init__(var)
+        self._init_learned()
+
+    def _init_learned(self):
+        if self.lookups is not None:
+            self.learned = [None] * len(self.lookups)
+
+    def from_variable(cls, variable):
+        """
+        Returns a LearnedVariable that resolves like the given Variable.
+        """
+        learned = cls.__new__(cls)
+        learned.__dict__.update(variable.__dict__)
+        learned._init_learned()
+        return learned
+    from_variable = classmethod(from_variable)
+
+    def _lookup_bit(self, i, bit, current):
+        current_type = type(current)
+        try:  # dictionary lookup
+            return current[bit]
+        except (TypeError, AttributeError, KeyError):
+            pass
+        try:  # attribute lookup
+            value = getattr(current, bit)
+        except (TypeError, AttributeError):
+            try:  # list-index lookup
+                value = current[int(bit)]
+            except (IndexError, ValueError, KeyError, TypeError):
+                raise VariableDoesNotExist("Failed lookup for key [%s] in %r",
+                                           (bit, current))
+            if current_type is list or current_type is tuple:
+                self.learned[i] = (current_type, INDEX_LOOKUP, int(bit))
+            return value
+        # Objects of types without __getitem__ can never be used for a
+        # dictionary lookup. Old-style instances all share one type, so
+        # there's nothing to learn about them.
+        if (current_type is not types.InstanceType and
+                not hasattr(current_type, '__getitem__')):
+            self.learned[i] = (current_type, ATTRIBUTE_LOOKUP)
+        return value
+
+    def _resolve_lookup(self, context):
+        current = context
+        learned = self.learned
+        try:  # catch-all for silent variable failures
+            for i, bit in enumerate(self.lookups):
+                path = learned[i]
+                if path is not None and path[0] is type(current):
+                    # The slower lookups that are skipped here would fail in
+                    # the same way, so the error doesn't depend on the path.
+                    try:
+                        if path[1] is ATTRIBUTE_LOOKUP:
+                            current = getattr(current, bit)
+                        else:
+                            current = current[path[2]]
+                    except (TypeError, AttributeError, IndexError):
+                        raise VariableDoesNotExist("Failed lookup for key "
+                                                   "[%s] in %r",
+                                                   (bit, current))
+                else:
+                    current = self._lookup_bit(i, bit, current)
+                if callable(current):
+                    if getattr(current, 'do_not_call_in_templates', False):
+                        pass
+                    elif getattr(current, 'alters_data', False):
+                        current = settings.TEMPLATE_STRING_IF_INVALID
+                    else:
+                        try: # method call (assuming no args required)
+                            current = current()
+                        except TypeError: # arguments *were* required
+                            current = settings.TEMPLATE_STRING_IF_INVALID
+        except Exception, e:
+            if getattr(e, 'silent_variable_failure', False):
+                current = settings.TEMPLATE_STRING_IF_INVALID
+            else:
+                raise
+
+        return current
+
+
+def _learn(var):
+    if isinstance(var, Variable) and not isinstance(var, LearnedVariable):
+        return LearnedVariable.from_variable(var)
+    return var
+
+def variable_renderer(filter_expression):
+    """
+    Returns a function that renders filter_expression like VariableNode does,
+    but resolves its variables with LearnedVariables.
+    """
+    filter_expression = copy(filter_expression)
+    filter_expression.var = _learn(filter_expression.var)
+    filter_expression.filters = [
+        (func, [(lookup, _learn(arg)) for lookup, arg in args])
+        for func, args in filter_expression.filters
+    ]
+    resolve = filter_expression.resolve
+
+    def render(context):
+        try:
+            output = resolve(context)
+        except UnicodeDecodeError:
+            return ''
+        return _render_value_in_context(output, context)
+    return render
+
+
+class CompiledNodeList(NodeList):
+    """
+    A NodeList with a render() method generated by compile_nodelist().
+    """
+    def render(self, context):
+        return self._render(context)
+
+    def __reduce__(self):
+        # Generated functions can't be pickled; compile again on unpickling.
+        return (compile_nodelist, (NodeList(self),))
+
+
+def _compile_children(node):
+    conditions_nodelists = getattr(node, 'conditions_nodelists', None)
+    if conditions_nodelists is not None:
+        # {% if %} keeps a nodelist for each of its branches.
+        node.conditions_nodelists = [(condition, compile_nodelist(nodelist))
+                                     for condition, nodelist in conditions_nodelists]
+    for attr in node.child_nodelists:
+        # Look in the instance dictionary to skip computed properties.
+        nodelist = node.__dict__.get(attr)
+        if isinstance(nodelist, NodeList):
+            setattr(node, attr, compile_nodelist(nodelist))
+
+def compile_nodelist(nodelist):
+    """
+    Returns a CompiledNodeList with the same nodes as nodelist, after
+    compiling the node lists nested in those nodes.
+
+    NodeList subclasses that customize rendering, such as the DebugNodeList
+    used when TEMPLATE_DEBUG is True, are returned unchanged apart from their
+    nested node lists.
+    """
+    if isinstance(nodelist, CompiledNodeList):
+        return nodelist
+    for node in nodelist:
+        if isinstance(node, Node):
+            _compile_children(node)
+    if type(nodelist) is not NodeList:
+        return nodelist
+
+    namespace = {'mark_safe': mark_safe, 'force_unicode': force_unicode}
+    items = []
+    for i, node in enumerate(nodelist):
+        name = '_%d' % i
+        if type(node) is TextNode:
+            namespace[name] = force_unicode(node.s)
+            items.append(name)
+        elif type(node) is VariableNode:
+            namespace[name] = variable_renderer(node.filter_expression)
+            items.append('%s(context)' % name)
+        elif isinstance(node, Node):
+            namespace[name] = node.render
+            items.append('force_unicode(%s(context))' % name)
+        else:
+            namespace[name] = node
+            items.append('force_unicode(%s)' % name)
+    source = ("def render(context):\n"
+              "    return mark_safe(u''.join([%s]))\n" % ', '.join(items))
+    exec compile(source, '<compiled template>', 'exec') in namespace
+
+    compiled = CompiledNodeList(nodelist)
+    compiled.contains_nontext = nodelist.contains_nontext
+    compiled._render = namespace['render']
+    return compiled
@@ -129,6 +129,17 @@ class ForNode(Node):
             yield node
 
     def render(self, context):
+        return NodeList(self._iter_render(context)).render(context)
+
+    def stream(self, context):
+        return self._iter_render(context, stream=True)
+
+    def _iter_render(self, context, stream=False):
+        """
+        Yields the output of the loop: the rendered body once per item, or
+        the body of {% empty %}. With stream=True, the bodies are streamed
+        rather than rendered in one piece.
+        """
         if 'forloop' in context:
             parentloop = context['forloop']
         else:
@@ -145,8 +156,12 @@ class ForNode(Node):
         len_values = len(values)
         if len_values < 1:
             context.pop()
-            return self.nodelist_empty.render(context)
-        nodelist = NodeList()
+            if stream:
+                for bit in self.nodelist_empty.stream(context):
+                    yield bit
+            else:
+                yield self.nodelist_empty.render(context)
+            return
         if self.is_reversed:
             values = reversed(values)
         unpack = len(self.loopvars) > 1
@@ -177,19 +192,21 @@ class ForNode(Node):
                     context.update(unpacked_vars)
             else:
                 context[self.loopvars[0]] = item
+            if stream:
+                for bit in self.nodelist_loop.stream(context):
+                    yield bit
             # In TEMPLATE_DEBUG mode provide source of the node which
             # actually raised the exception
-            if settings.TEMPLATE_DEBUG:
+            elif settings.TEMPLATE_DEBUG:
                 for node in self.nodelist_loop:
                     try:
-                        nodelist.append(node.render(context))
+                        yield node.render(context)
                     except Exception, e:
                         if not hasattr(e, 'django_template_source'):
                             e.django_template_source = node.source
                         raise
             else:
-                for node in self.nodelist_loop:
-                    nodelist.append(node.render(context))
+                yield self.nodelist_loop.render(context)
             if pop_context:
                 # The loop variables were pushed on to the context so pop them
                 # off again. This is necessary because the tag lets the length
@@ -198,7 +215,6 @@ class ForNode(Node):
                 # context.
                 context.pop()
         context.pop()
-        return nodelist.render(context)
 
 class IfChangedNode(Node):
     child_nodelists = ('nodelist_true', 'nodelist_false')
@@ -267,6 +283,22 @@ class IfNode(Node):
         return NodeList(node for _, nodelist in self.conditions_nodelists for node in nodelist)
 
     def render(self, context):
+        nodelist = self.get_matching_nodelist(context)
+        if nodelist is None:
+            return ''
+        return nodelist.render(context)
+
+    def stream(self, context):
+        nodelist = self.get_matching_nodelist(context)
+        if nodelist is None:
+            return iter([])
+        return nodelist.stream(context)
+
+    def get_matching_nodelist(self, context):
+        """
+        Returns the nodelist of the first branch whose condition is true, or
+        None if there isn't one.
+        """
         for condition, nodelist in self.conditions_nodelists:
 
             if condition is not None:           # if / elif clause
@@ -278,9 +310,9 @@ class IfNode(Node):
                 match = True
 
             if match:
-                return nodelist.render(context)
+                return nodelist
 
-        return ''
+        return None
 
 class RegroupNode(Node):
     def __init__(self, target, expression, var_name):
@@ -1,5 +1,6 @@
 from django.conf import settings
-from django.template.base import TemplateSyntaxError, Library, Node, TextNode, token_kwargs
+from django.template.base import (TemplateSyntaxError, Library, Node,
+    NodeList, TextNode, token_kwargs)
 from django.template.loader import get_template
 from django.utils.safestring import mark_safe
 
@@ -45,11 +46,17 @@ class BlockNode(Node):
         return "<Block Node: %s. Contents: %r>" % (self.name, self.nodelist)
 
     def render(self, context):
+        return NodeList(self._iter_render(context)).render(context)
+
+    def stream(self, context):
+        return self._iter_render(context, stream=True)
+
+    def _iter_render(self, context, stream=False):
         block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
         context.push()
         if block_context is None:
             context['block'] = self
-            result = self.nodelist.render(context)
+            nodelist = self.nodelist
         else:
             push = block = block_context.pop(self.name)
             if block is None:
@@ -58,11 +65,15 @@ class BlockNode(Node):
             block = BlockNode(block.name, block.nodelist)
             block.context = context
             context['block'] = block
-            result = block.nodelist.render(context)
-            if push is not None:
-                block_context.push(self.name, push)
+            nodelist = block.nodelist
+        if stream:
+            for bit in nodelist.stream(context):
+                yield bit
+        else:
+            yield nodelist.render(context)
+        if block_context is not None and push is not None:
+            block_context.push(self.name, push)
         context.pop()
-        return result
 
     def super(self):
         render_context = self.context.render_context
@@ -100,6 +111,18 @@ class ExtendsNode(Node):
         return get_template(parent)
 
     def render(self, context):
+        # Call Template._render explicitly so the parser context stays
+        # the same.
+        return self.get_compiled_parent(context)._render(context)
+
+    def stream(self, context):
+        return self.get_compiled_parent(context)._stream(context)
+
+    def get_compiled_parent(self, context):
+        """
+        Returns the parent template, after adding the blocks it should render
+        to the block context.
+        """
         compiled_parent = self.get_parent(context)
 
         if BLOCK_CONTEXT_KEY not in context.render_context:
@@ -119,10 +142,7 @@ class ExtendsNode(Node):
                                    compiled_parent.nodelist.get_nodes_by_type(BlockNode)])
                     block_context.add_blocks(blocks)
                 break
-
-        # Call Template._render explicitly so the parser context stays
-        # the same.
-        return compiled_parent._render(context)
+        return compiled_parent
 
 class BaseIncludeNode(Node):
     def __init__(self, *args, **kwargs):
@@ -143,14 +163,29 @@ class BaseIncludeNode(Node):
 class ConstantIncludeNode(BaseIncludeNode):
     def __init__(self, template_path, *args, **kwargs):
         super(ConstantIncludeNode, self).__init__(*args, **kwargs)
+        self.template_path = template_path
+        self.load_template()
+
+    def load_template(self):
         try:
-            t = get_template(template_path)
+            t = get_template(self.template_path)
             self.template = t
         except:
             if settings.TEMPLATE_DEBUG:
                 raise
             self.template = None
 
+    def __getstate__(self):
+        # Only pickle the name of the included template, which is loaded
+        # again when unpickling, so that changes to it are picked up.
+        state = self.__dict__.copy()
+        del state['template']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.load_template()
+
     def render(self, context):
         if not self.template:
             return ''
@@ -4,9 +4,30 @@ to load templates from them in order, caching the result.
 """
 
 import hashlib
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import django
+from django.conf import settings
 from django.template.base import TemplateDoesNotExist
 from django.template.loader import BaseLoader, get_template_from_string, find_template_loader, make_origin
 
+# Bump this when the pickled form of parsed templates changes in a way that
+# Django's version number doesn't capture.
+PARSED_TEMPLATE_FORMAT = 1
+
+def loads_source(loader):
+    """
+    Returns True if the given template loader is a BaseLoader that finds
+    templates with load_template_source() and doesn't customize how they're
+    parsed.
+    """
+    load_template = getattr(loader.__class__, 'load_template', None)
+    return (isinstance(loader, BaseLoader) and
+            getattr(load_template, 'im_func', None) is BaseLoader.load_template.im_func)
+
 class Loader(BaseLoader):
     is_usable = True
 
@@ -14,6 +35,7 @@ class Loader(BaseLoader):
         self.template_cache = {}
         self._loaders = loaders
         self._cached_loaders = []
+        self._parsed_template_cache = None
 
     @property
     def loaders(self):
@@ -27,15 +49,76 @@ class Loader(BaseLoader):
             self._cached_loaders = cached_loaders
         return self._cached_loaders
 
-    def find_template(self, name, dirs=None):
+    @property
+    def parsed_template_cache(self):
+        """
+        The cache where parsed templates are stored between processes, as
+        set by the TEMPLATE_CACHE_ALIAS setting, or None.
+        """
+        if settings.TEMPLATE_CACHE_ALIAS is None or settings.TEMPLATE_DEBUG:
+            return None
+        if self._parsed_template_cache is None:
+            from django.core.cache import get_cache
+            self._parsed_template_cache = get_cache(settings.TEMPLATE_CACHE_ALIAS)
+        return self._parsed_template_cache
+
+    def find_template(self, name, dirs=None, parse=True):
+        """
+        Returns the template and its origin from the first loader that has
+        it. With parse=False, the source of the template is returned instead
+        of a Template object wherever the loader allows it.
+        """
         for loader in self.loaders:
             try:
-                template, display_name = loader(name, dirs)
+                if not parse and loads_source(loader):
+                    template, display_name = loader.load_template_source(name, dirs)
+                else:
+                    template, display_name = loader(name, dirs)
                 return (template, make_origin(display_name, loader, name, dirs))
             except TemplateDoesNotExist:
                 pass
         raise TemplateDoesNotExist(name)
 
+    def parsed_template_key(self, name, source):
+        """
+        Returns the key under which the parsed form of the given template
+        source is stored, which changes with the source, the Django version
+        and the settings that affect parsing.
+        """
+        if isinstance(source, unicode):
+            source = source.encode('utf-8')
+        parts = [str(PARSED_TEMPLATE_FORMAT), django.get_version(),
+                 str(settings.TEMPLATE_COMPILE), name.encode('utf-8'),
+                 hashlib.sha1(source).hexdigest()]
+        return 'django.template.parsed.%s' % hashlib.sha1('|'.join(parts)).hexdigest()
+
+    def get_parsed_template(self, source, origin, name):
+        """
+        Returns the Template for the given source from the parsed template
+        cache, or parses it and stores the result there.
+        """
+        cache = self.parsed_template_cache
+        if cache is None:
+            return get_template_from_string(source, origin, name)
+        key = self.parsed_template_key(name, source)
+        data = cache.get(key)
+        if data is not None:
+            try:
+                return pickle.loads(data)
+            except Exception:
+                # Stale or corrupt data: parse the template again.
+                pass
+        template = get_template_from_string(source, origin, name)
+        try:
+            data = pickle.dumps(template, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Some nodes (e.g. those of tags built with Library.simple_tag)
+            # can't be pickled; such templates are only cached in memory.
+            pass
+        else:
+            cache.set(key, data)
+        return template
+
     def load_template(self, template_name, template_dirs=None):
         key = template_name
         if template_dirs:
@@ -43,10 +126,11 @@ class Loader(BaseLoader):
             key = '-'.join([template_name, hashlib.sha1('|'.join(template_dirs)).hexdigest()])
 
         if key not in self.template_cache:
-            template, origin = self.find_template(template_name, template_dirs)
+            template, origin = self.find_template(template_name, template_dirs,
+                parse=self.parsed_template_cache is None)
             if not hasattr(template, 'render'):
                 try:
-                    template = get_template_from_string(template, origin, template_name)
+                    template = self.get_parsed_template(template, origin, template_name)
                 except TemplateDoesNotExist:
                     # If compiling the template we found raises TemplateDoesNotExist,
                     # back off to returning the source and display name for the template
@@ -6,16 +6,36 @@ class ContentNotRenderedError(Exception):
     pass
 
 
+def buffer_stream(stream, buffer_size):
+    """
+    Joins the pieces from stream into chunks of at least buffer_size
+    characters (apart from the last one).
+    """
+    bits, length = [], 0
+    for bit in stream:
+        bits.append(bit)
+        length += len(bit)
+        if length >= buffer_size:
+            yield u''.join(bits)
+            bits, length = [], 0
+    if bits:
+        yield u''.join(bits)
+
+
 class SimpleTemplateResponse(HttpResponse):
     rendering_attrs = ['template_name', 'context_data', '_post_render_callbacks']
 
+    # The minimum number of characters sent at a time by streaming responses.
+    streaming_buffer_size = 8192
+
     def __init__(self, template, context=None, mimetype=None, status=None,
-            content_type=None):
+            content_type=None, streaming=False):
         # It would seem obvious to call these next two members 'template' and
         # 'context', but those names are reserved as part of the test Client
         # API. To avoid the name collision, we use tricky-to-debug problems
         self.template_name = template
         self.context_data = context
+        self.streaming = streaming
 
         self._post_render_callbacks = []
 
@@ -39,10 +59,13 @@ class SimpleTemplateResponse(HttpResponse):
         rendered, and that the pickled state only includes rendered
         data, not the data used to construct the response.
         """
-        obj_dict = self.__dict__.copy()
         if not self._is_rendered:
             raise ContentNotRenderedError('The response content must be '
                                           'rendered before it can be pickled.')
+        if self._base_content_is_iter:
+            # Consume the stream; generators can't be pickled.
+            self.content
+        obj_dict = self.__dict__.copy()
         for attr in self.rendering_attrs:
             if attr in obj_dict:
                 del obj_dict[attr]
@@ -81,6 +104,21 @@ class SimpleTemplateResponse(HttpResponse):
         content = template.render(context)
         return content
 
+    @property
+    def rendered_stream(self):
+        """Returns an iterator over the content of the response, rendered
+        as it is consumed, in chunks of at least streaming_buffer_size
+        characters.
+
+        Like rendered_content, this *does not* set the final content of
+        the response.
+        """
+        template = self.resolve_template(self.template_name)
+        context = self.resolve_context(self.context_data)
+        if not hasattr(template, 'stream'):
+            return iter([template.render(context)])
+        return buffer_stream(template.stream(context), self.streaming_buffer_size)
+
     def add_post_render_callback(self, callback):
         """Adds a new post-rendering callback.
 
@@ -101,7 +139,10 @@ class SimpleTemplateResponse(HttpResponse):
         """
         retval = self
         if not self._is_rendered:
-            self._set_content(self.rendered_content)
+            if self.streaming:
+                self._set_content(self.rendered_stream)
+            else:
+                self._set_content(self.rendered_content)
             for post_callback in self._post_render_callbacks:
                 newretval = post_callback(retval)
                 if newretval is not None:
@@ -122,7 +163,13 @@ class SimpleTemplateResponse(HttpResponse):
         if not self._is_rendered:
             raise ContentNotRenderedError('The response content must be '
                                           'rendered before it can be accessed.')
-        return super(SimpleTemplateResponse, self)._get_content()
+        content = super(SimpleTemplateResponse, self)._get_content()
+        if self._base_content_is_iter:
+            # Reading the content of a streaming response consumes the
+            # stream. Keep what it produced so that the response can still
+            # be iterated over.
+            super(SimpleTemplateResponse, self)._set_content(content)
+        return content
 
     def _set_content(self, value):
         """Sets the content for the response
@@ -138,7 +185,7 @@ class TemplateResponse(SimpleTemplateResponse):
         ['_request', '_current_app']
 
     def __init__(self, request, template, context=None, mimetype=None,
-            status=None, content_type=None, current_app=None):
+            status=None, content_type=None, current_app=None, streaming=False):
         # self.request gets over-written by django.test.client.Client - and
         # unlike context_data and template_name the _request should not
         # be considered part of the public API.
@@ -147,7 +194,7 @@ class TemplateResponse(SimpleTemplateResponse):
         # having to avoid needing to create the RequestContext directly
         self._current_app = current_app
         super(TemplateResponse, self).__init__(
-            template, context, mimetype, status, content_type)
+            template, context, mimetype, status, content_type, streaming)
 
     def resolve_context(self, context):
         """Convert context data into a full RequestContext object
@@ -62,6 +62,9 @@ def infix(bp, func):
                 # %} where 'bar' does not support 'in', so default to False
                 return False
 
+        def __reduce__(self):
+            return (_load_operator, (self.id,), self.__dict__)
+
     return Operator
 
 
@@ -84,6 +87,9 @@ def prefix(bp, func):
             except Exception:
                 return False
 
+        def __reduce__(self):
+            return (_load_operator, (self.id,), self.__dict__)
+
     return Operator
 
 
@@ -111,6 +117,14 @@ OPERATORS = {
 for key, op in OPERATORS.items():
     op.id = key
 
+def _load_operator(id):
+    """
+    Unpickles an operator. The classes created by infix() and prefix() can't
+    be pickled by reference, so operators are pickled by their id instead.
+    """
+    op = OPERATORS[id]
+    return op.__new__(op)
+
 
 class Literal(TokenBase):
     """
@@ -11,6 +11,7 @@ from django.utils.encoding import smart_str, force_unicode
 from django.utils.functional import allow_lazy
 
 ETAG_MATCH = re.compile(r'(?:W/)?"((?:\\.|[^"])*)"')
+BYTE_RANGE_MATCH = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$')
 
 MONTHS = 'jan feb mar apr may jun jul aug sep oct nov dec'.split()
 __D = r'(?P<day>\d{2})'
@@ -207,6 +208,41 @@ def quote_etag(etag):
     """
     return '"%s"' % etag.replace('\\', '\\\\').replace('"', '\\"')
 
+def parse_range_header(header, size):
+    """
+    Parses the value of a Range header for a resource of size bytes by the
+    rules in RFC 2616, section 14.35. Returns a list of (start, stop) pairs,
+    stop being excluded, for the satisfiable byte ranges, or None if the
+    header isn't a valid byte ranges specifier.
+    """
+    units, sep, specs = header.partition('=')
+    if units.strip().lower() != 'bytes' or not sep:
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        m = BYTE_RANGE_MATCH.match(spec)
+        if m is None:
+            return None
+        first, last = m.groups()
+        if not first:
+            if not last:
+                return None
+            # A suffix range: the last bytes of the resource.
+            length = int(last)
+            if length:
+                ranges.append((max(size - length, 0), size))
+            continue
+        start = int(first)
+        if last:
+            stop = int(last) + 1
+            if stop <= start:
+                return None
+        else:
+            stop = size
+        if start < size:
+            ranges.append((start, min(stop, size)))
+    return ranges
+
 if sys.version_info >= (2, 6):
     def same_origin(url1, url2):
         """
@@ -277,13 +277,54 @@ phone2numeric = allow_lazy(phone2numeric)
 
 # From http://www.xhaus.com/alan/python/httpcomp.html#gzip
 # Used with permission.
-def compress_string(s):
+def compress_string(s, compresslevel=6):
     zbuf = StringIO()
-    zfile = GzipFile(mode='wb', compresslevel=6, fileobj=zbuf)
+    zfile = GzipFile(mode='wb', compresslevel=compresslevel, fileobj=zbuf)
     zfile.write(s)
     zfile.close()
     return zbuf.getvalue()
 
+class StreamingBuffer(object):
+    """
+    A write-only file-like object whose read() method returns, and forgets,
+    what was written since the previous call.
+    """
+    def __init__(self):
+        self.vals = []
+
+    def write(self, val):
+        self.vals.append(val)
+
+    def read(self):
+        ret = ''.join(self.vals)
+        self.vals = []
+        return ret
+
+    def flush(self):
+        return
+
+    def close(self):
+        return
+
+def compress_sequence(sequence, compresslevel=6):
+    """
+    Returns a generator of the gzipped content of the strings in sequence,
+    compressed as they are produced. Each string is flushed to the output
+    before the next one is read.
+    """
+    buf = StreamingBuffer()
+    zfile = GzipFile(mode='wb', compresslevel=compresslevel, fileobj=buf)
+    # Output the gzip header right away.
+    yield buf.read()
+    for item in sequence:
+        zfile.write(item)
+        zfile.flush()
+        data = buf.read()
+        if data:
+            yield data
+    zfile.close()
+    yield buf.read()
+
 ustring_re = re.compile(u"([\u0080-\uffff])")
 
 def javascript_quote(s, quote_double_quotes=False):
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Measures how long it takes to compile typical ``filter().order_by()[:20]``
+QuerySet chains to SQL, with and without the compiled-SQL cache.
+
+Run it with the Django checkout on the Python path:
+
+    python extras/benchmarks/sql_compile.py [iterations]
+"""
+import sys
+import time
+
+from django.conf import settings
+
+settings.configure(
+    DATABASES={
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        },
+    },
+)
+
+from django.db import models
+from django.db.models.sql.compiler import compiled_sql_cache
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'benchmarks'
+
+
+class Entry(models.Model):
+    author = models.ForeignKey(Author)
+    headline = models.CharField(max_length=255)
+    pub_date = models.DateTimeField()
+    rating = models.IntegerField()
+    published = models.BooleanField()
+
+    class Meta:
+        app_label = 'benchmarks'
+        ordering = ['-pub_date']
+
+
+def build_queries(iterations):
+    queries = []
+    for n in xrange(iterations):
+        queries.append(
+            Entry.objects.filter(published=True, rating__gte=n % 5)
+            .filter(author__name__startswith='a%d' % n)
+            .exclude(headline__in=['x', 'y'])
+            .order_by('-pub_date', 'author__name')[:20].query)
+        queries.append(Entry.objects.filter(pk=n)[:20].query)
+    return queries
+
+
+def time_compilation(iterations):
+    # Building the querysets isn't part of the measurement, only turning them
+    # into SQL is.
+    queries = build_queries(iterations)
+    start = time.time()
+    for query in queries:
+        query.sql_with_params()
+    return time.time() - start
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    timings = {}
+    for enabled in (False, True):
+        compiled_sql_cache.enabled = enabled
+        compiled_sql_cache.clear()
+        timings[enabled] = min([time_compilation(iterations) for i in range(3)])
+    print "Compiling %d queries" % (iterations * 2)
+    print "  without cache: %.3fs" % timings[False]
+    print "  with cache:    %.3fs" % timings[True]
+    print "  speedup:       %.2fx" % (timings[False] / timings[True])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Measures how long it takes to resolve URLs against a large URLconf, trying
+every pattern in turn, with the prefix index (URL_RESOLVER_INDEX) and with the
+prefix index and the match cache (URL_RESOLVER_CACHE_SIZE).
+
+Run it with the Django checkout on the Python path:
+
+    python extras/benchmarks/url_resolve.py [iterations]
+"""
+import sys
+import time
+
+from django.conf import settings
+
+settings.configure(URL_RESOLVER_INDEX=False, URL_RESOLVER_CACHE_SIZE=0)
+
+from django.conf.urls import include, patterns, url
+from django.core.urlresolvers import MatchCache, RegexURLResolver
+
+SECTIONS = 30
+PATTERNS_PER_SECTION = 50
+
+
+def view(request, *args, **kwargs):
+    pass
+
+
+def build_urlconf():
+    """
+    Returns the patterns of a URLconf with SECTIONS includes of
+    PATTERNS_PER_SECTION patterns each, and a few paths to resolve.
+    """
+    urlpatterns = patterns('')
+    paths = []
+    for s in range(SECTIONS):
+        section = patterns('')
+        for p in range(PATTERNS_PER_SECTION):
+            section += patterns('',
+                url(r'^page%d/(?P<slug>[-\w]+)/(?P<pk>\d+)/$' % p, view,
+                    name='section%d-page%d' % (s, p)),
+            )
+        urlpatterns += patterns('',
+            url(r'^section%d/' % s, include(section)),
+        )
+    for s in (0, SECTIONS // 2, SECTIONS - 1):
+        for p in (0, PATTERNS_PER_SECTION // 2, PATTERNS_PER_SECTION - 1):
+            paths.append('/section%d/page%d/some-slug/%d/' % (s, p, s * p))
+    return urlpatterns, paths
+
+
+def time_resolution(resolver, paths, iterations):
+    start = time.time()
+    for i in xrange(iterations):
+        for path in paths:
+            resolver.resolve(path)
+    return time.time() - start
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    urlpatterns, paths = build_urlconf()
+    modes = (
+        ('linear scan', False, 0),
+        ('prefix index', True, 0),
+        ('index and cache', True, 1000),
+    )
+    timings = {}
+    for name, index, cache_size in modes:
+        settings.URL_RESOLVER_INDEX = index
+        resolver = RegexURLResolver(r'^/', urlpatterns)
+        if cache_size:
+            resolver.match_cache = MatchCache(cache_size)
+        timings[name] = min([time_resolution(resolver, paths, iterations)
+                             for i in range(3)])
+    print "Resolving %d URLs against %d patterns" % (
+        iterations * len(paths), SECTIONS * PATTERNS_PER_SECTION)
+    baseline = timings['linear scan']
+    for name, index, cache_size in modes:
+        print "  %-16s %.3fs (%.1fx)" % (
+            name + ':', timings[name], baseline / timings[name])
+
+
+if __name__ == '__main__':
+    main()
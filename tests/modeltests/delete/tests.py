@@ -223,12 +223,11 @@ class DeletionTests(TestCase):
             avatar=Avatar.objects.create()
         )
         a = Avatar.objects.get(pk=u.avatar_id)
-        # 1 query to find the users for the avatar.
-        # 1 query to delete the user
+        # 1 query to fast-delete the user
         # 1 query to delete the avatar
         # The important thing is that when we can defer constraint checks there
         # is no need to do an UPDATE on User.avatar to null it out.
-        self.assertNumQueries(3, a.delete)
+        self.assertNumQueries(2, a.delete)
         self.assertFalse(User.objects.exists())
         self.assertFalse(Avatar.objects.exists())
 
@@ -238,11 +237,18 @@ class DeletionTests(TestCase):
             avatar=Avatar.objects.create()
         )
         a = Avatar.objects.get(pk=u.avatar_id)
+        # Attach a signal to make sure we will not do fast_deletes.
+        calls = []
+        def noop(*args, **kwargs):
+            calls.append('')
+        models.signals.post_delete.connect(noop, sender=User)
         # 1 query to find the users for the avatar.
         # 1 query to delete the user
         # 1 query to null out user.avatar, because we can't defer the constraint
         # 1 query to delete the avatar
         self.assertNumQueries(4, a.delete)
+        models.signals.post_delete.disconnect(noop, sender=User)
+        self.assertEqual(len(calls), 1)
         self.assertFalse(User.objects.exists())
         self.assertFalse(Avatar.objects.exists())
 
@@ -253,3 +259,48 @@ class DeletionTests(TestCase):
 
         r.delete()
         self.assertEqual(HiddenUserProfile.objects.count(), 0)
+
+
+class FastDeleteTests(TestCase):
+    def test_fast_delete_qs(self):
+        u1 = User.objects.create()
+        u2 = User.objects.create()
+        self.assertNumQueries(1, User.objects.filter(pk=u1.pk).delete)
+        self.assertEqual(User.objects.count(), 1)
+        self.assertTrue(User.objects.filter(pk=u2.pk).exists())
+
+    def test_fast_delete_all(self):
+        User.objects.create()
+        User.objects.create()
+        self.assertNumQueries(1, User.objects.all().delete)
+        self.assertFalse(User.objects.exists())
+
+    def test_fast_delete_joined_qs(self):
+        a = Avatar.objects.create()
+        User.objects.create(avatar=a)
+        u2 = User.objects.create()
+        self.assertNumQueries(1, User.objects.filter(avatar__pk=a.pk).delete)
+        self.assertEqual(list(User.objects.all()), [u2])
+
+    def test_fast_delete_cascade(self):
+        a = Avatar.objects.create()
+        User.objects.create(avatar=a)
+        User.objects.create(avatar=a)
+        # 1 query to fetch the avatar, 1 to fast-delete its users and 1 to
+        # delete the avatar.
+        self.assertNumQueries(3, Avatar.objects.all().delete)
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Avatar.objects.exists())
+
+    def test_no_fast_delete_with_signals(self):
+        deleted = []
+        def log_delete(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+        models.signals.pre_delete.connect(log_delete, sender=User)
+        try:
+            u = User.objects.create()
+            User.objects.all().delete()
+        finally:
+            models.signals.pre_delete.disconnect(log_delete, sender=User)
+        self.assertEqual(deleted, [u.pk])
+        self.assertFalse(User.objects.exists())
@@ -1,13 +1,14 @@
-from __future__ import absolute_import
+from __future__ import with_statement, absolute_import
 
 import StringIO
 
 from django.contrib.sites.models import Site
-from django.core import management
-from django.db import connection
+from django.core import management, serializers
+from django.core.management.commands.loaddata import BulkLoader
+from django.db import connection, DEFAULT_DB_ALIAS
 from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
 
-from .models import Article, Book, Spy, Tag, Visa
+from .models import Article, Blog, Book, Person, Spy, Tag, Visa
 
 
 class TestCaseFixtureLoadingTests(TestCase):
@@ -198,6 +199,36 @@ class FixtureLoadingTests(TestCase):
                           '',
                           exclude_list=['fixtures.FooModel'])
 
+    def test_dumpdata_server_side(self):
+        book = Book.objects.create(name='Music for all ages')
+        book.authors.add(Person.objects.create(name='Django Reinhardt'),
+                         Person.objects.create(name='Stephane Grappelli'))
+        output = '[{"pk": 10, "model": "fixtures.book", "fields": {"name": "Achieving self-awareness of Python programs", "authors": []}}, {"pk": 11, "model": "fixtures.book", "fields": {"name": "Music for all ages", "authors": [["Django Reinhardt"], ["Stephane Grappelli"]]}}]'
+        features = connection.features
+        old_server_side_cursor = connection.server_side_cursor
+        old_features = (features.can_use_server_side_cursors,
+                        features.allows_queries_during_server_side_reads)
+        calls = []
+        def server_side_cursor():
+            calls.append(True)
+            return old_server_side_cursor()
+        connection.server_side_cursor = server_side_cursor
+        try:
+            features.can_use_server_side_cursors = True
+            # Serializing the many-to-many relations runs queries, so the
+            # rows aren't read through a server-side cursor unless the
+            # backend allows that.
+            features.allows_queries_during_server_side_reads = False
+            self._dumpdata_assert(['fixtures.book'], output, natural_keys=True)
+            self.assertEqual(calls, [])
+            features.allows_queries_during_server_side_reads = True
+            self._dumpdata_assert(['fixtures.book'], output, natural_keys=True)
+            self.assertEqual(calls, [True])
+        finally:
+            connection.server_side_cursor = old_server_side_cursor
+            (features.can_use_server_side_cursors,
+             features.allows_queries_during_server_side_reads) = old_features
+
     def test_dumpdata_with_filtering_manager(self):
         spy1 = Spy.objects.create(name='Paul')
         spy2 = Spy.objects.create(name='Alex', cover_blown=True)
@@ -298,6 +329,69 @@ class FixtureLoadingTests(TestCase):
         self._dumpdata_assert(['fixtures'], """<?xml version="1.0" encoding="utf-8"?>
 <django-objects version="1.0"><object pk="1" model="fixtures.category"><field type="CharField" name="title">News Stories</field><field type="TextField" name="description">Latest news stories</field></object><object pk="3" model="fixtures.article"><field type="CharField" name="headline">Time to reform copyright</field><field type="DateTimeField" name="pub_date">2006-06-16T13:00:00</field></object><object pk="2" model="fixtures.article"><field type="CharField" name="headline">Poker has no place on ESPN</field><field type="DateTimeField" name="pub_date">2006-06-16T12:00:00</field></object><object pk="1" model="fixtures.tag"><field type="CharField" name="name">copyright</field><field to="contenttypes.contenttype" name="tagged_type" rel="ManyToOneRel"><natural>fixtures</natural><natural>article</natural></field><field type="PositiveIntegerField" name="tagged_id">3</field></object><object pk="2" model="fixtures.tag"><field type="CharField" name="name">law</field><field to="contenttypes.contenttype" name="tagged_type" rel="ManyToOneRel"><natural>fixtures</natural><natural>article</natural></field><field type="PositiveIntegerField" name="tagged_id">3</field></object><object pk="1" model="fixtures.person"><field type="CharField" name="name">Django Reinhardt</field></object><object pk="3" model="fixtures.person"><field type="CharField" name="name">Prince</field></object><object pk="2" model="fixtures.person"><field type="CharField" name="name">Stephane Grappelli</field></object><object pk="10" model="fixtures.book"><field type="CharField" name="name">Achieving self-awareness of Python programs</field><field to="fixtures.person" name="authors" rel="ManyToManyRel"></field></object></django-objects>""", format='xml', natural_keys=True)
 
+class BulkLoadingTests(TestCase):
+
+    def test_bulk_loading(self):
+        management.call_command('loaddata', 'fixture10.json', verbosity=0,
+                                commit=False, bulk=True)
+        self.assertQuerysetEqual(Article.objects.all(), [
+            '<Article: Django conquers world!>',
+            '<Article: Copyright is fine the way it is>',
+            '<Article: Poker has no place on ESPN>',
+        ])
+        self.assertQuerysetEqual(Blog.objects.get(pk=1).articles.order_by('pk'), [
+            '<Article: Django conquers world!>',
+            '<Article: Copyright is fine the way it is>',
+        ])
+        self.assertQuerysetEqual(Blog.objects.get(pk=2).articles.all(), [
+            '<Article: Poker has no place on ESPN>',
+        ])
+        self.assertQuerysetEqual(Visa.objects.all(), [
+            '<Visa: Django Reinhardt Can add user, Can change user>',
+        ])
+        self.assertQuerysetEqual(Book.objects.all(), [
+            '<Book: Achieving self-awareness of Python programs>',
+            '<Book: Music for all ages by Django Reinhardt>',
+        ])
+
+        # Loading the fixture again updates the existing rows.
+        Article.objects.filter(pk=1).update(headline='Changed')
+        management.call_command('loaddata', 'fixture10.json', verbosity=0,
+                                commit=False, bulk=True)
+        self.assertEqual(Article.objects.count(), 3)
+        self.assertEqual(Article.objects.get(pk=1).headline, 'Django conquers world!')
+        self.assertEqual(Blog.objects.get(pk=1).articles.count(), 2)
+
+    def test_batched_inserts(self):
+        objects = serializers.deserialize('json', """[
+            {"pk": 1, "model": "fixtures.article", "fields": {"headline": "One", "pub_date": "2006-06-16 15:00:00"}},
+            {"pk": 2, "model": "fixtures.article", "fields": {"headline": "Two", "pub_date": "2006-06-16 14:00:00"}},
+            {"pk": 3, "model": "fixtures.article", "fields": {"headline": "Three", "pub_date": "2006-06-16 13:00:00"}},
+            {"pk": 1, "model": "fixtures.blog", "fields": {"name": "A", "featured": 1, "articles": [1, 2, 3]}},
+            {"pk": 2, "model": "fixtures.blog", "fields": {"name": "B", "featured": 2, "articles": [2]}}
+        ]""")
+        loader = BulkLoader(DEFAULT_DB_ALIAS)
+        # For each model, one query to find the existing rows and one INSERT,
+        # plus one INSERT for the many-to-many rows.
+        with self.assertNumQueries(5):
+            for obj in objects:
+                loader.save(obj)
+            loader.flush()
+        self.assertEqual(Article.objects.count(), 3)
+        self.assertEqual(Blog.articles.through.objects.count(), 4)
+
+    def test_repeated_objects(self):
+        objects = serializers.deserialize('json', """[
+            {"pk": 1, "model": "fixtures.article", "fields": {"headline": "One", "pub_date": "2006-06-16 15:00:00"}},
+            {"pk": 1, "model": "fixtures.article", "fields": {"headline": "Two", "pub_date": "2006-06-16 14:00:00"}}
+        ]""")
+        loader = BulkLoader(DEFAULT_DB_ALIAS)
+        for obj in objects:
+            loader.save(obj)
+        loader.flush()
+        self.assertQuerysetEqual(Article.objects.all(), ['<Article: Two>'])
+
+
 class FixtureTransactionTests(TransactionTestCase):
     def _dumpdata_assert(self, args, output, format='json'):
         new_io = StringIO.StringIO()
@@ -125,6 +125,16 @@ class Bookmark(models.Model):
     tags = generic.GenericRelation(TaggedItem)
 
 
+class Comment(models.Model):
+    comment = models.TextField()
+
+    # Content-object field, with a text object id
+    content_type = models.ForeignKey(ContentType)
+    object_pk = models.TextField()
+    content_object = generic.GenericForeignKey(ct_field="content_type",
+                                               fk_field="object_pk")
+
+
 ## Models for lookup ordering tests
 
 
@@ -1,11 +1,13 @@
 from __future__ import with_statement, absolute_import
 
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Prefetch
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from .models import (Author, Book, Reader, Qualification, Teacher, Department,
     TaggedItem, Bookmark, AuthorAddress, FavoriteAuthors, AuthorWithAge,
-    BookWithYear, Person, House, Room, Employee)
+    BookWithYear, Person, House, Room, Employee, Comment)
 
 
 class PrefetchRelatedTests(TestCase):
@@ -290,6 +292,37 @@ class GenericRelationTests(TestCase):
         self.assertEqual(result,
                          [t.created_by for t in TaggedItem.objects.all()])
 
+    def test_prefetch_GFK_text_pk(self):
+        book = Book.objects.create(title="Poems")
+        Comment.objects.create(comment="awesome", content_object=book)
+        Comment.objects.create(comment="great", content_object=self.reader1)
+
+        # 1 for Comment table, 1 for Book table, 1 for Reader table
+        with self.assertNumQueries(3):
+            objs = [c.content_object for c in
+                    Comment.objects.order_by('pk').prefetch_related('content_object')]
+        self.assertEqual(objs, [book, self.reader1])
+
+    def test_traverse_GFK_mixed_models(self):
+        book = BookWithYear.objects.create(title="Poems", published_year=2010)
+        book.read_by.add(self.reader3)
+        TaggedItem.objects.create(tag="awesome", content_object=self.book1)
+        TaggedItem.objects.create(tag="awesome", content_object=book)
+
+        # 1 for TaggedItem, 1 each for the Book and BookWithYear tables, and
+        # 1 each for their 'read_by' relations.
+        with self.assertNumQueries(5):
+            qs = TaggedItem.objects.order_by('pk').prefetch_related('content_object__read_by')
+            readers = [sorted([r.name for r in tag.content_object.read_by.all()])
+                       for tag in qs]
+        self.assertEqual(readers, [["me", "you"], ["someone"]])
+
+    def test_custom_queryset_GFK(self):
+        TaggedItem.objects.create(tag="awesome", content_object=self.book1)
+        qs = TaggedItem.objects.prefetch_related(
+            Prefetch('content_object', queryset=Book.objects.all()))
+        self.assertRaises(ValueError, list, qs)
+
     def test_generic_relation(self):
         b = Bookmark.objects.create(url='http://www.djangoproject.com/')
         t1 = TaggedItem.objects.create(content_object=b, tag='django')
@@ -301,6 +334,56 @@ class GenericRelationTests(TestCase):
             self.assertEqual(sorted(tags), ["django", "python"])
 
 
+class CustomPrefetchTests(TestCase):
+    def setUp(self):
+        self.book1 = Book.objects.create(title="Poems")
+        self.book2 = Book.objects.create(title="Jane Eyre")
+        self.author1 = Author.objects.create(name="Charlotte",
+                                             first_book=self.book1)
+        self.author2 = Author.objects.create(name="Anne",
+                                             first_book=self.book1)
+        self.book1.authors.add(self.author1, self.author2)
+        self.book2.authors.add(self.author1)
+        self.reader = Reader.objects.create(name="Amy")
+        self.reader.books_read.add(self.book1, self.book2)
+
+    def test_custom_queryset(self):
+        with self.assertNumQueries(2):
+            books = Book.objects.order_by('pk').prefetch_related(
+                Prefetch('authors', queryset=Author.objects.filter(name="Anne")))
+            authors = [[a.name for a in b.authors.all()] for b in books]
+        self.assertEqual(authors, [[u"Anne"], []])
+
+    def test_custom_queryset_nested(self):
+        with self.assertNumQueries(3):
+            readers = Reader.objects.prefetch_related(
+                'books_read',
+                Prefetch('books_read__authors',
+                         queryset=Author.objects.order_by('-name')))
+            authors = sorted([[a.name for a in b.authors.all()]
+                              for r in readers for b in r.books_read.all()])
+        self.assertEqual(authors, [[u"Charlotte"], [u"Charlotte", u"Anne"]])
+
+    def test_custom_queryset_seen_twice(self):
+        qs = Book.objects.prefetch_related(
+            'authors',
+            Prefetch('authors', queryset=Author.objects.filter(name="Anne")))
+        self.assertRaises(ValueError, list, qs)
+
+    def test_prefetch_stats(self):
+        qs = Reader.objects.prefetch_related('books_read__authors')
+        list(qs)
+        self.assertEqual(qs.prefetch_stats, None)
+
+        with override_settings(DEBUG=True):
+            qs = Reader.objects.prefetch_related('books_read__authors')
+            list(qs)
+        self.assertEqual(qs.prefetch_stats, {
+            'books_read': {'instances': 1, 'queries': 1, 'saved': 0},
+            'books_read__authors': {'instances': 2, 'queries': 1, 'saved': 1},
+        })
+
+
 class MultiTableInheritanceTest(TestCase):
 
     def setUp(self):
@@ -9,6 +9,7 @@ from StringIO import StringIO
 
 from django.conf import settings
 from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder, iter_json_list
 from django.db import transaction, connection
 from django.test import TestCase, TransactionTestCase, Approximate
 from django.utils import simplejson, unittest
@@ -379,6 +380,47 @@ class JsonSerializerTestCase(SerializersTestBase, TestCase):
                 ret_list.append(obj_dict["fields"][field_name])
         return ret_list
 
+    def test_streamed_output(self):
+        """
+        Objects are written one at a time, with the same output as dumping
+        the list of all the objects.
+        """
+        python_objects = serializers.serialize("python", Article.objects.all())
+        for options in ({}, {'indent': 0}, {'indent': 2}, {'sort_keys': True}):
+            self.assertEqual(
+                serializers.serialize("json", Article.objects.all(), **options),
+                simplejson.dumps(python_objects, cls=DjangoJSONEncoder, **options))
+            self.assertEqual(
+                serializers.serialize("json", Article.objects.none(), **options),
+                simplejson.dumps([], **options))
+
+    def test_streamed_input(self):
+        """
+        The deserializer doesn't read the whole stream at once.
+        """
+        serial_str = serializers.serialize("json", Article.objects.all(), indent=2)
+        stream = StringIO(serial_str)
+        read_sizes = []
+        def read(size=-1):
+            read_sizes.append(size)
+            return StringIO.read(stream, size)
+        stream.read = read
+        objects = serializers.deserialize("json", stream)
+        obj = objects.next()
+        self.assertEqual(obj.object.headline, "Poker has no place on ESPN")
+        self.assertTrue(-1 not in read_sizes)
+        self.assertEqual(len(list(objects)), 1)
+
+    def test_iter_json_list(self):
+        data = '[{"pk": 1, "fields": {"name": "\\u00e9t\xc3\xa9"}}, 12345 , [1, [2]], "a\\"]"]  '
+        for read_size in (1, 2, 7, 64 * 1024):
+            self.assertEqual(list(iter_json_list(StringIO(data), read_size)),
+                             simplejson.loads(data))
+        for data in ('', '{}', '[1', '[1 2]', '[1] x', '[1,]', '[{"a": 1}'):
+            self.assertRaises(ValueError, list, iter_json_list(StringIO(data), 2))
+            self.assertRaises(serializers.base.DeserializationError, list,
+                              serializers.deserialize("json", data))
+
 class JsonSerializerTransactionTestCase(SerializersTransactionTestBase, TransactionTestCase):
     serializer_name = "json"
     fwd_ref_str = """[
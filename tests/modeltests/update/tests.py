@@ -1,5 +1,6 @@
-from __future__ import absolute_import
+from __future__ import with_statement, absolute_import
 
+from django.core.exceptions import FieldError
 from django.test import TestCase
 
 from .models import A, B, C, D, DataPoint, RelatedPoint
@@ -116,3 +117,78 @@ class AdvancedTests(TestCase):
         method = DataPoint.objects.all()[:2].update
         self.assertRaises(AssertionError, method,
             another_value='another thing')
+
+
+class BulkUpdateTests(TestCase):
+    def setUp(self):
+        self.points = [
+            DataPoint.objects.create(name="d%d" % i, value="v%d" % i)
+            for i in range(5)
+        ]
+
+    def test_bulk_update(self):
+        for point in self.points:
+            point.value = point.name.upper()
+            point.another_value = "other %s" % point.name
+        with self.assertNumQueries(1):
+            rows = DataPoint.objects.bulk_update(self.points,
+                                                 ["value", "another_value"])
+        self.assertEqual(rows, 5)
+        self.assertEqual(
+            list(DataPoint.objects.order_by("name").values_list(
+                "value", "another_value")),
+            [(u"D%d" % i, u"other d%d" % i) for i in range(5)])
+
+    def test_batch_size(self):
+        for point in self.points:
+            point.value = "new"
+        with self.assertNumQueries(3):
+            DataPoint.objects.bulk_update(self.points, ["value"], batch_size=2)
+        self.assertEqual(DataPoint.objects.filter(value="new").count(), 5)
+
+    def test_only_given_objects_and_fields(self):
+        self.points[0].value = "changed"
+        self.points[0].name = "ignored"
+        self.points[1].value = "not saved"
+        DataPoint.objects.bulk_update(self.points[:1], ["value"])
+        self.assertEqual(
+            list(DataPoint.objects.order_by("pk").values_list("name", "value")),
+            [(u"d0", u"changed")] + [(u"d%d" % i, u"v%d" % i) for i in range(1, 5)])
+
+    def test_respects_filters(self):
+        for point in self.points:
+            point.value = "new"
+        rows = DataPoint.objects.filter(name__in=["d1", "d2"]).bulk_update(
+            self.points, ["value"])
+        self.assertEqual(rows, 2)
+        self.assertEqual(
+            sorted(DataPoint.objects.filter(value="new").values_list("name", flat=True)),
+            [u"d1", u"d2"])
+
+    def test_foreign_key(self):
+        r1 = RelatedPoint.objects.create(name="r1", data=self.points[0])
+        r2 = RelatedPoint.objects.create(name="r2", data=self.points[0])
+        r1.data = self.points[1]
+        r2.data = self.points[2]
+        RelatedPoint.objects.bulk_update([r1, r2], ["data"])
+        self.assertEqual(RelatedPoint.objects.get(name="r1").data, self.points[1])
+        self.assertEqual(RelatedPoint.objects.get(name="r2").data, self.points[2])
+
+    def test_inherited_fields(self):
+        a = A.objects.create()
+        objs = [D.objects.create(a=a, y=i) for i in range(3)]
+        for obj in objs:
+            obj.y = obj.y * 10
+        rows = D.objects.bulk_update(objs, ["y"])
+        self.assertEqual(rows, 3)
+        self.assertEqual(sorted(D.objects.values_list("y", flat=True)),
+                         [0, 10, 20])
+
+    def test_errors(self):
+        self.assertRaises(ValueError, DataPoint.objects.bulk_update,
+                          self.points, [])
+        self.assertRaises(ValueError, DataPoint.objects.bulk_update,
+                          [DataPoint(name="unsaved")], ["name"])
+        self.assertRaises(FieldError, DataPoint.objects.bulk_update,
+                          self.points, ["id"])
+        self.assertEqual(DataPoint.objects.bulk_update([], ["value"]), 0)
@@ -3,6 +3,8 @@
 from __future__ import with_statement, absolute_import
 
 import datetime
+import os
+import tempfile
 import threading
 
 from django.conf import settings
@@ -294,6 +296,92 @@ class ConnectionCreatedSignalTest(TestCase):
         self.assertTrue(data == {})
 
 
+class PersistentConnectionTests(TestCase):
+    def setUp(self):
+        # Use a throwaway database file so the test database isn't affected
+        # (in-memory SQLite databases ignore close()).
+        fd, self.db_name = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.db_name)
+
+    def make_connection(self, **settings):
+        settings_dict = connection.settings_dict.copy()
+        settings_dict.update(NAME=self.db_name, **settings)
+        backend = load_backend(settings_dict['ENGINE'])
+        return backend.DatabaseWrapper(settings_dict, alias='persistent')
+
+    @unittest.skipUnless(connection.vendor == 'sqlite',
+                         "Uses a throwaway SQLite database")
+    def test_closed_at_end_of_request_by_default(self):
+        conn = self.make_connection(CONN_MAX_AGE=0)
+        conn.cursor()
+        conn.close_if_unusable_or_obsolete()
+        self.assertEqual(conn.connection, None)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite',
+                         "Uses a throwaway SQLite database")
+    def test_reused_until_max_age(self):
+        conn = self.make_connection(CONN_MAX_AGE=None)
+        conn.cursor()
+        raw_connection = conn.connection
+        conn.close_if_unusable_or_obsolete()
+        self.assertTrue(conn.connection is raw_connection)
+        self.assertEqual(conn.close_at, None)
+
+        conn = self.make_connection(CONN_MAX_AGE=60)
+        conn.cursor()
+        conn.close_if_unusable_or_obsolete()
+        self.assertNotEqual(conn.connection, None)
+        conn.close_at -= 60
+        conn.close_if_unusable_or_obsolete()
+        self.assertEqual(conn.connection, None)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite',
+                         "Uses a throwaway SQLite database")
+    def test_closed_inside_transaction_management(self):
+        conn = self.make_connection(CONN_MAX_AGE=None)
+        conn.cursor()
+        conn.enter_transaction_management()
+        conn.close_if_unusable_or_obsolete()
+        self.assertEqual(conn.connection, None)
+        conn.leave_transaction_management()
+
+    @unittest.skipUnless(connection.vendor == 'sqlite',
+                         "Uses a throwaway SQLite database")
+    def test_connection_pool(self):
+        conn1 = self.make_connection(CONN_MAX_AGE=None, CONN_POOL_SIZE=1)
+        conn2 = self.make_connection(CONN_MAX_AGE=None, CONN_POOL_SIZE=1)
+        # SQLite doesn't support pooling between threads, but wrappers in
+        # the same thread can share a connection.
+        conn1.features.supports_connection_pooling = True
+        conn2.features.supports_connection_pooling = True
+        try:
+            conn1.cursor()
+            raw_connection = conn1.connection
+            conn1.close_if_unusable_or_obsolete()
+            self.assertEqual(conn1.connection, None)
+            conn2.cursor()
+            self.assertTrue(conn2.connection is raw_connection)
+
+            # A full pool closes released connections.
+            conn1.cursor()
+            conn2.close_if_unusable_or_obsolete()
+            conn1.close_if_unusable_or_obsolete()
+            self.assertEqual(len(conn1._get_connection_pool()), 1)
+
+            # Broken connections are discarded on checkout.
+            conn2.is_usable = lambda: False
+            conn2.cursor()
+            self.assertFalse(conn2.connection is raw_connection)
+            self.assertEqual(len(conn2._get_connection_pool()), 0)
+        finally:
+            conn1.close_pooled_connections()
+            conn1.close()
+            conn2.close()
+
+
 class EscapingChecks(TestCase):
 
     @unittest.skipUnless(connection.vendor == 'sqlite',
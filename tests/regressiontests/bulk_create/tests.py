@@ -2,6 +2,7 @@ from __future__ import with_statement, absolute_import
 
 from operator import attrgetter
 
+from django.db import connection
 from django.test import TestCase, skipUnlessDBFeature
 
 from .models import Country, Restaurant, Pizzeria, State
@@ -56,4 +57,43 @@ class BulkCreateTests(TestCase):
             ])
         self.assertQuerysetEqual(State.objects.order_by("two_letter_code"), [
             "CA", "IL", "ME", "NY",
-        ], attrgetter("two_letter_code"))
\ No newline at end of file
+        ], attrgetter("two_letter_code"))
+
+    def test_large_batch(self):
+        # More objects than SQLite accepts parameters for in one query.
+        Country.objects.bulk_create([
+            Country(name="Country %s" % i, iso_two_letter="XX")
+            for i in range(1001)
+        ])
+        self.assertEqual(Country.objects.count(), 1001)
+
+    def test_explicit_batch_size(self):
+        objs = [Country(name="Country %s" % i, iso_two_letter="XX")
+                for i in range(4)]
+        with self.assertNumQueries(2):
+            Country.objects.bulk_create(objs, batch_size=2)
+        self.assertEqual(Country.objects.count(), 4)
+
+    @skipUnlessDBFeature("has_bulk_insert")
+    def test_batch_size_limited_by_backend(self):
+        objs = [State(two_letter_code="%02d" % i) for i in range(10)]
+        # Pretend the backend can only insert 3 rows in one statement.
+        connection.ops.bulk_batch_size = lambda fields, objs: 3
+        try:
+            with self.assertNumQueries(4):
+                State.objects.bulk_create(objs, batch_size=100)
+        finally:
+            del connection.ops.bulk_batch_size
+        self.assertEqual(State.objects.count(), 10)
+
+    @skipUnlessDBFeature("can_return_ids_from_bulk_insert")
+    def test_set_pk_and_state(self):
+        countries = Country.objects.bulk_create(self.data, batch_size=3)
+        self.assertEqual(
+            sorted([c.pk for c in countries]),
+            sorted(Country.objects.values_list("pk", flat=True)))
+        self.assertEqual(Country.objects.get(pk=countries[1].pk).name,
+                         "The Netherlands")
+        for country in countries:
+            self.assertEqual(country._state.db, "default")
+            self.assertFalse(country._state.adding)
@@ -391,6 +391,14 @@ class BaseCacheTests(object):
         self.assertEqual(self.cache.get("key1"), "spam")
         self.assertEqual(self.cache.get("key2"), "eggs")
 
+    def test_set_many_returns_failing_keys(self):
+        # set_many returns the keys it couldn't store, if any
+        self.assertEqual(self.cache.set_many({"key1": "spam", "key2": "eggs"}), [])
+        # Overwriting existing keys works too
+        self.assertEqual(self.cache.set_many({"key1": "ham", "key3": "eggs"}), [])
+        self.assertEqual(self.cache.get_many(["key1", "key2", "key3"]),
+                         {"key1": "ham", "key2": "eggs", "key3": "eggs"})
+
     def test_set_many_expiration(self):
         # set_many takes a second ``timeout`` parameter
         self.cache.set_many({"key1": "spam", "key2": "eggs"}, 1)
@@ -818,6 +826,37 @@ class DBCacheTests(BaseCacheTests, TransactionTestCase):
         self.cache = get_cache('db://%s?max_entries=30&cull_frequency=0' % self._table_name)
         self.perform_cull_test(50, 18)
 
+    def test_get_many_num_queries(self):
+        self.cache.set_many({'a': 1, 'b': 2})
+        self.cache.set('expired', 'expired', -1)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cache.get_many(['a', 'b']), {'a': 1, 'b': 2})
+        # Expired keys are removed with a single extra query
+        with self.assertNumQueries(2):
+            self.assertEqual(self.cache.get_many(['a', 'b', 'expired']), {'a': 1, 'b': 2})
+
+    def test_set_many_num_queries(self):
+        self.cache.set('a', 'spam')
+        # Count, select existing keys, update, insert
+        with self.assertNumQueries(4):
+            self.cache.set_many({'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2, 'c': 3})
+
+    def test_delete_many_num_queries(self):
+        self.cache.set_many({'a': 1, 'b': 2, 'c': 3})
+        with self.assertNumQueries(1):
+            self.cache.delete_many(['a', 'b'])
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'c': 3})
+
+    def test_many_keys(self):
+        # More keys than fit in a single query on some backends
+        cache = get_cache(self.backend_name, LOCATION=self._table_name, OPTIONS={'MAX_ENTRIES': 2000})
+        data = dict(('key%d' % i, i) for i in range(1200))
+        self.assertEqual(cache.set_many(data), [])
+        self.assertEqual(cache.get_many(data.keys()), data)
+        cache.delete_many(data.keys())
+        self.assertEqual(cache.get_many(data.keys()), {})
+
     def test_second_call_doesnt_crash(self):
         err = StringIO.StringIO()
         management.call_command('createcachetable', self._table_name, verbosity=0, interactive=False, stderr=err)
@@ -923,6 +962,80 @@ class LocMemCacheTests(unittest.TestCase, BaseCacheTests):
         self.cache.decr(key)
         self.assertEqual(expire, self.cache._expire_info[_key])
 
+class ShardedLocMemCacheTests(unittest.TestCase, BaseCacheTests):
+    backend_name = 'django.core.cache.backends.locmem.ShardedLocMemCache'
+
+    def setUp(self):
+        self.cache = get_cache(self.backend_name, LOCATION='sharded', OPTIONS={'MAX_ENTRIES': 30})
+        self.prefix_cache = get_cache(self.backend_name, LOCATION='sharded', KEY_PREFIX='cacheprefix')
+        self.v2_cache = get_cache(self.backend_name, LOCATION='sharded', VERSION=2)
+        self.custom_key_cache = get_cache(self.backend_name, LOCATION='sharded', OPTIONS={'MAX_ENTRIES': 30}, KEY_FUNCTION=custom_key_func)
+        self.custom_key_cache2 = get_cache(self.backend_name, LOCATION='sharded', OPTIONS={'MAX_ENTRIES': 30}, KEY_FUNCTION='regressiontests.cache.tests.custom_key_func')
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_cull(self):
+        # A single shard evicts exactly one entry for each one added once
+        # it's full.
+        self.cache = get_cache(self.backend_name, LOCATION='sharded-cull', OPTIONS={'MAX_ENTRIES': 30, 'SHARDS': 1})
+        self.perform_cull_test(50, 30)
+
+    def test_zero_cull(self):
+        self.cache = get_cache(self.backend_name, LOCATION='sharded-cull', OPTIONS={'MAX_ENTRIES': 30, 'SHARDS': 1, 'CULL_FREQUENCY': 0})
+        self.perform_cull_test(50, 19)
+
+    def test_lru_eviction(self):
+        cache = get_cache(self.backend_name, LOCATION='sharded-lru', OPTIONS={'MAX_ENTRIES': 3, 'SHARDS': 1})
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+        # Reading 'a' makes 'b' the least recently used key
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('d', 4)
+        self.assertEqual(cache.get_many(['a', 'b', 'c', 'd']), {'a': 1, 'c': 3, 'd': 4})
+        cache.clear()
+
+    def test_shards(self):
+        cache = get_cache(self.backend_name, LOCATION='sharded-shards', OPTIONS={'SHARDS': 4})
+        self.assertEqual(len(cache._shards), 4)
+        data = dict(('key%d' % i, i) for i in range(100))
+        cache.set_many(data)
+        self.assertEqual(cache.get_many(data.keys()), data)
+        self.assertTrue(len([shard for shard in cache._shards if shard.map]) > 1)
+        cache.delete_many(data.keys())
+        self.assertEqual(cache.get_many(data.keys()), {})
+
+    def test_stats(self):
+        cache = get_cache(self.backend_name, LOCATION='sharded-stats', OPTIONS={'MAX_ENTRIES': 2, 'SHARDS': 1})
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('missing')
+        cache.get_many(['a', 'missing'])
+        cache.set('b', 2)
+        cache.set('c', 3)
+        self.assertEqual(cache.stats(), {'entries': 2, 'hits': 2, 'misses': 2, 'evictions': 1})
+        cache.clear()
+
+    def test_no_pickle(self):
+        cache = get_cache(self.backend_name, LOCATION='sharded-nopickle', OPTIONS={'PICKLE': False})
+        value = (1, 2, 3)
+        cache.set('a', value)
+        self.assertTrue(cache.get('a') is value)
+        # Unpicklable values can be stored too
+        cache.set('f', f)
+        self.assertTrue(cache.get('f') is f)
+        cache.set('n', 1)
+        self.assertEqual(cache.incr('n'), 2)
+        self.assertEqual(cache.get('n'), 2)
+        cache.clear()
+
+    def test_pickle(self):
+        value = [1, 2, 3]
+        self.cache.set('a', value)
+        value.append(4)
+        self.assertEqual(self.cache.get('a'), [1, 2, 3])
+
 # memcached backend isn't guaranteed to be available.
 # To check the memcached backend, the test settings file will
 # need to contain a cache backend setting that points at
@@ -1,9 +1,36 @@
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.timing import MemoryCollector
 from django.core.handlers.wsgi import WSGIHandler
+from django.http import FileResponse, HttpResponse
 from django.test import RequestFactory
+from django.test.utils import override_settings
 from django.utils import unittest
 
 
+class ShortCircuitMiddleware(object):
+    def process_request(self, request):
+        return HttpResponse('Short circuit')
+
+    def process_response(self, request, response):
+        return response
+
+
+class ViewMiddleware(object):
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        pass
+
+
+collector = MemoryCollector()
+
+
+class OldStyleCollector:
+    calls = []
+
+    def record(self, request, phase, name, duration):
+        self.calls.append(phase)
+
+
 class HandlerTests(unittest.TestCase):
 
     def test_lock_safety(self):
@@ -25,6 +52,28 @@ class HandlerTests(unittest.TestCase):
         # Reset settings
         settings.MIDDLEWARE_CLASSES = old_middleware_classes
 
+    def test_file_wrapper(self):
+        class FileWrapper(object):
+            def __init__(self, file_obj, block_size):
+                self.file_obj = file_obj
+                self.block_size = block_size
+
+        old_middleware_classes = settings.MIDDLEWARE_CLASSES
+        settings.MIDDLEWARE_CLASSES = ()
+        try:
+            handler = WSGIHandler()
+            handler.get_response = lambda request: FileResponse(
+                open(__file__, 'rb'))
+            environ = RequestFactory().get('/').environ
+            environ['wsgi.file_wrapper'] = FileWrapper
+            response = handler(environ, lambda *a, **k: None)
+            self.assertTrue(isinstance(response, FileWrapper))
+            self.assertEqual(response.file_obj.name, __file__)
+            self.assertEqual(response.block_size, FileResponse.block_size)
+            response.file_obj.close()
+        finally:
+            settings.MIDDLEWARE_CLASSES = old_middleware_classes
+
     def test_bad_path_info(self):
         """Tests for bug #15672 ('request' referenced before assignment)"""
         environ = RequestFactory().get('/').environ
@@ -32,3 +81,65 @@ class HandlerTests(unittest.TestCase):
         handler = WSGIHandler()
         response = handler(environ, lambda *a, **k: None)
         self.assertEqual(response.status_code, 400)
+
+
+class MiddlewareTimingTests(unittest.TestCase):
+
+    def setUp(self):
+        collector.reset()
+
+    def get_response(self, handler):
+        environ = RequestFactory().get('/').environ
+        return handler(environ, lambda *a, **k: None)
+
+    @override_settings(
+        MIDDLEWARE_CLASSES=(
+            'regressiontests.handlers.tests.ViewMiddleware',
+            'regressiontests.handlers.tests.ShortCircuitMiddleware',
+        ),
+        MIDDLEWARE_TIMING_COLLECTORS=('regressiontests.handlers.tests.collector',))
+    def test_collector(self):
+        handler = WSGIHandler()
+        for i in range(2):
+            response = self.get_response(handler)
+            self.assertEqual(response.content, 'Short circuit')
+        stats = collector.stats()
+        path = 'regressiontests.handlers.tests.ShortCircuitMiddleware'
+        self.assertEqual(sorted(stats.keys()), [
+            ('process_request', path), ('process_response', path)])
+        count, total, maximum = stats[('process_request', path)]
+        self.assertEqual(count, 2)
+        self.assertTrue(0 <= maximum <= total)
+        self.assertEqual(collector.phase_stats()['process_response'][0], 2)
+
+    @override_settings(
+        MIDDLEWARE_CLASSES=('regressiontests.handlers.tests.ShortCircuitMiddleware',),
+        MIDDLEWARE_TIMING_COLLECTORS=('django.core.handlers.timing.MemoryCollector',))
+    def test_collector_class(self):
+        handler = WSGIHandler()
+        self.get_response(handler)
+        self.assertEqual(collector.stats(), {})
+
+    @override_settings(
+        MIDDLEWARE_CLASSES=('regressiontests.handlers.tests.ShortCircuitMiddleware',),
+        MIDDLEWARE_TIMING_COLLECTORS=('regressiontests.handlers.tests.OldStyleCollector',))
+    def test_old_style_collector_class(self):
+        handler = WSGIHandler()
+        self.get_response(handler)
+        self.assertEqual(OldStyleCollector.calls,
+                         ['process_request', 'process_response'])
+
+    @override_settings(
+        MIDDLEWARE_CLASSES=('regressiontests.handlers.tests.ShortCircuitMiddleware',))
+    def test_no_collectors(self):
+        handler = WSGIHandler()
+        handler.load_middleware()
+        # Middleware methods aren't wrapped.
+        self.assertEqual(handler._request_middleware[0].im_class,
+                         ShortCircuitMiddleware)
+
+    @override_settings(
+        MIDDLEWARE_TIMING_COLLECTORS=('regressiontests.handlers.tests.missing',))
+    def test_bad_collector(self):
+        handler = WSGIHandler()
+        self.assertRaises(ImproperlyConfigured, handler.load_middleware)
@@ -1,8 +1,12 @@
 import copy
+import os
 import pickle
+import tempfile
+from StringIO import StringIO
 
-from django.http import (QueryDict, HttpResponse, SimpleCookie, BadHeaderError,
-        parse_cookie)
+from django.http import (QueryDict, HttpResponse, FileResponse, SimpleCookie,
+        BadHeaderError, parse_cookie, utils)
+from django.test import RequestFactory
 from django.utils import unittest
 
 
@@ -296,6 +300,100 @@ class HttpResponseTests(unittest.TestCase):
         self.assertRaises(UnicodeEncodeError,
                           getattr, r, 'content')
 
+class FileResponseTests(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, '0123456789' * 1000)
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def get_response(self, **kwargs):
+        return FileResponse(open(self.path, 'rb'), block_size=4096, **kwargs)
+
+    def get_partial_response(self, **headers):
+        request = RequestFactory().get('/', **headers)
+        return utils.partial_content(request, self.get_response())
+
+    def test_iteration(self):
+        response = self.get_response(mimetype='text/plain')
+        self.assertEqual(response['Content-Type'], 'text/plain')
+        self.assertEqual(response['Content-Length'], '10000')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual([len(chunk) for chunk in response], [4096, 4096, 1808])
+        response.close()
+        self.assertTrue(response.file_obj.closed)
+
+    def test_content(self):
+        response = self.get_response()
+        self.assertEqual(response.content, '0123456789' * 1000)
+        self.assertTrue(response.file_obj.closed)
+        # The content was kept and can still be iterated over.
+        self.assertEqual(''.join(response), '0123456789' * 1000)
+        self.assertEqual(response.file_to_stream, None)
+        self.assertFalse(response.accepts_ranges)
+
+    def test_file_to_stream(self):
+        response = self.get_response()
+        self.assertTrue(response.file_to_stream is response.file_obj)
+        response.content = 'replaced'
+        self.assertEqual(response.file_to_stream, None)
+        response.close()
+        self.assertTrue(response.file_obj.closed)
+
+    def test_unknown_size(self):
+        response = FileResponse(StringIO('content'))
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertFalse(response.accepts_ranges)
+        self.assertEqual(response.content, 'content')
+
+    def test_range(self):
+        response = self.get_partial_response(HTTP_RANGE='bytes=5-5004')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 5-5004/10000')
+        self.assertEqual(response['Content-Length'], '5000')
+        # The range doesn't reach the end of the file.
+        self.assertEqual(response.file_to_stream, None)
+        self.assertEqual([len(chunk) for chunk in response], [4096, 904])
+        response.close()
+
+    def test_range_to_end(self):
+        response = self.get_partial_response(HTTP_RANGE='bytes=-4')
+        self.assertEqual(response['Content-Range'], 'bytes 9996-9999/10000')
+        file_obj = response.file_to_stream
+        self.assertEqual(file_obj.tell(), 9996)
+        self.assertEqual(response.content, '6789')
+
+    def test_unsatisfiable_range(self):
+        response = self.get_partial_response(HTTP_RANGE='bytes=10000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10000')
+        self.assertEqual(response.content, '')
+
+    def test_ignored_ranges(self):
+        for headers in ({'HTTP_RANGE': 'bytes=0-1,5-6'},
+                        {'HTTP_RANGE': 'bytes=a-'},
+                        {'HTTP_RANGE': 'bytes=0-1', 'HTTP_IF_RANGE': '"etag"'}):
+            response = self.get_partial_response(**headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.content), 10000)
+
+    def test_if_range(self):
+        request = RequestFactory().get('/', HTTP_RANGE='bytes=0-1',
+                                       HTTP_IF_RANGE='"etag"')
+        response = self.get_response()
+        response['ETag'] = '"etag"'
+        response = utils.partial_content(request, response)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, '01')
+
+    def test_pickling(self):
+        response = pickle.loads(pickle.dumps(self.get_response()))
+        self.assertEqual(len(response.content), 10000)
+
+
 class CookieTests(unittest.TestCase):
     def test_encode(self):
         """
@@ -4,11 +4,12 @@ import gzip
 import re
 import random
 import StringIO
+import tempfile
 
 from django.conf import settings
 from django.core import mail
 from django.http import HttpRequest
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse
 from django.middleware.clickjacking import XFrameOptionsMiddleware
 from django.middleware.common import CommonMiddleware
 from django.middleware.http import ConditionalGetMiddleware
@@ -583,6 +584,57 @@ class GZipMiddlewareTest(TestCase):
         self.assertEqual(r.content, self.uncompressible_string)
         self.assertEqual(r.get('Content-Encoding'), None)
 
+    @override_settings(GZIP_MIN_LENGTH=10, GZIP_COMPRESS_LEVEL=1)
+    def test_settings(self):
+        self.resp.content = 'a' * 50
+        r = GZipMiddleware().process_response(self.req, self.resp)
+        self.assertEqual(r.get('Content-Encoding'), 'gzip')
+        self.assertEqual(self.decompress(r.content), 'a' * 50)
+
+    def test_compress_streaming_response(self):
+        """
+        Tests that iterators are compressed as they are consumed.
+        """
+        consumed = []
+        def content():
+            for i in range(5):
+                consumed.append(i)
+                yield u'%d' % i * 100
+        self.resp.content = content()
+        self.resp['Content-Length'] = '500'
+        r = GZipMiddleware().process_response(self.req, self.resp)
+        # Only enough content to tell that it's long enough was read.
+        self.assertEqual(consumed, [0, 1])
+        self.assertEqual(r.get('Content-Encoding'), 'gzip')
+        self.assertFalse(r.has_header('Content-Length'))
+        chunks = list(r)
+        self.assertTrue(len(chunks) > 2)
+        self.assertEqual(self.decompress(''.join(chunks)),
+                         ''.join(['%d' % i * 100 for i in range(5)]))
+
+    def test_compress_file_response(self):
+        f = tempfile.TemporaryFile()
+        f.write(self.compressible_string)
+        f.seek(0)
+        r = GZipMiddleware().process_response(self.req, FileResponse(f))
+        self.assertEqual(r.get('Content-Encoding'), 'gzip')
+        self.assertEqual(r.get('Accept-Ranges'), None)
+        self.assertEqual(self.decompress(''.join(r)), self.compressible_string)
+        r.close()
+        self.assertTrue(f.closed)
+
+    def test_no_compress_short_streaming_response(self):
+        self.resp.content = iter(['short', u' string'])
+        r = GZipMiddleware().process_response(self.req, self.resp)
+        self.assertEqual(r.content, 'short string')
+        self.assertEqual(r.get('Content-Encoding'), None)
+        # A Content-Length header saves reading any content.
+        resp = HttpResponse(iter(['short']))
+        resp['Content-Length'] = '5'
+        r = GZipMiddleware().process_response(self.req, resp)
+        self.assertEqual(r.get('Vary'), None)
+        self.assertEqual(list(r), ['short'])
+
 
 class ETagGZipMiddlewareTest(TestCase):
     """
@@ -47,6 +47,14 @@ class Worker(models.Model):
     def __unicode__(self):
         return self.name
 
+class FlagMixin(object):
+    def __init__(self, *args, **kwargs):
+        super(FlagMixin, self).__init__(*args, **kwargs)
+        self.flag = 'init-ran'
+
+class MixinWorker(models.Model, FlagMixin):
+    name = models.CharField(max_length=200)
+
 class BrokenUnicodeMethod(models.Model):
     name = models.CharField(max_length=7)
 
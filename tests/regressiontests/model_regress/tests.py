@@ -4,11 +4,12 @@ import datetime
 from operator import attrgetter
 
 from django.core.exceptions import ValidationError
+from django.db.models import signals
 from django.test import TestCase, skipUnlessDBFeature
 from django.utils import tzinfo
 
 from .models import (Worker, Article, Party, Event, Department,
-    BrokenUnicodeMethod, NonAutoPK)
+    BrokenUnicodeMethod, NonAutoPK, MixinWorker)
 
 
 
@@ -184,3 +185,50 @@ class EvaluateMethodTest(TestCase):
         dept = Department.objects.create(pk=1, name='abc')
         dept.evaluate = 'abc'
         Worker.objects.filter(department=dept)
+
+
+class FromDbTests(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(pk=1, name='abc')
+        Worker.objects.create(department=self.dept, name='worker')
+
+    def test_from_db(self):
+        worker = Worker.objects.get()
+        obj = Worker.from_db('default', (worker.pk, self.dept.pk, 'worker'))
+        self.assertEqual(obj.__class__, Worker)
+        self.assertEqual(obj.name, 'worker')
+        self.assertEqual(obj.department, self.dept)
+        self.assertEqual(obj._state.db, 'default')
+        self.assertFalse(obj._state.adding)
+        self.assertEqual(obj, worker)
+
+    def test_from_db_deferred(self):
+        worker = Worker.objects.defer('name').get()
+        self.assertEqual(worker.__class__.__name__, 'Worker_Deferred_name')
+        self.assertFalse('name' in worker.__dict__)
+        self.assertEqual(worker.name, 'worker')
+        self.assertFalse(worker._state.adding)
+        obj = worker.__class__.from_db('default', (worker.pk, self.dept.pk),
+                                       ['id', 'department_id'])
+        self.assertEqual(obj.name, 'worker')
+
+    def test_mixin_init(self):
+        # The __init__() of a mixin listed after Model is run through super().
+        MixinWorker.objects.create(name='worker')
+        self.assertEqual(MixinWorker.objects.get().flag, 'init-ran')
+        self.assertEqual(MixinWorker.objects.defer('name').get().flag, 'init-ran')
+
+    def test_init_signals_sent_when_connected(self):
+        seen = []
+        def post_init_handler(sender, instance, **kwargs):
+            seen.append(instance.name)
+        signals.post_init.connect(post_init_handler, sender=Worker)
+        try:
+            self.assertEqual([w.name for w in Worker.objects.all()], ['worker'])
+            self.assertEqual(seen, ['worker'])
+            self.assertEqual(len(Department.objects.all()), 1)
+            self.assertEqual(seen, ['worker'])
+        finally:
+            signals.post_init.disconnect(post_init_handler, sender=Worker)
+        list(Worker.objects.all())
+        self.assertEqual(seen, ['worker'])
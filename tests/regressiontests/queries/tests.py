@@ -7,8 +7,9 @@ import sys
 from django.conf import settings
 from django.core.exceptions import FieldError
 from django.db import DatabaseError, connection, connections, DEFAULT_DB_ALIAS
-from django.db.models import Count
+from django.db.models import Count, F
 from django.db.models.query import Q, ITER_CHUNK_SIZE, EmptyQuerySet
+from django.db.models.sql.compiler import compiled_sql_cache
 from django.test import TestCase, skipUnlessDBFeature
 from django.utils import unittest
 from django.utils.datastructures import SortedDict
@@ -1610,6 +1611,30 @@ class CloneTests(TestCase):
         except:
             self.fail('Query should be clonable')
 
+    def test_clones_share_where_tree_safely(self):
+        qs = Note.objects.filter(note='n1').exclude(misc='foo')
+        sql = str(qs.query)
+        filtered = qs.filter(id__gt=1)
+        self.assertTrue(filtered.query.where is not qs.query.where)
+        self.assertEqual(filtered.query.where.children[:2],
+                         qs.query.where.children)
+        # Combining relabels the right hand side's aliases; neither the
+        # original querysets nor their clones may be affected.
+        other = Note.objects.filter(extrainfo__info='good')
+        other_sql = str(other.query)
+        str((qs | other).query)
+        str((other | qs).query)
+        str(Note.objects.exclude(pk__in=other.values('pk')).query)
+        self.assertEqual(str(qs.query), sql)
+        self.assertEqual(str(other.query), other_sql)
+        self.assertEqual(str(qs.filter(id__gt=1).query), str(filtered.query))
+
+    def test_extra_is_copied_on_write(self):
+        qs = Note.objects.extra(select={'a': '1'})
+        qs2 = qs.extra(select={'b': '2'})
+        self.assertEqual(qs.query.extra.keys(), ['a'])
+        self.assertEqual(qs2.query.extra.keys(), ['a', 'b'])
+
 
 class EmptyQuerySetTests(TestCase):
     def test_emptyqueryset_values(self):
@@ -1894,3 +1919,95 @@ class DefaultValuesInsertTest(TestCase):
             DumbCategory.objects.create()
         except TypeError:
             self.fail("Creation of an instance of a model with only the PK field shouldn't error out after bulk insert refactoring (#17056)")
+
+
+class IteratorTests(TestCase):
+    def setUp(self):
+        for num in range(10):
+            Number.objects.create(num=num)
+
+    def test_chunk_size(self):
+        qs = Number.objects.order_by('num')
+        self.assertEqual(
+            [n.num for n in qs.iterator(chunk_size=3)], range(10))
+        self.assertEqual(
+            list(qs.values_list('num', flat=True).iterator(chunk_size=4)),
+            range(10))
+
+    def test_server_side(self):
+        # Backends without server-side cursors fall back to a regular one.
+        qs = Number.objects.order_by('num')
+        self.assertEqual(
+            [n.num for n in qs.iterator(chunk_size=3, server_side=True)],
+            range(10))
+        self.assertEqual(
+            [d['num'] for d in qs.values('num').iterator(server_side=True)],
+            range(10))
+        self.assertEqual(
+            list(qs.filter(num__gte=5).values_list('num', flat=True)
+                 .iterator(server_side=True)),
+            range(5, 10))
+        self.assertEqual(
+            list(qs.none().iterator(server_side=True)), [])
+
+    @skipUnlessDBFeature('can_use_server_side_cursors')
+    def test_server_side_cursor_is_closed(self):
+        it = Number.objects.order_by('num').iterator(chunk_size=2, server_side=True)
+        self.assertEqual(it.next().num, 0)
+        # Discarding the iterator closes the cursor, so the connection can
+        # run other queries.
+        del it
+        self.assertEqual(Number.objects.count(), 10)
+
+
+class CompiledSQLCacheTests(TestCase):
+    def setUp(self):
+        self.cache = compiled_sql_cache
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+        for num in range(10):
+            Number.objects.create(num=num)
+
+    def test_same_shape_reuses_sql(self):
+        qs1 = Number.objects.filter(num__gt=2).order_by('num')[:3]
+        qs2 = Number.objects.filter(num__gt=5).order_by('num')[:3]
+        sql1, params1 = qs1.query.sql_with_params()
+        self.assertEqual(len(self.cache), 1)
+        sql2, params2 = qs2.query.sql_with_params()
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(sql1, sql2)
+        self.assertEqual(params1, (2,))
+        self.assertEqual(params2, (5,))
+        self.assertEqual([n.num for n in qs2], [6, 7, 8])
+
+    def test_different_shapes(self):
+        def nums(qs):
+            return [n.num for n in qs.order_by('num')]
+        self.assertEqual(nums(Number.objects.filter(num__in=[1, 2])), [1, 2])
+        self.assertEqual(nums(Number.objects.filter(num__in=[1, 2, 3])), [1, 2, 3])
+        self.assertEqual(nums(Number.objects.filter(num__in=[])), [])
+        self.assertEqual(nums(Number.objects.exclude(num__lt=8)), [8, 9])
+        self.assertEqual(
+            nums(Number.objects.filter(Q(num=1) | Q(num__gte=9))), [1, 9])
+        self.assertEqual(
+            nums(Number.objects.filter(Q(num=2) | Q(num__gte=8))), [2, 8, 9])
+        self.assertEqual(nums(Number.objects.filter(num__isnull=True)), [])
+        self.assertEqual(
+            list(Number.objects.filter(num__lt=2).order_by('-num')
+                 .values_list('num', flat=True)), [1, 0])
+
+    def test_uncacheable_queries(self):
+        list(Number.objects.filter(num__gt=2).extra(select={'a': 1}))
+        list(Number.objects.filter(num__gt=F('num')))
+        self.assertEqual(len(self.cache), 0)
+        # Only the inner query is cached.
+        list(Number.objects.filter(num__in=Number.objects.filter(num=1)))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_disabled(self):
+        self.cache.enabled = False
+        try:
+            list(Number.objects.filter(num__gt=2))
+            self.assertEqual(len(self.cache), 0)
+        finally:
+            self.cache.enabled = True
@@ -21,6 +21,7 @@ from django.utils.functional import empty
 from django.utils._os import rmtree_errorhandler
 
 from django.contrib.staticfiles import finders, storage
+from django.contrib.staticfiles.utils import parallel_map
 
 TEST_ROOT = os.path.dirname(__file__)
 TEST_SETTINGS = {
@@ -442,12 +443,99 @@ class TestCollectionCachedStorage(BaseCollectionTestCase,
         self.assertTrue(u'cached/css/window.css' in stats['post_processed'])
         self.assertTrue(u'cached/css/img/window.png' in stats['unmodified'])
 
+    def test_manifest(self):
+        hashed_names, sources = storage.staticfiles_storage.read_manifest()
+        self.assertEqual(hashed_names['cached/styles.css'],
+                         'cached/styles.93b1147e8552.css')
+        self.assertEqual(hashed_names['test/file.txt'],
+                         'test/file.ea5bccaf16d5.txt')
+        self.assertTrue(sources['test/file.txt'])
+
+    def test_unchanged_files_not_hashed(self):
+        """
+        Files whose source didn't change since the last run keep the hashed
+        name recorded in the manifest.
+        """
+        staticfiles_storage = storage.staticfiles_storage
+        hashed_names, sources = staticfiles_storage.read_manifest()
+        # Record a hashed name that can only come from the manifest.
+        hashed_names['cached/img/relative.png'] = 'cached/img/relative.png'
+        staticfiles_storage.save_manifest(hashed_names, sources)
+        self.run_collectstatic()
+        self.assertEqual(self.cached_file_path('cached/img/relative.png'),
+                         'cached/img/relative.png')
+
+        source = os.path.join(TEST_ROOT, 'project', 'documents', 'cached',
+                              'img', 'relative.png')
+        stat = os.stat(source)
+        os.utime(source, (stat.st_atime, stat.st_mtime + 10))
+        try:
+            self.run_collectstatic()
+        finally:
+            os.utime(source, (stat.st_atime, stat.st_mtime))
+        self.assertEqual(self.cached_file_path('cached/img/relative.png'),
+                         'cached/img/relative.acae32e4532b.png')
+
+    def test_parallel(self):
+        self.run_collectstatic(clear=True, parallel=4)
+        self.assertStaticRenders("cached/styles.css",
+                                 "/static/cached/styles.93b1147e8552.css")
+        self.assertStaticRenders("cached/css/window.css",
+                                 "/static/cached/css/window.9db38d5169f3.css")
+        with storage.staticfiles_storage.open(
+                "cached/relative.2217ea7273c2.css") as relfile:
+            content = relfile.read()
+            self.assertIn('url("/static/cached/img/relative.acae32e4532b.png")', content)
+
 # we set DEBUG to False here since the template tag wouldn't work otherwise
 TestCollectionCachedStorage = override_settings(**dict(TEST_SETTINGS,
     STATICFILES_STORAGE='django.contrib.staticfiles.storage.CachedStaticFilesStorage',
     DEBUG=False,
 ))(TestCollectionCachedStorage)
 
+
+class TestCollectionManifestStorage(BaseCollectionTestCase,
+        BaseStaticFilesTestCase, TestCase):
+    """
+    Tests for the storage that finds hashed names in the manifest.
+    """
+    def test_template_tag_return(self):
+        self.assertStaticRaises(ValueError,
+                                "does/not/exist.png",
+                                "/static/does/not/exist.png")
+        self.assertStaticRenders("test/file.txt",
+                                 "/static/test/file.ea5bccaf16d5.txt")
+        self.assertStaticRenders("cached/styles.css",
+                                 "/static/cached/styles.93b1147e8552.css")
+        self.assertStaticRenders("cached/styles.css?spam=eggs#ham",
+                                 "/static/cached/styles.93b1147e8552.css?spam=eggs#ham")
+        self.assertStaticRenders("path/",
+                                 "/static/path/")
+
+    def test_post_processed_content(self):
+        with storage.staticfiles_storage.open(
+                "cached/relative.2217ea7273c2.css") as relfile:
+            content = relfile.read()
+            self.assertIn('url("/static/cached/img/relative.acae32e4532b.png")', content)
+
+    def test_no_lookups_outside_manifest(self):
+        """
+        url() neither uses the cache nor the file system.
+        """
+        staticfiles_storage = storage.ManifestStaticFilesStorage()
+        def fail(*args, **kwargs):
+            self.fail("url() shouldn't call this.")
+        staticfiles_storage.cache = None
+        staticfiles_storage.exists = staticfiles_storage.open = fail
+        self.assertEqual(staticfiles_storage.url('cached/css/window.css'),
+                         '/static/cached/css/window.9db38d5169f3.css')
+        self.assertRaises(ValueError, staticfiles_storage.url, 'cached/missing.css')
+
+TestCollectionManifestStorage = override_settings(**dict(TEST_SETTINGS,
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+    DEBUG=False,
+))(TestCollectionManifestStorage)
+
 if sys.platform != 'win32':
 
     class TestCollectionLinks(CollectionTestCase, TestDefaults):
@@ -468,6 +556,29 @@ if sys.platform != 'win32':
             self.assertTrue(os.path.islink(os.path.join(settings.STATIC_ROOT, 'test.txt')))
 
 
+class TestCollectionParallel(CollectionTestCase, TestDefaults):
+    """
+    Test ``--parallel`` option for ``collectstatic`` management command.
+    """
+    def run_collectstatic(self):
+        super(TestCollectionParallel, self).run_collectstatic(parallel=4)
+
+
+class TestParallelMap(TestCase):
+
+    def test_order(self):
+        self.assertEqual(list(parallel_map(lambda x: x * 2, range(20), 4)),
+                         range(0, 40, 2))
+        self.assertEqual(list(parallel_map(lambda x: x * 2, range(3))), [0, 2, 4])
+
+    def test_exception(self):
+        def check(x):
+            if x == 5:
+                raise ValueError(x)
+            return x
+        self.assertRaises(ValueError, list, parallel_map(check, range(20), 4))
+
+
 class TestServeStatic(StaticFilesTestCase):
     """
     Test static asset serving view.
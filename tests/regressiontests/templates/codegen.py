@@ -0,0 +1,87 @@
+from __future__ import with_statement
+
+import pickle
+
+from django.template import Context, Template, VariableNode
+from django.template.codegen import (CompiledNodeList, LearnedVariable,
+    ATTRIBUTE_LOOKUP, INDEX_LOOKUP)
+from django.test.utils import override_settings
+from django.utils.unittest import TestCase
+
+
+class Article(object):
+    def __init__(self, title, tags=()):
+        self.title = title
+        self.tags = list(tags)
+
+
+class LearnedVariableTests(TestCase):
+
+    def test_attribute_path(self):
+        var = LearnedVariable('article.title')
+        self.assertEqual(var.resolve(Context({'article': Article('One')})), 'One')
+        self.assertEqual(var.learned[1], (Article, ATTRIBUTE_LOOKUP))
+        self.assertEqual(var.resolve(Context({'article': Article('Two')})), 'Two')
+        # Objects of other types still go through the full lookup
+        self.assertEqual(var.resolve(Context({'article': {'title': 'Three'}})), 'Three')
+
+    def test_index_path(self):
+        var = LearnedVariable('articles.1')
+        self.assertEqual(var.resolve(Context({'articles': ['a', 'b']})), 'b')
+        self.assertEqual(var.learned[1], (list, INDEX_LOOKUP, 1))
+        self.assertEqual(var.resolve(Context({'articles': ['c', 'd']})), 'd')
+        self.assertEqual(var.resolve(Context({'articles': {'1': 'e'}})), 'e')
+
+    def test_dictionaries_are_not_learned(self):
+        var = LearnedVariable('article.title')
+        var.resolve(Context({'article': {'title': 'One'}}))
+        self.assertEqual(var.learned[1], None)
+
+    def test_failed_lookup(self):
+        with override_settings(TEMPLATE_STRING_IF_INVALID='INVALID', TEMPLATE_COMPILE=True):
+            t = Template('[{{ article.title }}]')
+            self.assertEqual(t.render(Context({'article': Article('One')})), '[One]')
+            self.assertEqual(t.render(Context({'article': object()})), '[INVALID]')
+            self.assertEqual(t.render(Context({'article': Article('Two')})), '[Two]')
+
+
+class CompiledTemplateTests(TestCase):
+
+    def get_template(self, source):
+        with override_settings(TEMPLATE_COMPILE=True, TEMPLATE_DEBUG=False):
+            return Template(source)
+
+    def test_compiled_nodelists(self):
+        t = self.get_template(
+            '{% for a in articles %}{% if a.tags %}{{ a.title }}{% endif %}{% endfor %}')
+        self.assertTrue(isinstance(t.nodelist, CompiledNodeList))
+        for_node = t.nodelist[0]
+        self.assertTrue(isinstance(for_node.nodelist_loop, CompiledNodeList))
+        if_node = for_node.nodelist_loop[0]
+        self.assertTrue(isinstance(if_node.conditions_nodelists[0][1], CompiledNodeList))
+        self.assertEqual(len(t.nodelist.get_nodes_by_type(VariableNode)), 1)
+
+    def test_render(self):
+        t = self.get_template(
+            '<ul>{% for a in articles %}<li>{{ a.title|upper }}: '
+            '{{ a.tags|join:", " }}{% if a.tags.0 == sep %}!{% endif %}</li>'
+            '{% empty %}none{% endfor %}</ul>')
+        articles = [Article('One', ['x', 'y']), Article('<Two>', ['-'])]
+        context = Context({'articles': articles, 'sep': '-'})
+        expected = u'<ul><li>ONE: x, y</li><li>&lt;TWO&gt;: -!</li></ul>'
+        self.assertEqual(t.render(context), expected)
+        # Rendering again uses the learned lookups
+        self.assertEqual(t.render(context), expected)
+        self.assertEqual(t.render(Context({'articles': []})), u'<ul>none</ul>')
+
+    def test_debug_not_compiled(self):
+        with override_settings(TEMPLATE_COMPILE=True, TEMPLATE_DEBUG=True):
+            t = Template('{{ a }}')
+        self.assertFalse(isinstance(t.nodelist, CompiledNodeList))
+
+    def test_pickle(self):
+        t = self.get_template('{% for a in articles %}{{ a.title }} {% endfor %}')
+        nodelist = pickle.loads(pickle.dumps(t.nodelist, pickle.HIGHEST_PROTOCOL))
+        self.assertTrue(isinstance(nodelist, CompiledNodeList))
+        context = Context({'articles': [Article('One'), Article('Two')]})
+        self.assertEqual(nodelist.render(context), u'One Two ')
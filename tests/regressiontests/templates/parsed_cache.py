@@ -0,0 +1,163 @@
+from __future__ import with_statement
+
+import os
+import pickle
+import shutil
+import tempfile
+from StringIO import StringIO
+
+from django.core.cache import get_cache
+from django.core.management import call_command
+from django.template import Context, Template, base as template_base, loader as template_loader
+from django.template.loaders import app_directories
+from django.template.loaders.cached import Loader
+from django.test.utils import override_settings
+from django.utils import unittest
+
+
+class ParsedTemplateCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp()
+        self.write('index.html', '{% for i in items %}{% if i > 1 %}{{ i }}{% endif %}{% endfor %}')
+        self.write('tags/unpicklable.html', '{% load custom %}{% no_params %}')
+        self.write('broken.html', '{% if %}')
+        self.settings = override_settings(
+            CACHES={'templates': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'parsed-templates',
+            }},
+            TEMPLATE_CACHE_ALIAS='templates',
+            TEMPLATE_DEBUG=False,
+            TEMPLATE_DIRS=(self.template_dir,),
+            TEMPLATE_LOADERS=(
+                ('django.template.loaders.cached.Loader', (
+                    'django.template.loaders.filesystem.Loader',
+                )),
+            ),
+        )
+        self.settings.enable()
+        self.cache = get_cache('templates')
+        self.cache.clear()
+        self.old_parse = template_base.Parser.parse
+        self.parse_count = 0
+        # Only look for templates in template_dir.
+        self.old_app_template_dirs = app_directories.app_template_dirs
+        app_directories.app_template_dirs = ()
+
+    def tearDown(self):
+        template_base.Parser.parse = self.old_parse
+        app_directories.app_template_dirs = self.old_app_template_dirs
+        self.cache.clear()
+        self.settings.disable()
+        shutil.rmtree(self.template_dir)
+
+    def write(self, name, source):
+        path = os.path.join(self.template_dir, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        f = open(path, 'w')
+        try:
+            f.write(source)
+        finally:
+            f.close()
+
+    def count_parses(self):
+        old_parse = self.old_parse
+        def parse(parser, *args, **kwargs):
+            if not args and not kwargs:
+                self.parse_count += 1
+            return old_parse(parser, *args, **kwargs)
+        template_base.Parser.parse = parse
+
+    def get_loader(self):
+        return Loader(['django.template.loaders.filesystem.Loader'])
+
+    def test_shared_between_loaders(self):
+        template, origin = self.get_loader().load_template('index.html')
+        self.assertEqual(template.render(Context({'items': [1, 2, 3]})), u'23')
+        self.count_parses()
+        template, origin = self.get_loader().load_template('index.html')
+        self.assertEqual(self.parse_count, 0)
+        self.assertEqual(template.render(Context({'items': [1, 2, 3]})), u'23')
+
+    def test_source_change(self):
+        self.get_loader().load_template('index.html')
+        self.write('index.html', '{{ items|length }}')
+        self.count_parses()
+        template, origin = self.get_loader().load_template('index.html')
+        self.assertEqual(self.parse_count, 1)
+        self.assertEqual(template.render(Context({'items': [1, 2, 3]})), u'3')
+
+    def test_include_change(self):
+        self.write('page.html', 'page:{% include "part.html" %}:{% include "other.html" %}')
+        self.write('part.html', 'OLD')
+        old_loaders = template_loader.template_source_loaders
+        try:
+            # Each loader stands for a new process.
+            loader = template_loader.template_source_loaders = (self.get_loader(),)
+            template, origin = loader[0].load_template('page.html')
+            self.assertEqual(template.render(Context({})), u'page:OLD:')
+            self.write('part.html', 'NEW')
+            self.write('other.html', 'OTHER')
+            self.count_parses()
+            loader = template_loader.template_source_loaders = (self.get_loader(),)
+            template, origin = loader[0].load_template('page.html')
+            # Only the included templates are parsed again.
+            self.assertEqual(self.parse_count, 2)
+            self.assertEqual(template.render(Context({})), u'page:NEW:OTHER')
+        finally:
+            template_loader.template_source_loaders = old_loaders
+
+    def test_corrupt_data(self):
+        loader = self.get_loader()
+        source, origin = loader.find_template('index.html', parse=False)
+        self.cache.set(loader.parsed_template_key('index.html', source), 'corrupt')
+        template, origin = loader.load_template('index.html')
+        self.assertEqual(template.render(Context({'items': [1, 2, 3]})), u'23')
+
+    def test_unpicklable_template(self):
+        loader = self.get_loader()
+        template, origin = loader.load_template('tags/unpicklable.html')
+        self.assertEqual(template.render(Context({})), u'no_params - Expected result')
+        source, origin = loader.find_template('tags/unpicklable.html', parse=False)
+        key = loader.parsed_template_key('tags/unpicklable.html', source)
+        self.assertFalse(self.cache.has_key(key))
+
+    def test_debug(self):
+        with override_settings(TEMPLATE_DEBUG=True):
+            self.get_loader().load_template('index.html')
+        self.count_parses()
+        self.get_loader().load_template('index.html')
+        self.assertEqual(self.parse_count, 1)
+
+    def test_smartif_pickling(self):
+        t = Template('{% if a in b and not c or d == 2 %}yes{% endif %}')
+        t = pickle.loads(pickle.dumps(t, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(t.render(Context({'a': 1, 'b': [1]})), u'yes')
+        self.assertEqual(t.render(Context({'a': 1, 'b': [1], 'c': True})), u'')
+
+    def test_warm_command(self):
+        out, err = StringIO(), StringIO()
+        call_command('warmtemplatecache', stdout=out, stderr=err)
+        self.assertEqual(out.getvalue(), '1 template stored, 2 skipped.\n')
+        self.assertTrue(err.getvalue().startswith('Failed to parse broken.html'))
+        self.count_parses()
+        self.get_loader().load_template('index.html')
+        self.assertEqual(self.parse_count, 0)
+
+    def test_warm_command_extensions(self):
+        self.write('email.txt', '{{ name }}')
+        self.write('style.css', 'body {}')
+        out = StringIO()
+        call_command('warmtemplatecache', extensions=['txt,css'], stdout=out)
+        self.assertEqual(out.getvalue(), '2 templates stored, 0 skipped.\n')
+
+    def test_warm_command_requires_alias(self):
+        err = StringIO()
+        with override_settings(TEMPLATE_CACHE_ALIAS=None):
+            # call_command() reports CommandErrors and exits.
+            self.assertRaises(SystemExit, call_command, 'warmtemplatecache',
+                              stdout=StringIO(), stderr=err)
+        self.assertEqual(err.getvalue(),
+                         "Error: The TEMPLATE_CACHE_ALIAS setting isn't set.\n")
@@ -215,6 +215,49 @@ class SimpleTemplateResponseTest(BaseTemplateResponseTest):
         unpickled_response = pickle.loads(pickled_response)
         repickled_response = pickle.dumps(unpickled_response)
 
+    def test_streaming(self):
+        rendered = []
+        class Item(object):
+            def __init__(self, value):
+                self._value = value
+            def value(self):
+                rendered.append(self._value)
+                return self._value
+        response = self._response('{% for i in items %}{% if i %}{{ i.value }},{% endif %}{% endfor %}',
+                                  {'items': [Item(1), Item(2), Item(3)]},
+                                  streaming=True)
+        response.streaming_buffer_size = 1
+        response.render()
+        # Nothing is rendered until the response is iterated over...
+        self.assertEqual(rendered, [])
+        iterator = iter(response)
+        self.assertEqual(iterator.next(), '1')
+        # ...and then only as much as needed.
+        self.assertEqual(rendered, [1])
+        self.assertEqual(''.join(iterator), ',2,3,')
+        self.assertEqual(rendered, [1, 2, 3])
+
+    def test_streaming_buffer_size(self):
+        response = self._response('{% for i in items %}{{ i }}{% endfor %}',
+                                  {'items': range(10)}, streaming=True)
+        response.streaming_buffer_size = 4
+        response.render()
+        self.assertEqual(list(response), ['0123', '4567', '89'])
+
+    def test_streaming_content_access(self):
+        response = self._response('{% for i in items %}{{ i }}{% endfor %}',
+                                  {'items': range(3)}, streaming=True).render()
+        self.assertEqual(response.content, '012')
+        # The content is kept for when the response is iterated over
+        self.assertEqual(response.content, '012')
+        self.assertEqual(''.join(response), '012')
+
+    def test_streaming_pickling(self):
+        response = self._response('{% for i in items %}{{ i }}{% endfor %}',
+                                  {'items': range(3)}, streaming=True).render()
+        unpickled_response = pickle.loads(pickle.dumps(response))
+        self.assertEqual(unpickled_response.content, '012')
+
 class TemplateResponseTest(BaseTemplateResponseTest):
 
     def _response(self, template='foo', *args, **kwargs):
@@ -247,6 +290,11 @@ class TemplateResponseTest(BaseTemplateResponseTest):
         self.assertEqual(response['content-type'], 'application/json')
         self.assertEqual(response.status_code, 504)
 
+    def test_streaming(self):
+        response = self._response('{% block content %}{{ foo }}{{ processors }}{% endblock %}',
+                                  {'foo': 'bar'}, streaming=True).render()
+        self.assertEqual(''.join(response), 'baryes')
+
     def test_custom_app(self):
         response = self._response('{{ foo }}', current_app="foobar")
 
@@ -31,9 +31,11 @@ from django.utils.safestring import mark_safe
 from django.utils.tzinfo import LocalTimezone
 
 from .callables import CallableVariablesTests
+from .codegen import LearnedVariableTests, CompiledTemplateTests
 from .context import ContextTests
 from .custom import CustomTagTests, CustomFilterTests
 from .parser import ParserTests
+from .parsed_cache import ParsedTemplateCacheTests
 from .unicode import UnicodeTests
 from .nodelist import NodelistTest, ErrorIndexTest
 from .smartif import SmartIfTests
@@ -504,10 +506,29 @@ class Templates(unittest.TestCase):
         self.assertEqual(failures, [], "Tests failed:\n%s\n%s" %
             ('-'*70, ("\n%s\n" % ('-'*70)).join(failures)))
 
+    @override_settings(TEMPLATE_COMPILE=True)
+    def test_templates_compiled(self):
+        # Compiled templates must render exactly like the nodes they're
+        # compiled from.
+        self.test_templates()
+
+    def test_templates_streamed(self):
+        # Streaming a template must produce the same output as rendering it.
+        self.streaming = True
+        try:
+            self.test_templates()
+        finally:
+            self.streaming = False
+
+    streaming = False
+
     def render(self, test_template, vals):
         context = template.Context(vals[1])
         before_stack_size = len(context.dicts)
-        output = test_template.render(context)
+        if self.streaming:
+            output = u''.join(test_template.stream(context))
+        else:
+            output = test_template.render(context)
         if len(context.dicts) != before_stack_size:
             raise ContextStackException
         return output
@@ -1,16 +1,20 @@
 """
 Unit tests for reverse URL lookups.
 """
-from __future__ import absolute_import
+from __future__ import absolute_import, with_statement
 
 from django.conf import settings
+from django.conf.urls import url
 from django.core.exceptions import ImproperlyConfigured, ViewDoesNotExist
 from django.core.urlresolvers import (reverse, resolve, NoReverseMatch,
-    Resolver404, ResolverMatch, RegexURLResolver, RegexURLPattern)
+    Resolver404, ResolverMatch, RegexURLResolver, RegexURLPattern,
+    MatchCache, PrefixIndex, clear_url_caches, get_resolver, literal_prefix)
 from django.http import HttpResponseRedirect, HttpResponsePermanentRedirect
 from django.shortcuts import redirect
 from django.test import TestCase
-from django.utils import unittest
+from django.test.utils import override_settings
+from django.utils import translation, unittest
+from django.utils.translation import ugettext_lazy
 from django.contrib.auth.models import User
 
 from . import urlconf_outer, urlconf_inner, middleware, views
@@ -511,3 +515,123 @@ class ErroneousViewTests(TestCase):
         self.assertRaises(ViewDoesNotExist, self.client.get, '/missing_outer/')
         self.assertRaises(ViewDoesNotExist, self.client.get, '/uncallable/')
 
+
+class LiteralPrefixTests(unittest.TestCase):
+    def test_literal_prefix(self):
+        for pattern, prefix in (
+            (r'^articles/2003/$', u'articles/2003/'),
+            (r'^articles/(?P<year>\d{4})/$', u'articles/'),
+            (r'^normal/(\d+)/$', u'normal/'),
+            (r'^files\.json$', u'files.json'),
+            (r'^colou?r/$', u'colo'),
+            (r'^ab*c/$', u'a'),
+            (r'^ab+c/$', u'ab'),
+            (r'^a{2}/$', u''),
+            (r'^\d+/$', u''),
+            (r'^$', u''),
+            (r'articles/$', u''),
+            (r'^articles/|^posts/', u''),
+            (r'^(?i)articles/$', u''),
+            (r'^feeds/(?P<format>rss|atom)/$', u'feeds/'),
+            (r'^a[|]b|c', u''),
+            (r'^a[]|]b/', u'a'),
+        ):
+            self.assertEqual(literal_prefix(pattern), prefix,
+                             'Wrong prefix for %r' % pattern)
+
+    def test_prefix_index(self):
+        index = PrefixIndex([u'articles/', u'', u'art', u'blog/', u'articles/2003/'])
+        self.assertEqual(index.candidates(u'articles/2003/'), [0, 1, 2, 4])
+        self.assertEqual(index.candidates(u'articles/2004/'), [0, 1, 2])
+        self.assertEqual(index.candidates(u'blog/'), [1, 3])
+        self.assertEqual(index.candidates(u'b'), [1])
+
+class IndexedResolverTests(TestCase):
+    urls = 'regressiontests.urlpatterns_reverse.namespace_urls'
+
+    @override_settings(URL_RESOLVER_INDEX=True)
+    def test_resolve(self):
+        for path, name, app_name, namespace, func, args, kwargs in resolve_test_data:
+            match = resolve(path)
+            self.assertEqual(match.url_name, name)
+            self.assertEqual(match.func, func)
+            self.assertEqual(match.args, args)
+            self.assertEqual(match.kwargs, kwargs)
+            self.assertEqual(match.app_name, app_name)
+            self.assertEqual(match.namespace, namespace)
+
+    def test_tried(self):
+        urls = 'regressiontests.urlpatterns_reverse.named_urls'
+        for path in ('/included/non-existent-url', '/non-existent-url', 'x'):
+            try:
+                resolve(path, urlconf=urls)
+            except Resolver404, e:
+                expected = e.args[0]
+            with override_settings(URL_RESOLVER_INDEX=True):
+                try:
+                    resolve(path, urlconf=urls)
+                except Resolver404, e:
+                    self.assertEqual(e.args[0], expected)
+                else:
+                    self.fail('resolve did not raise a 404')
+
+class MatchCacheTests(TestCase):
+    urls = 'regressiontests.urlpatterns_reverse.namespace_urls'
+
+    def test_lru(self):
+        cache = MatchCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        cache.set('a', 4)
+        cache.set('d', 5)
+        self.assertEqual(cache.get('c'), None)
+        self.assertEqual(cache.get('a'), 4)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    @override_settings(URL_RESOLVER_CACHE_SIZE=10)
+    def test_resolve(self):
+        clear_url_caches()
+        match = resolve('/normal/42/37/')
+        match.kwargs['arg1'] = 'changed'
+        self.assertEqual(len(get_resolver(None).match_cache), 1)
+        cached_match = resolve('/normal/42/37/')
+        self.assertEqual(cached_match.kwargs, {'arg1': '42', 'arg2': '37'})
+        self.assertEqual(cached_match.url_name, 'normal-view')
+        self.assertRaises(Resolver404, resolve, '/non-existent-url/')
+        self.assertEqual(len(get_resolver(None).match_cache), 1)
+
+class ReverseCandidatesTests(TestCase):
+    urls = 'regressiontests.urlpatterns_reverse.urls'
+
+    def test_shared_between_languages(self):
+        resolver = get_resolver(None)
+        for language in ('en', 'fr'):
+            with translation.override(language):
+                self.assertEqual(reverse('places', args=[3]), '/places/3/')
+        self.assertEqual(resolver._reverse_dict.keys(), [None])
+        self.assertEqual(len(resolver._reverse_candidates), 1)
+
+    def test_localized_patterns(self):
+        resolver = RegexURLResolver(r'^/', [
+            url(ugettext_lazy(r'^places/(\d+)/$'), views.empty_view, name='places'),
+        ])
+        for language in ('en', 'fr'):
+            with translation.override(language):
+                self.assertEqual(resolver.reverse('places', 3), 'places/3/')
+        self.assertTrue(resolver._localized)
+        self.assertEqual(sorted(resolver._reverse_dict.keys()), ['en', 'fr'])
+
+    def test_arguments_validated(self):
+        self.assertEqual(reverse('places', args=[3]), '/places/3/')
+        self.assertRaises(NoReverseMatch, reverse, 'places', args=['three'])
+        self.assertRaises(NoReverseMatch, reverse, 'places', args=[3, 4])
+        self.assertEqual(reverse('places', args=[4]), '/places/4/')
+        # Failed lookups aren't stored.
+        self.assertEqual(len(get_resolver(None)._reverse_candidates), 1)
@@ -122,3 +122,27 @@ class TestUtilsHttp(unittest.TestCase):
         for n, b36 in [(0, '0'), (1, '1'), (42, '16'), (818469960, 'django')]:
             self.assertEqual(http.int_to_base36(n), b36)
             self.assertEqual(http.base36_to_int(b36), n)
+
+    def test_parse_range_header(self):
+        parse = http.parse_range_header
+        self.assertEqual(parse('bytes=0-9', 100), [(0, 10)])
+        self.assertEqual(parse('bytes=90-', 100), [(90, 100)])
+        self.assertEqual(parse('bytes=90-200', 100), [(90, 100)])
+        self.assertEqual(parse('bytes=-10', 100), [(90, 100)])
+        self.assertEqual(parse('bytes=-200', 100), [(0, 100)])
+        self.assertEqual(parse('bytes=0-0, -1', 100), [(0, 1), (99, 100)])
+        # Unsatisfiable ranges
+        self.assertEqual(parse('bytes=100-', 100), [])
+        self.assertEqual(parse('bytes=-0', 100), [])
+        # Invalid headers
+        for header in ('bytes=9-0', 'bytes=-', 'bytes=a-b', 'bytes 0-9',
+                       'items=0-9'):
+            self.assertEqual(parse(header, 100), None)
+
+    def test_partial_content(self):
+        request = RequestFactory().get('/', HTTP_RANGE='bytes=0-9')
+        # Responses that can't send part of their content are left alone.
+        response = HttpResponse('x' * 100)
+        utils.partial_content(request, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.content), 100)
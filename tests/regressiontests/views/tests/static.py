@@ -33,6 +33,15 @@ class StaticTests(TestCase):
             self.assertEqual(len(response.content), int(response['Content-Length']))
             self.assertEqual(mimetypes.guess_type(file_path)[1], response.get('Content-Encoding', None))
 
+    def test_range(self):
+        response = self.client.get('/views/%s/file.txt' % self.prefix,
+                                   HTTP_RANGE='bytes=0-4')
+        file_path = path.join(media_dir, 'file.txt')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, open(file_path).read()[:5])
+        self.assertEqual(response['Content-Range'],
+                         'bytes 0-4/%d' % path.getsize(file_path))
+
     def test_unknown_mime_type(self):
         response = self.client.get('/views/%s/file.unknown' % self.prefix)
         self.assertEqual('application/octet-stream', response['Content-Type'])